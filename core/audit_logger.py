@@ -1,20 +1,100 @@
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Optional
+import atexit
 import csv
+import gzip
+import io
+import lzma
 import os
 import time
 import threading
 import queue
 
 
+# Compression -> wrapper around the raw binary file
+_OPENERS = {
+    None: lambda raw: raw,
+    "gzip": lambda raw: gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6),
+    "lzma": lambda raw: lzma.LZMAFile(raw, mode="wb", preset=3),
+}
+
+_SUFFIXES = {None: "", "gzip": ".gz", "lzma": ".xz"}
+
+# Audit logs counted by retention (index sidecars '<log>.idx' are not)
+_LOG_SUFFIXES = tuple(".csv" + suffix for suffix in _SUFFIXES.values())
+
+
 class AuditLogger:
     enabled = True
     debug = True
 
+    # Output settings (see configure())
+    log_dir = "logs"
+    compression = None          # None | "gzip" | "lzma"
+    max_bytes = None            # rotate when the file reaches this size on disk
+    rotate_interval = None      # rotate after this many seconds
+    max_files = None            # keep at most this many audit logs in log_dir
+    flush_interval = 1.0        # seconds between flushes of the compressed stream
+
     _initialized = False
     _queue = queue.Queue()
     _thread = None
     _stop_event = threading.Event()
 
+    _raw = None
+    _stream = None
+    _writer = None
+    _opened_at = 0.0
+    _last_flush = 0.0
+    _rotate_requested = False
+
+    # Per-thread mute (e.g. lookahead forks stepping on the caller's thread)
+    _local = threading.local()
+
+    # -------------------------------------------------
+    # Configuration
+    # -------------------------------------------------
+
+    @classmethod
+    def configure(
+        cls,
+        log_dir: str = "logs",
+        compression: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        rotate_interval: Optional[float] = None,
+        max_files: Optional[int] = None,
+    ):
+        """
+        Set output, rotation and retention options.
+        If the logger is already running and the options change, a new
+        file is started with them; unchanged options keep the current file.
+        """
+        if compression not in _OPENERS:
+            raise ValueError(f"Unsupported audit compression: {compression}")
+
+        for name, value in (
+            ("max_bytes", max_bytes),
+            ("rotate_interval", rotate_interval),
+            ("max_files", max_files),
+        ):
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise ValueError(f"Audit option '{name}' must be a positive number")
+
+        options = (log_dir, compression, max_bytes, rotate_interval, max_files)
+        changed = options != (
+            cls.log_dir, cls.compression, cls.max_bytes, cls.rotate_interval, cls.max_files
+        )
+
+        cls.log_dir = log_dir
+        cls.compression = compression
+        cls.max_bytes = max_bytes
+        cls.rotate_interval = rotate_interval
+        cls.max_files = max_files
+
+        if cls._initialized and changed:
+            cls._rotate_requested = True
+
     # -------------------------------------------------
     # Initialization
     # -------------------------------------------------
@@ -24,14 +104,7 @@ class AuditLogger:
         if cls._initialized:
             return
 
-        os.makedirs("logs", exist_ok=True)
-
-        timestamp_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        cls.log_file = f"logs/audit_log_{timestamp_str}.csv"
-
-        with open(cls.log_file, mode="w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["timestamp", "event_type", "details"])
+        cls._open_file()
 
         cls._thread = threading.Thread(
             target=cls._logger_loop,
@@ -39,8 +112,104 @@ class AuditLogger:
         )
         cls._thread.start()
 
+        # Close the (compressed) stream properly on interpreter exit
+        atexit.register(cls.shutdown)
+
         cls._initialized = True
 
+    # -------------------------------------------------
+    # Files
+    # -------------------------------------------------
+
+    @classmethod
+    def _open_file(cls):
+        os.makedirs(cls.log_dir, exist_ok=True)
+
+        timestamp_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        base = os.path.join(cls.log_dir, f"audit_log_{timestamp_str}")
+        suffix = ".csv" + _SUFFIXES[cls.compression]
+
+        path = base + suffix
+        n = 1
+        while os.path.exists(path):
+            path = f"{base}_{n}{suffix}"
+            n += 1
+
+        cls.log_file = path
+        cls._raw = open(path, "wb")
+        cls._stream = io.TextIOWrapper(
+            _OPENERS[cls.compression](cls._raw),
+            encoding="utf-8",
+            newline="",
+        )
+        cls._writer = csv.writer(cls._stream)
+        cls._writer.writerow(["timestamp", "event_type", "details"])
+
+        cls._opened_at = time.time()
+        cls._last_flush = cls._opened_at
+
+        cls._apply_retention()
+
+    @classmethod
+    def _close_file(cls):
+        if cls._stream is None:
+            return
+
+        # Closing the text wrapper also finalizes the compressed stream
+        cls._stream.close()
+        if not cls._raw.closed:
+            cls._raw.close()
+
+        cls._stream = None
+        cls._raw = None
+        cls._writer = None
+
+    @classmethod
+    def _rotate_due(cls) -> bool:
+        if cls._rotate_requested:
+            return True
+
+        if cls.max_bytes is not None and cls._raw.tell() >= cls.max_bytes:
+            return True
+
+        if cls.rotate_interval is not None and time.time() - cls._opened_at >= cls.rotate_interval:
+            return True
+
+        return False
+
+    @classmethod
+    def _rotate(cls):
+        cls._close_file()
+        cls._rotate_requested = False
+        cls._open_file()
+
+    @classmethod
+    def _apply_retention(cls):
+        """
+        Delete the oldest audit logs in log_dir beyond max_files, together
+        with their index sidecars. The current file is never deleted.
+        """
+        if cls.max_files is None:
+            return
+
+        logs = sorted(
+            (
+                os.path.join(cls.log_dir, name)
+                for name in os.listdir(cls.log_dir)
+                if name.startswith("audit_log_") and name.endswith(_LOG_SUFFIXES)
+            ),
+            key=os.path.getmtime,
+        )
+        logs = [path for path in logs if path != cls.log_file]
+
+        excess = len(logs) + 1 - int(cls.max_files)
+        for path in logs[:max(excess, 0)]:
+            for victim in (path, f"{path}.idx"):
+                try:
+                    os.remove(victim)
+                except OSError:
+                    pass
+
     # -------------------------------------------------
     # Logger thread
     # -------------------------------------------------
@@ -49,26 +218,70 @@ class AuditLogger:
     def _logger_loop(cls):
         while not cls._stop_event.is_set() or not cls._queue.empty():
             try:
-                timestamp, event_type, detail = cls._queue.get(timeout=0.1)
+                batch = [cls._queue.get(timeout=0.1)]
             except queue.Empty:
+                cls._flush(force=False)
                 continue
 
-            with open(cls.log_file, mode="a", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([f"{timestamp:.3f}", event_type, detail])
+            # Drain everything that is already queued in one go
+            while True:
+                try:
+                    batch.append(cls._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for timestamp, event_type, detail in batch:
+                cls._writer.writerow([f"{timestamp:.3f}", event_type, detail])
+
+                if cls.debug:
+                    print(f"[{event_type.upper()}] {detail}")
+
+                cls._queue.task_done()
+
+            cls._flush(force=False)
+
+            if cls._rotate_due():
+                cls._rotate()
 
-            if cls.debug:
-                print(f"[{event_type.upper()}] {detail}")
+        cls._close_file()
 
-            cls._queue.task_done()
+    @classmethod
+    def _flush(cls, force: bool):
+        """
+        Hand buffered rows to the file. Compressed streams are only
+        sync-flushed every flush_interval seconds to keep the ratio high.
+        """
+        if cls._stream is None:
+            return
+
+        cls._stream.flush()
+
+        now = time.time()
+        if force or cls.compression is None or now - cls._last_flush >= cls.flush_interval:
+            cls._stream.buffer.flush()
+            cls._raw.flush()
+            cls._last_flush = now
 
     # -------------------------------------------------
     # Public API
     # -------------------------------------------------
 
+    @classmethod
+    @contextmanager
+    def muted(cls, active: bool = True):
+        """
+        Drop events logged by the current thread inside the block.
+        """
+        previous = getattr(cls._local, "muted", False)
+        cls._local.muted = previous or active
+        try:
+            yield
+        finally:
+            cls._local.muted = previous
+
     @classmethod
     def log_event(cls, event_type: str, **kwargs):
-        if not cls.enabled:
+        if not cls.enabled or getattr(cls._local, "muted", False):
             return
 
         cls._init()
@@ -78,6 +291,11 @@ class AuditLogger:
 
         cls._queue.put((timestamp, event_type, detail))
 
+    @classmethod
+    def queue_depth(cls) -> int:
+        """Events waiting to be written by the logger thread."""
+        return cls._queue.qsize()
+
     @classmethod
     def log_message_sent(cls, topic: str, sender: str):
         cls.log_event("message_sent", topic=topic, sender=sender)
@@ -102,4 +320,4 @@ class AuditLogger:
     def shutdown(cls):
         cls._stop_event.set()
         if cls._thread:
-            cls._thread.join(timeout=1)
\ No newline at end of file
+            cls._thread.join(timeout=5)
\ No newline at end of file
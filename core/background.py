@@ -0,0 +1,218 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from core.base_module import BaseModule
+from core.messages import Message
+
+
+class BackgroundJob:
+    """
+    One step() of a background module, computed off the critical path
+    from a snapshot of its input messages.
+    """
+
+    __slots__ = (
+        "module", "release", "snapshot", "key", "boundary", "submitted",
+        "future", "start", "finish", "discarded",
+    )
+
+    def __init__(self, module: BaseModule, release: Optional[float], snapshot: Tuple[Message, ...],
+                 key: tuple, boundary: int, submitted: float):
+        self.module = module
+        self.release = release
+        self.snapshot = snapshot
+        self.key = key
+        self.boundary = boundary      # Scheduler step/cycle count at submission
+        self.submitted = submitted    # Clock time of the input snapshot
+        self.future = None
+        self.start: Optional[float] = None
+        self.finish: Optional[float] = None
+        self.discarded = False
+
+
+class BackgroundStats:
+    def __init__(self):
+        self.submitted = 0
+        self.published = 0
+        self.busy_skips = 0
+        self.discarded = 0
+        self.errors = 0
+        self.max_age_s = 0.0
+        self.max_steps = 0
+
+    def report(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "published": self.published,
+            "busy_skips": self.busy_skips,
+            "discarded": self.discarded,
+            "errors": self.errors,
+            "max_age_s": self.max_age_s,
+            "max_steps": self.max_steps,
+        }
+
+
+class BackgroundRunner:
+    """
+    Runs the step() of background modules (module.background) on a small
+    thread pool, so slow-timescale modules (learners, planners) do not
+    stall the scheduling step or cycle that released them.
+
+    At most one job per module is in flight; releases while it is still
+    running are skipped (counted as busy_skips). Finished jobs are handed
+    back by completed(), the Scheduler publishes their outputs at the
+    next step/cycle boundary.
+
+    Threads rather than processes: modules keep their state (weights,
+    replay buffers) in the instance the runtime checkpoints and swaps,
+    and numeric libraries release the GIL during heavy computation.
+    """
+
+    def __init__(self, clock, max_workers: int = 2):
+        self.clock = clock
+        self.max_workers = max_workers
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Deque[BackgroundJob] = deque()
+        self._busy: Dict[str, BackgroundJob] = {}
+        self._lock = threading.Lock()
+
+        self.stats: Dict[str, BackgroundStats] = {}
+
+    def _stats(self, module_id: str) -> BackgroundStats:
+        stats = self.stats.get(module_id)
+        if stats is None:
+            stats = self.stats.setdefault(module_id, BackgroundStats())
+        return stats
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def busy(self, module_id: str) -> bool:
+        """
+        True while a job of the module is in flight; counts the release
+        as skipped.
+        """
+        if module_id not in self._busy:
+            return False
+
+        self._stats(module_id).busy_skips += 1
+        return True
+
+    def submit(self, job: BackgroundJob, fn: Callable[[BackgroundJob], dict]):
+        """
+        Run fn(job) on the pool; its result (topic -> Context) is the
+        job's future result.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="background"
+            )
+
+        job.future = self._executor.submit(self._run, job, fn)
+        self._stats(job.module.module_id).submitted += 1
+
+        with self._lock:
+            self._busy[job.module.module_id] = job
+            self._jobs.append(job)
+
+    def _run(self, job: BackgroundJob, fn: Callable[[BackgroundJob], dict]) -> dict:
+        job.start = self.clock.now()
+        try:
+            return fn(job)
+        finally:
+            job.finish = self.clock.now()
+
+    # ------------------------------------------------------------------
+    # Completion
+    # ------------------------------------------------------------------
+
+    def completed(self) -> List[BackgroundJob]:
+        """
+        Finished jobs in submission order; discarded ones are dropped.
+        Each module has at most one job in flight, so a slow module does
+        not hold back the results of others.
+        """
+        done = []
+
+        with self._lock:
+            if not any(job.future.done() for job in self._jobs):
+                return done
+
+            pending = deque()
+            for job in self._jobs:
+                if not job.future.done():
+                    pending.append(job)
+                    continue
+
+                if self._busy.get(job.module.module_id) is job:
+                    del self._busy[job.module.module_id]
+
+                if job.discarded:
+                    self._stats(job.module.module_id).discarded += 1
+                else:
+                    done.append(job)
+
+            self._jobs = pending
+
+        return done
+
+    def record(self, job: BackgroundJob, age_s: float, steps: int, error: bool = False):
+        stats = self._stats(job.module.module_id)
+        if error:
+            stats.errors += 1
+            return
+
+        stats.published += 1
+        stats.max_age_s = max(stats.max_age_s, age_s)
+        stats.max_steps = max(stats.max_steps, steps)
+
+    def discard(self, module_ids: Optional[Iterable[str]] = None):
+        """
+        Drop the results of in-flight jobs (of the given modules, default
+        all), e.g. when an episode is reset while they are running.
+        """
+        ids = None if module_ids is None else set(module_ids)
+
+        with self._lock:
+            for job in self._jobs:
+                if ids is None or job.module.module_id in ids:
+                    job.discarded = True
+
+    def wait(self, module_ids: Optional[Iterable[str]] = None):
+        """
+        Block until the in-flight jobs (of the given modules, default all)
+        have finished. Called before the runtime touches module state from
+        the main thread (reset, checkpoint, fork, hot swap), since a step()
+        still running on the pool would keep mutating it.
+        """
+        ids = None if module_ids is None else set(module_ids)
+
+        with self._lock:
+            futures = [
+                job.future for job in self._jobs
+                if ids is None or job.module.module_id in ids
+            ]
+
+        if futures:
+            futures_wait(futures)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._jobs)
+
+    def report(self) -> Dict[str, dict]:
+        return {module_id: stats.report() for module_id, stats in list(self.stats.items())}
+
+    def shutdown(self):
+        """
+        Stop accepting jobs; running ones finish on their own, queued
+        ones are cancelled and their results dropped.
+        """
+        self.discard()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
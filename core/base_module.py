@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 from utils.context import Context
 
@@ -12,8 +12,40 @@ class BaseModule(ABC):
     - It consumes Observations from its input topics
     - It produces Observations on its output topics
     - It has no knowledge of scheduling, timing, or other modules
+
+    Modules whose step() output depends only on their inputs (no internal
+    state, no randomness) can set pure = True; the Scheduler then reuses
+    earlier outputs when the input messages did not change.
+
+    cost is an optional declared execution time of step() in seconds,
+    used by the static graph analysis (see core.graph_analysis).
+
+    Modules that tolerate a lower rate (learners, estimators, monitors)
+    can set degradable = True; under overload their cycle is stretched up
+    to max_cycle (see core.overload). Environments are never degraded.
+
+    priority and deadline (relative, seconds, default: cycle) are used by
+    the priority and EDF dispatch policies of the Scheduler.
+
+    Slow-timescale modules (learners, planners) can set background = True;
+    step() then runs off the scheduling thread on a snapshot of the
+    inputs and the outputs are published, marked with their staleness,
+    at a later step/cycle boundary (see core.background).
+
+    Learning modules can be attached to a runtime-fed experience buffer
+    (module entry "experience"); it is then available as self.experience
+    (see core.experience).
     """
 
+    pure: bool = False
+    cost: Optional[float] = None
+    degradable: bool = False
+    max_cycle: Optional[float] = None
+    priority: int = 0
+    deadline: Optional[float] = None
+    background: bool = False
+    experience = None
+
     def __init__(
         self,
         module_id: str,
@@ -77,11 +109,39 @@ class BaseModule(ABC):
         """
         Reset internal state of the module.
 
-        Only meaningful for environment modules (is_env=True).
-        Default implementation does nothing.
+        Called for environment modules (is_env=True) at episode start, and
+        for stateful modules downstream of an environment whose episode
+        has ended. Default implementation does nothing.
 
         Returns:
             Dict[str, Context]:
                 Initial observations to publish (topic -> Observation).
         """
-        return {}
\ No newline at end of file
+        return {}
+
+    def warmup(self):
+        """
+        Prepare a freshly created instance before it is hot-swapped into
+        a running system (e.g. load weights, fill caches).
+        Runs on a background thread. Default implementation does nothing.
+        """
+        pass
+
+    # ------------------------------------------------------------------
+    # Optional checkpoint hooks
+    # ------------------------------------------------------------------
+
+    def get_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Return the internal state to be checkpointed (picklable dict).
+
+        Opt-in: the default returns None, meaning the module is stateless
+        and is re-created from its configuration on resume.
+        """
+        return None
+
+    def set_state(self, state: Dict[str, Any]):
+        """
+        Restore internal state previously returned by get_state().
+        """
+        pass
\ No newline at end of file
@@ -0,0 +1,327 @@
+import os
+import time
+import socket
+import struct
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from core import codec
+from core.messages import Message
+from core.mediator import Mediator
+from core.audit_logger import AuditLogger
+
+
+# ----------------------------------------------------------------------
+# Wire format
+# ----------------------------------------------------------------------
+#
+# frame := u32 length | u8 version | record*
+#
+# Records use the message codec (core.codec). Pickle is only used for
+# values without a codec fast path. Peers must be trusted.
+
+WIRE_VERSION = 2
+
+_U32 = struct.Struct("<I")
+
+
+def encode_batch(messages: Iterable[Message]) -> bytes:
+    body = bytes((WIRE_VERSION,)) + codec.encode_many(messages)
+    return _U32.pack(len(body)) + body
+
+
+def decode_batch(body: bytes) -> List[Message]:
+    """Decode a frame body (without the length prefix)."""
+    if body[0] != WIRE_VERSION:
+        raise ValueError(f"Unsupported bridge wire version: {body[0]}")
+
+    return list(codec.iter_decode(memoryview(body)[1:]))
+
+
+# ----------------------------------------------------------------------
+# Addresses
+# ----------------------------------------------------------------------
+
+def _parse_address(address: str):
+    """
+    'tcp://host:port' -> (AF_INET, (host, port))
+    'unix:///path'    -> (AF_UNIX, path)
+    """
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return socket.AF_INET, (host, int(port))
+
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+
+    raise ValueError(f"Unsupported bridge address: {address}")
+
+
+def _recv_exact(conn: socket.socket, n: int) -> Optional[bytes]:
+    chunks = []
+    while n:
+        chunk = conn.recv(n)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+# ----------------------------------------------------------------------
+# Bridge
+# ----------------------------------------------------------------------
+
+class MediatorBridge:
+    """
+    Connects the local Mediator to the Mediators of other runtime nodes.
+
+    Topics are partitioned between nodes:
+    - export topics are produced locally and forwarded to all peers
+    - import topics are produced remotely; received messages are
+      published into the local Mediator, which acts as latest-value
+      cache, so _can_execute and _collect_inputs stay local
+
+    Forwarding is batched: a sender thread collects the latest message
+    per export topic (intermediate values of a topic are coalesced, in
+    line with the Mediator's latest-value semantics) and writes one
+    frame per batch to every peer.
+    """
+
+    def __init__(
+        self,
+        mediator: Mediator,
+        node_id: str,
+        listen: Optional[str],
+        peers: Dict[str, str],
+        export_topics: Iterable[str],
+        import_topics: Iterable[str],
+        flush_interval: float = 0.001,
+        reconnect_interval: float = 0.5,
+    ):
+        self.mediator = mediator
+        self.node_id = node_id
+        self.listen = listen
+        self.peers = dict(peers)
+        self.export_topics = set(export_topics)
+        self.import_topics = set(import_topics)
+        self.flush_interval = flush_interval
+        self.reconnect_interval = reconnect_interval
+
+        overlap = self.export_topics & self.import_topics
+        if overlap:
+            raise ValueError(f"Topics cannot be both exported and imported: {sorted(overlap)}")
+
+        self._pending: Dict[str, Message] = {}
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+
+        self._server: Optional[socket.socket] = None
+        self._connections: Dict[str, socket.socket] = {}
+        self._accepted: List[socket.socket] = []
+        self._last_attempt: Dict[str, float] = {}
+        self._threads: List[threading.Thread] = []
+
+        # Counters
+        self.sent_batches = 0
+        self.sent_messages = 0
+        self.received_messages = 0
+
+        for topic in self.export_topics:
+            self.mediator.add_publish_hook(topic, self._on_publish)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self.listen:
+            family, address = _parse_address(self.listen)
+
+            if family == socket.AF_UNIX and os.path.exists(address):
+                os.unlink(address)
+
+            self._server = socket.socket(family, socket.SOCK_STREAM)
+            if family == socket.AF_INET:
+                self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._server.bind(address)
+            self._server.listen()
+            self._server.settimeout(0.2)
+
+            self._spawn(self._accept_loop)
+
+        if self.peers and self.export_topics:
+            self._spawn(self._sender_loop)
+
+        AuditLogger.log_event(
+            "bridge_started",
+            node=self.node_id,
+            listen=self.listen,
+            peers=list(self.peers),
+        )
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+        if self._server:
+            self._server.close()
+
+        for conn in list(self._connections.values()) + self._accepted:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self._connections.clear()
+        self._accepted.clear()
+
+        for thread in self._threads:
+            thread.join(timeout=1)
+
+        if self._server:
+            if self.listen.startswith("unix://"):
+                try:
+                    os.unlink(self.listen[len("unix://"):])
+                except OSError:
+                    pass
+
+        AuditLogger.log_event(
+            "bridge_stopped",
+            node=self.node_id,
+            sent_batches=self.sent_batches,
+            sent_messages=self.sent_messages,
+            received_messages=self.received_messages,
+        )
+
+    def _spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    def _on_publish(self, msg: Message):
+        with self._cond:
+            self._pending[msg.topic] = msg
+            self._cond.notify()
+
+    def _sender_loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(timeout=self.reconnect_interval)
+
+            # Connect outside the lock, publishers must never wait on it
+            self._connect_peers()
+
+            if not self._pending:
+                continue
+
+            if not self._connections:
+                # Keep the latest values until a peer (re)connects
+                self._stop.wait(self.reconnect_interval)
+                continue
+
+            # Let a burst of publishes accumulate into one batch
+            self._stop.wait(self.flush_interval)
+
+            with self._cond:
+                batch, self._pending = list(self._pending.values()), {}
+
+            frame = encode_batch(batch)
+            delivered = False
+
+            for peer, conn in list(self._connections.items()):
+                try:
+                    conn.sendall(frame)
+                    delivered = True
+                except OSError as e:
+                    AuditLogger.log_event("bridge_peer_lost", node=self.node_id, peer=peer, error=str(e))
+                    conn.close()
+                    del self._connections[peer]
+
+            if not delivered:
+                # No peer took the batch; requeue values not superseded since
+                with self._cond:
+                    for msg in batch:
+                        self._pending.setdefault(msg.topic, msg)
+                continue
+
+            self.sent_batches += 1
+            self.sent_messages += len(batch)
+
+    def _connect_peers(self):
+        now = time.monotonic()
+
+        for peer, address in self.peers.items():
+            if peer in self._connections:
+                continue
+            if now - self._last_attempt.get(peer, -float("inf")) < self.reconnect_interval:
+                continue
+
+            self._last_attempt[peer] = now
+            family, target = _parse_address(address)
+            conn = socket.socket(family, socket.SOCK_STREAM)
+
+            try:
+                conn.connect(target)
+            except OSError:
+                conn.close()
+                continue
+
+            if family == socket.AF_INET:
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            self._connections[peer] = conn
+            AuditLogger.log_event("bridge_peer_connected", node=self.node_id, peer=peer)
+
+    # ------------------------------------------------------------------
+    # Receiving
+    # ------------------------------------------------------------------
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+
+            conn.settimeout(None)
+            self._accepted.append(conn)
+            self._spawn(self._reader_loop, conn)
+
+    def _reader_loop(self, conn: socket.socket):
+        try:
+            while not self._stop.is_set():
+                head = _recv_exact(conn, _U32.size)
+                if head is None:
+                    return
+
+                body = _recv_exact(conn, _U32.unpack(head)[0])
+                if body is None:
+                    return
+
+                for msg in decode_batch(body):
+                    if msg.topic not in self.import_topics:
+                        continue
+
+                    try:
+                        self.mediator.publish(msg)
+                    except TypeError as e:
+                        # Non-Context payload on a module input topic
+                        AuditLogger.log_event("bridge_receive_error", node=self.node_id, error=str(e))
+                        continue
+
+                    self.received_messages += 1
+
+        except (OSError, ValueError) as e:
+            if not self._stop.is_set():
+                AuditLogger.log_event("bridge_receive_error", node=self.node_id, error=str(e))
+        finally:
+            conn.close()
@@ -0,0 +1,44 @@
+import gzip
+import os
+import pickle
+from typing import Any, Dict
+
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]):
+    """
+    Write a checkpoint as gzip-compressed pickle.
+
+    The file is written to a temporary path first and then moved into
+    place, so an interrupted write never leaves a truncated checkpoint.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+
+    with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+        pickle.dump(
+            {"version": CHECKPOINT_VERSION, **state},
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> Dict[str, Any]:
+    """
+    Read a checkpoint written by save_checkpoint().
+    Only load checkpoints from trusted sources (pickle).
+    """
+    with gzip.open(path, "rb") as f:
+        state = pickle.load(f)
+
+    if not isinstance(state, dict) or state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format in '{path}'")
+
+    return state
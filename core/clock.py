@@ -0,0 +1,60 @@
+import time
+
+
+class Clock:
+    """
+    Real-time clock used by the runtime and scheduler.
+
+    All time reads and waits of the execution loop go through a clock,
+    so the time source can be replaced without touching the loop logic.
+    """
+
+    virtual = False
+
+    def now(self) -> float:
+        """
+        Monotonic time in seconds, used for all deadlines.
+        Not affected by wall-clock adjustments.
+        """
+        return time.monotonic()
+
+    def timestamp(self) -> float:
+        """Wall-clock time in seconds since epoch, used to stamp messages."""
+        return time.time()
+
+    def sleep_until(self, deadline: float):
+        """Block until the given point in time has been reached."""
+        delay = deadline - self.now()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class VirtualClock(Clock):
+    """
+    Simulated clock for time-based modes.
+
+    Time only advances when the loop waits for a deadline, so the loop
+    jumps straight to the next deadline instead of sleeping. Module
+    execution takes zero simulated time.
+    """
+
+    virtual = True
+
+    def __init__(self, start: float = 0.0):
+        self._now = float(start)
+
+    def now(self) -> float:
+        return self._now
+
+    def timestamp(self) -> float:
+        return self._now
+
+    def sleep_until(self, deadline: float):
+        if deadline > self._now:
+            self._now = deadline
+
+    def advance(self, seconds: float):
+        """Move the clock forward by the given number of seconds."""
+        if seconds < 0:
+            raise ValueError("VirtualClock cannot move backwards")
+        self._now += seconds
@@ -0,0 +1,616 @@
+"""
+Compact, versioned binary codec for Message and Context (stdlib only).
+
+Record layout:
+    record  := u32 length | body
+    body    := u8 kind (MESSAGE | CONTEXT) | field* | END
+    field   := u8 field_id | value
+    value   := u8 type_tag | data
+
+Every value is self-describing, so a decoder can skip fields it does not
+know (written by a newer version) and uses defaults for fields that are
+missing (written by an older version). This gives schema evolution in
+both directions without bumping the format version.
+
+Packed natively: float / small int / int64 states and scalars, short
+strings, UUID message IDs (16 bytes), string-keyed dicts, homogeneous
+float/int lists and array.array. Anything else falls back to pickle
+(trusted data only).
+
+The codec is written in Python: records are 3-4x smaller than pickle and
+scalar states encode and decode faster, but dict-heavy payloads and long
+lists are not faster than pickle (whose loops run in C). Use it for size
+and schema evolution; see utils.codec_benchmark.
+
+Streams (files, sockets) start with a 4-byte header (MAGIC + version)
+followed by records; see MessageWriter / MessageReader.
+"""
+import math
+import pickle
+import struct
+from array import array
+from typing import Any, BinaryIO, Iterable, Iterator, List, Union
+
+from core.messages import Message
+from utils.context import Context
+
+
+MAGIC = b"OCM"
+CODEC_VERSION = 1
+
+# Record kinds
+KIND_MESSAGE = 1
+KIND_CONTEXT = 2
+
+# Message fields
+F_TOPIC = 1
+F_PAYLOAD = 2
+F_SENDER = 3
+F_CONFIDENCE = 4
+F_ID = 5
+F_TIMESTAMP = 6
+F_PARENTS = 7
+F_ORIGINS = 8
+F_STALENESS = 9
+
+# Context fields
+F_STATE = 1
+F_REWARD = 2
+F_TERMINATED = 3
+F_TRUNCATED = 4
+F_INFO = 5
+
+F_END = 0
+
+# Value type tags
+T_NONE = 0
+T_FALSE = 1
+T_TRUE = 2
+T_INT8 = 3
+T_INT64 = 4
+T_FLOAT = 5
+T_STR8 = 6
+T_STR = 7
+T_BYTES = 8
+T_LIST = 9
+T_TUPLE = 10
+T_DICT = 11
+T_FLOAT_LIST = 12
+T_INT_LIST = 13
+T_ARRAY = 14
+T_UUID = 15
+T_CONTEXT = 16
+T_PICKLE = 17
+
+_U8 = struct.Struct("<B")
+_I8 = struct.Struct("<b")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_TAG_F64 = struct.Struct("<Bd")
+_TAG_I8 = struct.Struct("<Bb")
+_TAG_I64 = struct.Struct("<Bq")
+_TAG_U32 = struct.Struct("<BI")
+_FIELD_F64 = struct.Struct("<BBd")
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+
+def _encode_value(out: List[bytes], value: Any):
+    t = type(value)
+
+    if value is None:
+        out.append(b"\x00")
+    elif t is bool:
+        out.append(b"\x02" if value else b"\x01")
+    elif t is float:
+        out.append(_TAG_F64.pack(T_FLOAT, value))
+    elif t is int:
+        if -128 <= value <= 127:
+            out.append(_TAG_I8.pack(T_INT8, value))
+        elif _INT64_MIN <= value <= _INT64_MAX:
+            out.append(_TAG_I64.pack(T_INT64, value))
+        else:
+            _encode_pickle(out, value)
+    elif t is str:
+        data = value.encode("utf-8")
+        if len(data) < 256:
+            out.append(bytes((T_STR8, len(data))))
+        else:
+            out.append(_TAG_U32.pack(T_STR, len(data)))
+        out.append(data)
+    elif t is bytes:
+        out.append(_TAG_U32.pack(T_BYTES, len(value)))
+        out.append(value)
+    elif t is dict:
+        _encode_dict(out, value)
+    elif t is list:
+        _encode_sequence(out, value)
+    elif t is tuple:
+        out.append(_TAG_U32.pack(T_TUPLE, len(value)))
+        for item in value:
+            _encode_value(out, item)
+    elif t is array:
+        data = value.tobytes()
+        out.append(_TAG_U32.pack(T_ARRAY, len(data)))
+        out.append(value.typecode.encode("ascii"))
+        out.append(data)
+    elif t is Context:
+        out.append(_U8.pack(T_CONTEXT))
+        _encode_context_fields(out, value)
+    else:
+        _encode_pickle(out, value)
+
+
+def _encode_dict(out: List[bytes], value: dict):
+    mark = len(out)
+    out.append(_TAG_U32.pack(T_DICT, len(value)))
+
+    for key, item in value.items():
+        if type(key) is not str:
+            # Only string keys are encoded natively
+            del out[mark:]
+            _encode_pickle(out, value)
+            return
+
+        data = key.encode("utf-8")
+        if len(data) < 256:
+            out.append(bytes((T_STR8, len(data))))
+            out.append(data)
+        else:
+            _encode_value(out, key)
+
+        # Floats inline, a call per item costs more than the packing
+        if type(item) is float:
+            out.append(_TAG_F64.pack(T_FLOAT, item))
+        else:
+            _encode_value(out, item)
+
+
+def _encode_sequence(out: List[bytes], value: list):
+    n = len(value)
+    types = set(map(type, value))
+
+    if types == {float}:
+        out.append(_TAG_U32.pack(T_FLOAT_LIST, n))
+        out.append(array("d", value).tobytes())
+        return
+
+    if types == {int} and _INT64_MIN <= min(value) and max(value) <= _INT64_MAX:
+        out.append(_TAG_U32.pack(T_INT_LIST, n))
+        out.append(array("q", value).tobytes())
+        return
+
+    out.append(_TAG_U32.pack(T_LIST, n))
+    for item in value:
+        _encode_value(out, item)
+
+
+def _encode_pickle(out: List[bytes], value: Any):
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    out.append(_TAG_U32.pack(T_PICKLE, len(data)))
+    out.append(data)
+
+
+def _encode_float_field(out: List[bytes], field_id: int, value: Any):
+    if type(value) is float:
+        out.append(_FIELD_F64.pack(field_id, T_FLOAT, value))
+    else:
+        out.append(_U8.pack(field_id))
+        _encode_value(out, value)
+
+
+def _encode_context_fields(out: List[bytes], ctx: Context):
+    # Fields equal to the Context defaults (the decoder's defaults for
+    # missing fields) are skipped; anything else, None included, is
+    # written so that it round-trips exactly
+    _encode_float_field(out, F_STATE, ctx.state)
+
+    reward = ctx.reward
+    if type(reward) is not float or reward != 0.0 or math.copysign(1.0, reward) < 0:
+        _encode_float_field(out, F_REWARD, reward)
+
+    if ctx.terminated is not False:
+        out.append(_U8.pack(F_TERMINATED))
+        _encode_value(out, ctx.terminated)
+
+    if ctx.truncated is not False:
+        out.append(_U8.pack(F_TRUNCATED))
+        _encode_value(out, ctx.truncated)
+
+    if type(ctx.info) is not dict or ctx.info:
+        out.append(_U8.pack(F_INFO))
+        _encode_value(out, ctx.info)
+
+    out.append(b"\x00")
+
+
+def _uuid_bytes(value: Any):
+    """16 raw bytes if value is a canonical (lower-case, hyphenated) UUID."""
+    if (
+        type(value) is not str
+        or len(value) != 36
+        or value[8] != "-" or value[13] != "-" or value[18] != "-" or value[23] != "-"
+        or value != value.lower()
+    ):
+        return None
+
+    try:
+        raw = bytes.fromhex(value.replace("-", ""))
+    except ValueError:
+        return None
+
+    return raw if len(raw) == 16 else None
+
+
+def _encode_id(out: List[bytes], value: Any):
+    uuid_bytes = _uuid_bytes(value)
+    if uuid_bytes is not None:
+        out.append(_U8.pack(T_UUID) + uuid_bytes)
+    else:
+        _encode_value(out, value)
+
+
+def _encode_message_body(out: List[bytes], msg: Message):
+    out.append(_U8.pack(KIND_MESSAGE))
+
+    out.append(_U8.pack(F_TOPIC))
+    _encode_value(out, msg.topic)
+
+    out.append(_U8.pack(F_SENDER))
+    _encode_value(out, msg.sender)
+
+    out.append(_U8.pack(F_ID))
+    _encode_id(out, msg.id)
+
+    out.append(_FIELD_F64.pack(F_TIMESTAMP, T_FLOAT, msg.timestamp))
+
+    if msg.confidence is not None:
+        _encode_float_field(out, F_CONFIDENCE, msg.confidence)
+
+    if msg.parents:
+        out.append(_U8.pack(F_PARENTS) + _TAG_U32.pack(T_TUPLE, len(msg.parents)))
+        for parent in msg.parents:
+            _encode_id(out, parent)
+
+    if msg.origins is not None:
+        out.append(_U8.pack(F_ORIGINS))
+        _encode_value(out, msg.origins)
+
+    if msg.staleness is not None:
+        out.append(_U8.pack(F_STALENESS))
+        _encode_value(out, msg.staleness)
+
+    out.append(_U8.pack(F_PAYLOAD))
+    _encode_value(out, msg.payload)
+
+    out.append(b"\x00")
+
+
+def encode(obj: Union[Message, Context]) -> bytes:
+    """
+    Encode a Message or Context into one record (length-prefixed).
+    """
+    out: List[bytes] = [b""]
+
+    if isinstance(obj, Message):
+        _encode_message_body(out, obj)
+    elif isinstance(obj, Context):
+        out.append(_U8.pack(KIND_CONTEXT))
+        _encode_context_fields(out, obj)
+    else:
+        raise TypeError(f"Cannot encode {type(obj)}, expected Message or Context")
+
+    body = b"".join(out)
+    return _U32.pack(len(body)) + body
+
+
+def encode_many(objs: Iterable[Union[Message, Context]]) -> bytes:
+    """Encode a sequence of records (without stream header)."""
+    return b"".join(encode(obj) for obj in objs)
+
+
+# ----------------------------------------------------------------------
+# Decoding
+# ----------------------------------------------------------------------
+
+def _read_value(data: bytes, pos: int):
+    """Return (value, next position). Hot tags are checked first."""
+    tag = data[pos]
+    pos += 1
+
+    if tag == T_FLOAT:
+        return _F64.unpack_from(data, pos)[0], pos + 8
+    if tag == T_STR8:
+        end = pos + 1 + data[pos]
+        return data[pos + 1:end].decode("utf-8"), end
+    if tag == T_INT8:
+        return _I8.unpack_from(data, pos)[0], pos + 1
+    if tag == T_INT64:
+        return _I64.unpack_from(data, pos)[0], pos + 8
+    if tag == T_NONE:
+        return None, pos
+    if tag == T_FALSE:
+        return False, pos
+    if tag == T_TRUE:
+        return True, pos
+    if tag == T_DICT:
+        return _read_dict(data, pos)
+    if tag == T_UUID:
+        h = data[pos:pos + 16].hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}", pos + 16
+    if tag == T_CONTEXT:
+        return _read_context(data, pos)
+
+    reader = _READERS.get(tag)
+    if reader is None:
+        raise ValueError(f"Unknown codec type tag: {tag}")
+
+    (n,) = _U32.unpack_from(data, pos)
+    return reader(data, pos + 4, n)
+
+
+def _read_dict(data: bytes, pos: int):
+    (n,) = _U32.unpack_from(data, pos)
+    pos += 4
+    result = {}
+    for _ in range(n):
+        # Short string keys and float / small int / short string values
+        # are read inline, a call per item costs more than the read
+        if data[pos] == T_STR8:
+            end = pos + 2 + data[pos + 1]
+            key = data[pos + 2:end].decode("utf-8")
+            pos = end
+        else:
+            key, pos = _read_value(data, pos)
+
+        tag = data[pos]
+        if tag == T_FLOAT:
+            result[key] = _F64.unpack_from(data, pos + 1)[0]
+            pos += 9
+        elif tag == T_STR8:
+            end = pos + 2 + data[pos + 1]
+            result[key] = data[pos + 2:end].decode("utf-8")
+            pos = end
+        elif tag == T_INT8:
+            result[key] = _I8.unpack_from(data, pos + 1)[0]
+            pos += 2
+        else:
+            result[key], pos = _read_value(data, pos)
+    return result, pos
+
+
+def _read_items(data: bytes, pos: int, n: int):
+    items = []
+    for _ in range(n):
+        item, pos = _read_value(data, pos)
+        items.append(item)
+    return items, pos
+
+
+def _read_tuple(data: bytes, pos: int, n: int):
+    items, pos = _read_items(data, pos, n)
+    return tuple(items), pos
+
+
+def _read_array(data: bytes, pos: int, n: int):
+    typecode = chr(data[pos])
+    return array(typecode, data[pos + 1:pos + 1 + n]), pos + 1 + n
+
+
+# Types with a u32 count / length prefix
+_READERS = {
+    T_STR: lambda data, pos, n: (data[pos:pos + n].decode("utf-8"), pos + n),
+    T_BYTES: lambda data, pos, n: (data[pos:pos + n], pos + n),
+    T_LIST: _read_items,
+    T_TUPLE: _read_tuple,
+    T_FLOAT_LIST: lambda data, pos, n: (array("d", data[pos:pos + 8 * n]).tolist(), pos + 8 * n),
+    T_INT_LIST: lambda data, pos, n: (array("q", data[pos:pos + 8 * n]).tolist(), pos + 8 * n),
+    T_ARRAY: _read_array,
+    T_PICKLE: lambda data, pos, n: (pickle.loads(data[pos:pos + n]), pos + n),
+}
+
+
+# Field id -> instance attribute, with the defaults of missing fields.
+# Decoded objects are built from these dicts without calling __init__
+# (like pickle does), which dominates the decode time of small records.
+_CONTEXT_ATTRS = {
+    F_STATE: "state",
+    F_REWARD: "reward",
+    F_TERMINATED: "terminated",
+    F_TRUNCATED: "truncated",
+    F_INFO: "info",
+}
+# A missing info field decodes to a fresh {}, as in Context()
+_NO_INFO = object()
+
+_CONTEXT_DEFAULTS = {
+    "state": None,
+    "reward": 0.0,
+    "terminated": False,
+    "truncated": False,
+    "info": _NO_INFO,
+}
+
+_MESSAGE_ATTRS = {
+    F_TOPIC: "topic",
+    F_PAYLOAD: "payload",
+    F_SENDER: "sender",
+    F_CONFIDENCE: "confidence",
+    F_ID: "id",
+    F_TIMESTAMP: "timestamp",
+    F_PARENTS: "parents",
+    F_ORIGINS: "origins",
+    F_STALENESS: "staleness",
+}
+_MESSAGE_DEFAULTS = {
+    "topic": None,
+    "payload": None,
+    "sender": None,
+    "confidence": None,
+    "id": None,
+    "timestamp": None,
+    "parents": (),
+    "origins": None,
+    "staleness": None,
+}
+
+
+def _read_fields(data: bytes, pos: int, names: dict, defaults: dict):
+    """
+    Read fields until END into an attribute dict. Unknown fields
+    (written by a newer version) are skipped.
+    """
+    attrs = defaults.copy()
+    while True:
+        field_id = data[pos]
+        if field_id == F_END:
+            return attrs, pos + 1
+
+        # Hot scalar tags inline, as in _read_dict()
+        tag = data[pos + 1]
+        if tag == T_FLOAT:
+            value = _F64.unpack_from(data, pos + 2)[0]
+            pos += 10
+        elif tag == T_STR8:
+            end = pos + 3 + data[pos + 2]
+            value = data[pos + 3:end].decode("utf-8")
+            pos = end
+        elif tag == T_UUID:
+            h = data[pos + 2:pos + 18].hex()
+            value = f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+            pos += 18
+        elif tag == T_CONTEXT:
+            value, pos = _read_context(data, pos + 2)
+        elif tag == T_DICT:
+            value, pos = _read_dict(data, pos + 2)
+        else:
+            value, pos = _read_value(data, pos + 1)
+
+        name = names.get(field_id)
+        if name is not None:
+            attrs[name] = value
+
+
+def _read_context(data: bytes, pos: int):
+    attrs, pos = _read_fields(data, pos, _CONTEXT_ATTRS, _CONTEXT_DEFAULTS)
+    if attrs["info"] is _NO_INFO:
+        attrs["info"] = {}
+
+    ctx = _new_context(Context)
+    ctx.__dict__ = attrs
+    return ctx, pos
+
+
+def _read_message(data: bytes, pos: int):
+    attrs, pos = _read_fields(data, pos, _MESSAGE_ATTRS, _MESSAGE_DEFAULTS)
+
+    # Records without ID or timestamp get fresh ones, as in Message()
+    if not attrs["id"] or attrs["timestamp"] is None:
+        return Message(
+            topic=attrs["topic"],
+            payload=attrs["payload"],
+            sender=attrs["sender"],
+            confidence=attrs["confidence"],
+            msg_id=attrs["id"],
+            timestamp=attrs["timestamp"],
+            parents=attrs["parents"],
+            origins=attrs["origins"],
+            staleness=attrs["staleness"],
+        ), pos
+
+    msg = _new_message(Message)
+    msg.__dict__ = attrs
+    return msg, pos
+
+
+_new_context = Context.__new__
+_new_message = Message.__new__
+
+
+def _read_record(data: bytes, pos: int):
+    (length,) = _U32.unpack_from(data, pos)
+    end = pos + 4 + length
+
+    kind = data[pos + 4]
+    if kind == KIND_MESSAGE:
+        result, _ = _read_message(data, pos + 5)
+    elif kind == KIND_CONTEXT:
+        result, _ = _read_context(data, pos + 5)
+    else:
+        raise ValueError(f"Unknown codec record kind: {kind}")
+
+    # Skip trailing data appended by newer versions
+    return result, end
+
+
+def decode(data: bytes) -> Union[Message, Context]:
+    """Decode a single record produced by encode()."""
+    return _read_record(bytes(data), 0)[0]
+
+
+def iter_decode(data: bytes) -> Iterator[Union[Message, Context]]:
+    """Decode a sequence of records produced by encode_many()."""
+    data = bytes(data)
+    pos = 0
+    while pos < len(data):
+        record, pos = _read_record(data, pos)
+        yield record
+
+
+# ----------------------------------------------------------------------
+# Streams
+# ----------------------------------------------------------------------
+
+class MessageWriter:
+    """
+    Streaming encoder: writes a stream header, then one record per object.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.stream.write(MAGIC + bytes((CODEC_VERSION,)))
+
+    def write(self, obj: Union[Message, Context]):
+        self.stream.write(encode(obj))
+
+    def write_many(self, objs: Iterable[Union[Message, Context]]):
+        for obj in objs:
+            self.write(obj)
+
+
+class MessageReader:
+    """
+    Streaming decoder for streams written by MessageWriter.
+    Reads one record at a time, so arbitrarily long streams can be
+    processed with constant memory.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+        header = stream.read(len(MAGIC) + 1)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a message stream")
+        if header[len(MAGIC)] > CODEC_VERSION:
+            raise ValueError(f"Unsupported codec version: {header[len(MAGIC)]}")
+
+    def __iter__(self) -> Iterator[Union[Message, Context]]:
+        while True:
+            head = self.stream.read(4)
+            if not head:
+                return
+            if len(head) < 4:
+                raise ValueError("Truncated message stream")
+
+            (length,) = _U32.unpack(head)
+            body = self.stream.read(length)
+            if len(body) < length:
+                raise ValueError("Truncated message stream")
+
+            yield _read_record(head + body, 0)[0]
@@ -0,0 +1,165 @@
+import threading
+from typing import List, Optional
+
+from core.audit_logger import AuditLogger
+from core.messages import Message
+from core.timing import TIME_EPSILON, next_release
+
+
+class Wakeup:
+    """
+    Condition a worker blocks on until one of its input topics is
+    published. Remembers when the first pending notification arrived, so
+    the reaction latency (wake-up and spacing delay) can be measured.
+    """
+
+    def __init__(self, clock):
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._pending_since: Optional[float] = None
+
+    def notify(self, message: Optional[Message] = None):
+        with self._cond:
+            if self._pending_since is None:
+                self._pending_since = self._clock.now()
+            self._cond.notify()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Block until notified (or timeout). Returns the time of the first
+        pending notification and consumes it, None on timeout.
+        """
+        with self._cond:
+            if self._pending_since is None:
+                self._cond.wait(timeout)
+
+            since, self._pending_since = self._pending_since, None
+            return since
+
+
+class ModuleWorker:
+    """
+    Long-lived thread that executes one module slot in event-thread-based
+    mode.
+
+    - Reactive modules (non-env modules with inputs) block on a Wakeup
+      registered as publish hook on their input topics and run as soon as
+      new input data arrives, but at most once per cycle: updates that
+      arrive earlier are coalesced and served at last start + cycle.
+    - Environments and modules without inputs are sources and run
+      periodically on the release grid of their cycle (overrun policy as
+      in the time-based modes).
+
+    The module is looked up by slot index on every run, so hot swaps are
+    picked up without restarting the worker.
+    """
+
+    def __init__(self, scheduler, index: int):
+        self.scheduler = scheduler
+        self.index = index
+
+        module = scheduler.modules[index]
+        self.module_id = module.module_id
+        self.periodic = module.is_env or not module.inputs
+
+        self.wakeup = Wakeup(scheduler.clock)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._loop, name=f"worker-{self.module_id}", daemon=True
+        )
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if not self.periodic:
+            for topic in self.scheduler.modules[self.index].inputs:
+                self.scheduler.mediator.add_publish_hook(topic, self.wakeup.notify)
+
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self.wakeup.notify()
+
+        if not self.periodic:
+            for topic in self.scheduler.modules[self.index].inputs:
+                self.scheduler.mediator.remove_publish_hook(topic, self.wakeup.notify)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    # ------------------------------------------------------------------
+    # Worker loop
+    # ------------------------------------------------------------------
+
+    def _loop(self):
+        try:
+            if self.periodic:
+                self._run_periodic()
+            else:
+                self._run_reactive()
+        except Exception as e:
+            AuditLogger.log_event("worker_error", module=self.module_id, error=str(e))
+
+    def _run(self, release: float):
+        scheduler = self.scheduler
+        run = scheduler._run_traced if scheduler.tracer else scheduler._run_module
+        run(scheduler.modules[self.index], release)
+
+    def _sleep_until(self, deadline: float) -> bool:
+        """Wait until deadline; False if the worker was stopped meanwhile."""
+        delay = deadline - self.scheduler.clock.now()
+        if delay > 0:
+            return not self._stop.wait(delay)
+        return not self._stop.is_set()
+
+    def _run_periodic(self):
+        scheduler = self.scheduler
+        clock = scheduler.clock
+        release = clock.now()
+
+        while self._sleep_until(release):
+            self._run(release)
+
+            module = scheduler.modules[self.index]
+            release, skipped = next_release(
+                release, module.cycle, clock.now(),
+                scheduler.overrun_policy, scheduler.max_burst,
+            )
+            scheduler.timing[self.module_id].record_skipped(skipped)
+
+    def _run_reactive(self):
+        scheduler = self.scheduler
+        clock = scheduler.clock
+        versions = scheduler.mediator.versions
+
+        seen: List[int] = []
+        last_start = -float("inf")
+
+        # Inputs published before the worker started are served right away
+        self.wakeup.notify()
+
+        while not self._stop.is_set():
+            since = self.wakeup.wait()
+            if since is None or self._stop.is_set():
+                continue
+
+            module = scheduler.modules[self.index]
+            current = [versions[topic_id] for topic_id in module.input_ids]
+            if current == seen:
+                continue
+
+            # Minimum spacing: coalesce updates until the next cycle is due
+            earliest = last_start + module.cycle
+            if since + TIME_EPSILON < earliest and not self._sleep_until(earliest):
+                return
+
+            # Read versions again, updates during the wait are served too
+            seen = [versions[topic_id] for topic_id in module.input_ids]
+            self.wakeup.wait(0)
+
+            last_start = clock.now()
+            self._run(max(since, earliest))
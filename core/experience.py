@@ -0,0 +1,418 @@
+import os
+import mmap
+import random
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from core.messages import Message
+from utils.context import Context
+
+
+# Supported column types (array typecodes)
+COLUMN_TYPES = {"d", "f", "q", "i", "b"}
+
+# Context fields a column can be read from (besides info.<key>)
+CONTEXT_FIELDS = {"state", "reward", "terminated", "truncated"}
+
+
+class ExperienceBuffer:
+    """
+    Fixed-capacity ring buffer of transitions with columnar storage.
+
+    Every column (e.g. state, action, reward, terminated) is one flat,
+    preallocated typed array of capacity * width values, so a transition
+    costs only its raw bytes (a float64 scalar column: 8 bytes per row)
+    instead of a Context object per step. When full, the oldest rows are
+    overwritten.
+
+    With spill_path, the columns live in a memory-mapped file instead of
+    process memory, so the OS can page cold rows out to disk. The file is
+    scratch space for one run; it is recreated on start.
+
+    append() is O(1). sample() gathers a minibatch column by column with
+    C-level slicing and joins (one array per column), optionally with
+    next_<column> values of the following rows for TD-style learners.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Tuple[str, int]],
+        capacity: int,
+        spill_path: Optional[str] = None,
+    ):
+        """
+        Args:
+            columns: name -> (typecode, width), width > 1 for vector values
+            capacity: maximum number of rows
+            spill_path: back the columns by a memory-mapped file
+        """
+        if not columns:
+            raise ValueError("ExperienceBuffer needs at least one column")
+
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("ExperienceBuffer capacity must be a positive int")
+
+        # Widest items first, so every column region stays aligned
+        ordered = sorted(columns.items(), key=lambda item: -array(item[1][0]).itemsize)
+
+        self.capacity = capacity
+        self.spill_path = spill_path
+
+        # name -> (typecode, width, byte offset, bytes per row)
+        self._layout: Dict[str, Tuple[str, int, int, int]] = {}
+        offset = 0
+        for name, (typecode, width) in ordered:
+            if typecode not in COLUMN_TYPES:
+                raise ValueError(f"Unsupported type '{typecode}' for column '{name}'")
+            if not isinstance(width, int) or width <= 0:
+                raise ValueError(f"Width of column '{name}' must be a positive int")
+
+            row_bytes = array(typecode).itemsize * width
+            self._layout[name] = (typecode, width, offset, row_bytes)
+            offset += row_bytes * capacity
+
+        self.nbytes = offset
+
+        self._file = None
+        if spill_path:
+            directory = os.path.dirname(spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._file = open(spill_path, "w+b")
+            self._file.truncate(self.nbytes)
+            self._storage = mmap.mmap(self._file.fileno(), self.nbytes)
+        else:
+            self._storage = bytearray(self.nbytes)
+
+        view = memoryview(self._storage)
+        self._raw = {
+            name: view[off:off + row_bytes * capacity]
+            for name, (_, _, off, row_bytes) in self._layout.items()
+        }
+        self._columns = {
+            name: self._raw[name].cast(typecode)
+            for name, (typecode, _, _, _) in self._layout.items()
+        }
+
+        self._next = 0
+        self.size = 0
+        self.appended = 0
+
+        # Publishers append, learners sample, possibly on different threads
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __deepcopy__(self, memo):
+        # Shared, not copied: forked runtimes keep sampling the same store
+        return self
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._layout)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, **values):
+        """
+        Append one row; every column must be given.
+        """
+        if len(values) != len(self._layout):
+            missing = set(self._layout) - set(values)
+            raise ValueError(f"Missing or unknown columns: {sorted(missing or set(values) - set(self._layout))}")
+
+        # Convert first, so an invalid value never leaves a half-written row
+        staged = []
+        for name, value in values.items():
+            typecode, width, _, _ = self._layout[name]
+            converted = array(typecode, value) if width > 1 else array(typecode, (value,))
+            if len(converted) != width:
+                raise ValueError(f"Column '{name}' expects {width} values, got {len(converted)}")
+            staged.append((self._columns[name], width, converted))
+
+        with self._lock:
+            i = self._next
+
+            for column, width, converted in staged:
+                if width == 1:
+                    column[i] = converted[0]
+                else:
+                    column[i * width:(i + 1) * width] = converted
+
+            self._next = (i + 1) % self.capacity
+            if self.size < self.capacity:
+                self.size += 1
+            self.appended += 1
+
+    def clear(self):
+        with self._lock:
+            self._next = 0
+            self.size = 0
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _gather(self, name: str, indices: List[int]) -> array:
+        typecode, width, _, row_bytes = self._layout[name]
+
+        if width == 1:
+            column = self._columns[name]
+            return array(typecode, [column[i] for i in indices])
+
+        raw = self._raw[name]
+        out = array(typecode)
+        out.frombytes(b"".join([raw[i * row_bytes:(i + 1) * row_bytes] for i in indices]))
+        return out
+
+    def sample(
+        self,
+        batch_size: int,
+        with_next: Iterable[str] = (),
+        rng: Optional[random.Random] = None,
+    ) -> Dict[str, array]:
+        """
+        Draw a minibatch of rows uniformly (with replacement).
+
+        Returns one flat array per column (batch_size * width values).
+        For every column in with_next, next_<column> holds the value of
+        the row that followed each sampled row; the newest row is then
+        never sampled.
+        """
+        with_next = list(with_next)
+        rng = rng or random
+
+        with self._lock:
+            available = self.size - 1 if with_next else self.size
+            if available <= 0:
+                raise ValueError("Not enough rows in the experience buffer to sample")
+
+            oldest = (self._next - self.size) % self.capacity
+            capacity = self.capacity
+            draw = rng.random
+            indices = [(oldest + int(draw() * available)) % capacity for _ in range(batch_size)]
+
+            batch = {name: self._gather(name, indices) for name in self._layout}
+
+            if with_next:
+                following = [(i + 1) % capacity for i in indices]
+                for name in with_next:
+                    batch[f"next_{name}"] = self._gather(name, following)
+
+        return batch
+
+    def column(self, name: str) -> array:
+        """
+        All stored values of one column, oldest row first (a copy).
+        """
+        with self._lock:
+            oldest = (self._next - self.size) % self.capacity
+            return self._gather(name, [(oldest + k) % self.capacity for k in range(self.size)])
+
+    def report(self) -> dict:
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "appended": self.appended,
+            "nbytes": self.nbytes,
+            "spill_path": self.spill_path,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        if self._file is not None:
+            self._storage.flush()
+
+    def close(self):
+        """
+        Release the storage (and the memory map); the buffer is unusable
+        afterwards.
+        """
+        for view in list(self._columns.values()) + list(self._raw.values()):
+            view.release()
+        self._columns = {}
+        self._raw = {}
+
+        if self._file is not None:
+            self._storage.close()
+            self._file.close()
+            self._file = None
+
+
+# ----------------------------------------------------------------------
+# Feeding from topics
+# ----------------------------------------------------------------------
+
+def field_reader(field: str) -> Callable[[Context], object]:
+    """
+    Accessor for a Context field: state, reward, terminated, truncated
+    or info.<key>[.<key>...] for nested info dicts.
+    """
+    if field in CONTEXT_FIELDS:
+        return lambda ctx: getattr(ctx, field)
+
+    keys = field.split(".")[1:]
+    if field.startswith("info.") and all(keys):
+        def read(ctx):
+            value = ctx.info
+            for key in keys:
+                value = value[key]
+            return value
+
+        return read
+
+    raise ValueError(f"Unsupported experience field: '{field}'")
+
+
+def parse_source(source: str) -> Tuple[str, str]:
+    """
+    Split a column source 'topic[.field]' into (topic, field); the field
+    defaults to state. Topic names may not contain dots.
+    """
+    topic, _, field = source.partition(".")
+    return topic, field or "state"
+
+
+class ExperienceRecorder:
+    """
+    Appends one row to an ExperienceBuffer whenever the trigger topic is
+    published (e.g. the env output that carries reward and terminated).
+    The other columns take the latest messages of their topics at that
+    moment; rows with a missing topic (e.g. right after a reset) or a
+    malformed value are skipped and counted.
+    """
+
+    def __init__(
+        self,
+        mediator,
+        buffer: ExperienceBuffer,
+        trigger: str,
+        sources: Dict[str, Tuple[str, str]],
+    ):
+        self.mediator = mediator
+        self.buffer = buffer
+        self.trigger = trigger
+
+        # column -> (topic ID, field accessor)
+        self._sources = {
+            name: (mediator.topic_id(topic), field_reader(field))
+            for name, (topic, field) in sources.items()
+        }
+        self._trigger_id = mediator.topic_id(trigger)
+
+        self.skipped = 0
+
+        mediator.add_publish_hook(trigger, self._on_publish)
+
+    def _on_publish(self, message: Message):
+        slots = self.mediator.slots
+        row = {}
+
+        try:
+            for name, (topic_id, read) in self._sources.items():
+                # The trigger message itself, even if a newer one raced in
+                msg = message if topic_id == self._trigger_id else slots[topic_id]
+                if msg is None:
+                    self.skipped += 1
+                    return
+                row[name] = read(msg.payload)
+
+            self.buffer.append(**row)
+
+        except (AttributeError, KeyError, TypeError, ValueError, OverflowError):
+            self.skipped += 1
+
+    def close(self):
+        self.mediator.remove_publish_hook(self.trigger, self._on_publish)
+
+    def report(self) -> dict:
+        return dict(self.buffer.report(), trigger=self.trigger, skipped=self.skipped)
+
+
+def parse_spec(name: str, spec: dict) -> dict:
+    """
+    Validate and normalize the config of one experience buffer:
+
+        {
+          "capacity": 1000000,
+          "on": "true_temp",
+          "columns": {
+            "state": "state",
+            "action": "safe_action.info.action.delta",
+            "reward": "true_temp.reward",
+            "terminated": "true_temp.terminated"
+          },
+          "spill": "experience/replay.bin"
+        }
+
+    A column is a source 'topic[.field]' or a dict with 'source' and
+    optional 'type' (array typecode, default: 'b' for terminated/truncated,
+    else 'd') and 'width' (values per row, default 1).
+
+    Returns dict(capacity, trigger, spill_path, columns, sources).
+    """
+    if not isinstance(spec, dict):
+        raise ValueError(f"Experience buffer '{name}' must be a dict")
+
+    unknown = set(spec) - {"capacity", "on", "columns", "spill"}
+    if unknown:
+        raise ValueError(f"Unknown options for experience buffer '{name}': {sorted(unknown)}")
+
+    capacity = spec.get("capacity")
+    if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity <= 0:
+        raise ValueError(f"'capacity' of experience buffer '{name}' must be a positive int")
+
+    trigger = spec.get("on")
+    if not isinstance(trigger, str) or not trigger:
+        raise ValueError(f"Experience buffer '{name}' needs an 'on' topic that triggers a row")
+
+    columns_spec = spec.get("columns")
+    if not isinstance(columns_spec, dict) or not columns_spec:
+        raise ValueError(f"Experience buffer '{name}' needs a non-empty 'columns' dict")
+
+    columns: Dict[str, Tuple[str, int]] = {}
+    sources: Dict[str, Tuple[str, str]] = {}
+
+    for column, column_spec in columns_spec.items():
+        if isinstance(column_spec, str):
+            column_spec = {"source": column_spec}
+
+        if not isinstance(column_spec, dict) or not isinstance(column_spec.get("source"), str):
+            raise ValueError(f"Column '{column}' of experience buffer '{name}' needs a 'source'")
+
+        topic, field = parse_source(column_spec["source"])
+        field_reader(field)
+
+        default_type = "b" if field in {"terminated", "truncated"} else "d"
+        typecode = column_spec.get("type", default_type)
+        width = column_spec.get("width", 1)
+
+        if typecode not in COLUMN_TYPES:
+            raise ValueError(
+                f"Unsupported type '{typecode}' for column '{column}', expected one of {sorted(COLUMN_TYPES)}"
+            )
+        if not isinstance(width, int) or isinstance(width, bool) or width <= 0:
+            raise ValueError(f"'width' of column '{column}' must be a positive int")
+
+        columns[column] = (typecode, width)
+        sources[column] = (topic, field)
+
+    spill_path = spec.get("spill")
+    if spill_path is not None and (not isinstance(spill_path, str) or not spill_path):
+        raise ValueError(f"'spill' of experience buffer '{name}' must be a file path")
+
+    return {
+        "capacity": capacity,
+        "trigger": trigger,
+        "spill_path": spill_path,
+        "columns": columns,
+        "sources": sources,
+    }
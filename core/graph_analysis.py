@@ -0,0 +1,415 @@
+"""
+Static analysis of an execution graph (modules wired through topics).
+
+Usage:
+    python -m core.graph_analysis configs/example_time-loop.json
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.audit_logger import AuditLogger
+
+
+ANALYSIS_MODES = {"off", "warn", "strict"}
+
+# Topics published by the runtime itself
+RUNTIME_TOPICS = {"module_update"}
+
+
+class ModuleSpec:
+    """
+    Wiring of a module as seen by the analyzer (a BaseModule works too).
+    """
+
+    def __init__(
+        self,
+        module_id: str,
+        inputs: List[str],
+        outputs: List[str],
+        cycle: float,
+        is_env: bool = False,
+        cost: Optional[float] = None,
+        background: bool = False,
+    ):
+        self.module_id = module_id
+        self.inputs = inputs
+        self.outputs = outputs
+        self.cycle = cycle
+        self.is_env = is_env
+        self.cost = cost
+        self.background = background
+
+
+class GraphIssue:
+    def __init__(self, kind: str, severity: str, detail: str, modules=(), topics=()):
+        self.kind = kind
+        self.severity = severity
+        self.detail = detail
+        self.modules = list(modules)
+        self.topics = list(topics)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "severity": self.severity,
+            "detail": self.detail,
+            "modules": self.modules,
+            "topics": self.topics,
+        }
+
+
+class CriticalPath:
+    """
+    Most expensive module chain from an env output back to an env input.
+
+    - compute_s: sum of module costs along the chain
+    - staleness_s: sum of the chain's cycles, an upper bound on the extra
+      age of the input when the stages are not released in phase
+    - budget_s: env cycle, the loop should close within one env period
+    """
+
+    def __init__(self, env: str, modules: List[str], topics: List[str],
+                 compute_s: float, staleness_s: float, budget_s: float, missing_costs: List[str]):
+        self.env = env
+        self.modules = modules
+        self.topics = topics
+        self.compute_s = compute_s
+        self.staleness_s = staleness_s
+        self.budget_s = budget_s
+        self.missing_costs = missing_costs
+
+    @property
+    def meets_budget(self) -> bool:
+        return self.compute_s <= self.budget_s
+
+    def to_dict(self) -> dict:
+        return {
+            "env": self.env,
+            "modules": self.modules,
+            "topics": self.topics,
+            "compute_s": self.compute_s,
+            "staleness_s": self.staleness_s,
+            "budget_s": self.budget_s,
+            "meets_budget": self.meets_budget,
+            "missing_costs": self.missing_costs,
+        }
+
+
+class GraphReport:
+    def __init__(self):
+        self.issues: List[GraphIssue] = []
+        self.paths: List[CriticalPath] = []
+        self.utilization: Optional[float] = None
+
+    @property
+    def errors(self) -> List[GraphIssue]:
+        return [issue for issue in self.issues if issue.severity == "error"]
+
+    def add(self, kind: str, severity: str, detail: str, modules=(), topics=()):
+        self.issues.append(GraphIssue(kind, severity, detail, modules, topics))
+
+    def to_dict(self) -> dict:
+        return {
+            "issues": [issue.to_dict() for issue in self.issues],
+            "critical_paths": [path.to_dict() for path in self.paths],
+            "utilization": self.utilization,
+        }
+
+    def log(self):
+        for issue in self.issues:
+            AuditLogger.log_event("graph_issue", **issue.to_dict())
+
+        for path in self.paths:
+            AuditLogger.log_event("critical_path", **path.to_dict())
+
+
+# ----------------------------------------------------------------------
+# Analysis
+# ----------------------------------------------------------------------
+
+def analyze_graph(
+    modules: Iterable,
+    costs: Optional[Dict[str, float]] = None,
+    mode: str = "time-loop-based",
+    external_topics: Iterable[str] = (),
+    exported_topics: Iterable[str] = (),
+    max_workers: int = 4,
+) -> GraphReport:
+    """
+    Check the wiring of a graph and budget its critical paths.
+
+    Args:
+        modules: BaseModule instances or ModuleSpecs
+        costs: per-module execution time estimates in seconds (measured);
+            modules without an entry fall back to their declared 'cost'
+        mode: execution mode; budgets are only checked in time-based modes
+        external_topics: topics produced outside the graph (bridge imports)
+        exported_topics: topics consumed outside the graph (bridge exports)
+        max_workers: worker threads in time-thread-based mode (one per
+            module in event-thread-based mode)
+    """
+    modules = list(modules)
+    report = GraphReport()
+
+    costs = dict(costs or {})
+    for m in modules:
+        if m.module_id not in costs and getattr(m, "cost", None) is not None:
+            costs[m.module_id] = m.cost
+
+    external = set(external_topics) | RUNTIME_TOPICS
+    exported = set(exported_topics)
+
+    producers: Dict[str, List] = {}
+    consumers: Dict[str, List] = {}
+    for m in modules:
+        for topic in m.outputs:
+            producers.setdefault(topic, []).append(m)
+        for topic in m.inputs:
+            consumers.setdefault(topic, []).append(m)
+
+    # --- Wiring ---
+    for topic, readers in sorted(consumers.items()):
+        if topic not in producers and topic not in external:
+            report.add(
+                "missing_producer", "error",
+                f"Topic '{topic}' is consumed but never produced",
+                [m.module_id for m in readers], [topic],
+            )
+
+    for topic, writers in sorted(producers.items()):
+        if topic not in consumers and topic not in exported:
+            report.add(
+                "unconsumed_output", "warning",
+                f"Topic '{topic}' is produced but never consumed",
+                [m.module_id for m in writers], [topic],
+            )
+
+        if len(writers) > 1:
+            report.add(
+                "multiple_producers", "warning",
+                f"Topic '{topic}' has {len(writers)} producers racing on the latest value",
+                [m.module_id for m in writers], [topic],
+            )
+
+    # --- Modules that can never run ---
+    available = _available_topics(modules, external)
+    for m in modules:
+        blocked = [t for t in m.inputs if t not in available]
+        if blocked:
+            report.add(
+                "never_runs", "error",
+                f"Module '{m.module_id}' can never run, some inputs are never available",
+                [m.module_id], blocked,
+            )
+
+    # --- Dead work: nothing it produces reaches an env or leaves the node ---
+    if any(m.is_env for m in modules):
+        live = _live_modules(modules, producers, exported)
+        for m in modules:
+            if not m.is_env and m.module_id not in live:
+                report.add(
+                    "dead_work", "warning",
+                    f"Outputs of module '{m.module_id}' never reach an environment",
+                    [m.module_id], m.outputs,
+                )
+
+    # --- Budgets ---
+    time_based = mode in {"time-loop-based", "time-thread-based", "event-thread-based"}
+
+    for env in (m for m in modules if m.is_env):
+        path = _critical_path(env, consumers, costs)
+        if path is not None:
+            report.paths.append(path)
+
+    if not time_based:
+        return report
+
+    # Background modules run off the control loop at their own pace
+    foreground = [m for m in modules if not getattr(m, "background", False)]
+
+    for m in foreground:
+        cost = costs.get(m.module_id)
+        if cost is not None and cost > m.cycle:
+            report.add(
+                "over_budget", "error",
+                f"Module '{m.module_id}' costs {cost:.6f}s but runs every {m.cycle}s",
+                [m.module_id],
+            )
+
+    for path in report.paths:
+        if not path.meets_budget:
+            report.add(
+                "critical_path_over_budget", "error",
+                f"Loop of '{path.env}' needs {path.compute_s:.6f}s, "
+                f"budget is one env cycle ({path.budget_s}s)",
+                path.modules, path.topics,
+            )
+
+    known = [m for m in foreground if m.module_id in costs]
+    if known:
+        report.utilization = sum(costs[m.module_id] / m.cycle for m in known)
+        capacity = {"time-thread-based": max_workers, "event-thread-based": len(modules)}.get(mode, 1)
+
+        if report.utilization > capacity:
+            report.add(
+                "overloaded", "error",
+                f"Utilization {report.utilization:.2f} exceeds capacity {capacity}, "
+                "the graph cannot meet its rates",
+                [m.module_id for m in known],
+            )
+
+    return report
+
+
+def _available_topics(modules: List, external: Set[str]) -> Set[str]:
+    """Topics that are published at some point (env outputs seed the graph)."""
+    available = set(external)
+    for m in modules:
+        if m.is_env:
+            available.update(m.outputs)
+
+    changed = True
+    while changed:
+        changed = False
+        for m in modules:
+            if all(t in available for t in m.inputs) and not set(m.outputs) <= available:
+                available.update(m.outputs)
+                changed = True
+
+    return available
+
+
+def _live_modules(modules: List, producers: Dict[str, List], exported: Set[str]) -> Set[str]:
+    """Modules whose outputs (transitively) feed an env or an exported topic."""
+    live: Set[str] = set()
+    frontier = [m for m in modules if m.is_env]
+    frontier += [p for topic in exported for p in producers.get(topic, [])]
+
+    while frontier:
+        m = frontier.pop()
+        if m.module_id in live:
+            continue
+        live.add(m.module_id)
+        for topic in m.inputs:
+            frontier.extend(producers.get(topic, []))
+
+    return live
+
+
+def _critical_path(env, consumers: Dict[str, List], costs: Dict[str, float]) -> Optional[CriticalPath]:
+    """
+    Longest (by cost) chain of non-env modules from env.outputs to env.inputs.
+    """
+    targets = set(env.inputs)
+
+    # module_id -> (compute, staleness, modules, topics) of the best chain from this module
+    best: Dict[str, Optional[Tuple[float, float, List, List]]] = {}
+
+    def visit(m, stack: Set[str]):
+        if m.module_id in best:
+            return best[m.module_id]
+
+        # Background outputs are published later, they add staleness but no compute
+        own_cost = 0.0 if getattr(m, "background", False) else costs.get(m.module_id, 0.0)
+        result = None
+
+        for topic in m.outputs:
+            if topic in targets:
+                candidate = (own_cost, m.cycle, [m.module_id], [topic])
+                if result is None or candidate[0] > result[0]:
+                    result = candidate
+
+            for nxt in consumers.get(topic, []):
+                if nxt.is_env or nxt.module_id in stack:
+                    continue
+                tail = visit(nxt, stack | {nxt.module_id})
+                if tail is None:
+                    continue
+                candidate = (own_cost + tail[0], m.cycle + tail[1], [m.module_id] + tail[2], [topic] + tail[3])
+                if result is None or candidate[0] > result[0]:
+                    result = candidate
+
+        best[m.module_id] = result
+        return result
+
+    chosen = None
+    for topic in env.outputs:
+        for m in consumers.get(topic, []):
+            if m.is_env:
+                continue
+            chain = visit(m, {m.module_id})
+            if chain is None:
+                continue
+            candidate = (chain[0], chain[1], chain[2], [topic] + chain[3])
+            if chosen is None or candidate[0] > chosen[0]:
+                chosen = candidate
+
+    if chosen is None:
+        return None
+
+    compute, staleness, chain_modules, topics = chosen
+    env_cost = costs.get(env.module_id, 0.0)
+
+    return CriticalPath(
+        env=env.module_id,
+        modules=chain_modules + [env.module_id],
+        topics=topics,
+        compute_s=compute + env_cost,
+        staleness_s=staleness,
+        budget_s=env.cycle,
+        missing_costs=[mid for mid in chain_modules + [env.module_id] if mid not in costs],
+    )
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+def specs_from_config(config: dict) -> List[ModuleSpec]:
+    return [
+        ModuleSpec(
+            module_id=entry["id"],
+            inputs=entry.get("inputs", []),
+            outputs=entry.get("outputs", []),
+            cycle=entry.get("cycle", 1),
+            is_env=entry.get("is_env", False),
+            cost=entry.get("cost"),
+            background=entry.get("background", False),
+        )
+        for entry in config["modules"]
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Static analysis of a runtime config")
+    parser.add_argument("config")
+    parser.add_argument("--costs", help="JSON file mapping module IDs to measured costs (seconds)")
+    args = parser.parse_args(argv)
+
+    with open(Path(args.config)) as f:
+        config = json.load(f)
+
+    costs = None
+    if args.costs:
+        with open(Path(args.costs)) as f:
+            costs = json.load(f)
+
+    bridge = config.get("bridge") or {}
+    report = analyze_graph(
+        specs_from_config(config),
+        costs=costs,
+        mode=config.get("mode", "time-loop-based"),
+        external_topics=bridge.get("import", []),
+        exported_topics=bridge.get("export", []),
+    )
+
+    print(json.dumps(report.to_dict(), indent=2))
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    AuditLogger.enabled = False
+    sys.exit(main())
@@ -0,0 +1,269 @@
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Optional
+
+from core.clock import Clock
+from core.runtime import Runtime
+from core.audit_logger import AuditLogger
+from core.timing import TIME_EPSILON
+
+
+HOST_POLICIES = {"round-robin", "weighted"}
+
+
+class GraphStats:
+    """
+    Per-graph metrics of a host, isolated from all other graphs.
+    """
+
+    def __init__(self, weight: float):
+        self.weight = weight
+
+        self.ticks = 0
+        self.busy_s = 0.0
+        self.max_tick_s = 0.0
+        self.lateness_sum = 0.0
+        self.lateness_max = 0.0
+
+        # Round-robin order: sequence number of the last dispatch
+        self.last_served = -1
+
+    def report(self) -> dict:
+        return {
+            "weight": self.weight,
+            "ticks": self.ticks,
+            "busy_s": self.busy_s,
+            "max_tick_s": self.max_tick_s,
+            "lateness_mean_s": self.lateness_sum / self.ticks if self.ticks else 0.0,
+            "lateness_max_s": self.lateness_max,
+        }
+
+
+class RuntimeHost:
+    """
+    Drives many independent time-based graphs from one loop.
+
+    Every graph keeps its own Mediator (its topic namespace), Scheduler
+    state and metrics, but all graphs share one clock, one dispatch loop
+    and one worker pool. A graph tick (Runtime.tick) never runs in two
+    workers at once. When several graphs are due, they are dispatched:
+    - round-robin: least recently served graph first
+    - weighted: graph with the least busy time per weight first
+
+    Each graph goes through the lifecycle of Runtime.run: its services
+    (bridge, introspection) are started with the host, it stops after its
+    own max_time (at the latest with the host) and writes its reports,
+    profiles and trace when the host stops. Graphs that would share a
+    listen address or an output file are rejected.
+    """
+
+    def __init__(
+        self,
+        runtimes: Dict[str, Runtime],
+        clock: Optional[Clock] = None,
+        max_workers: Optional[int] = None,
+        policy: str = "round-robin",
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        if policy not in HOST_POLICIES:
+            raise ValueError(f"Unsupported host policy: {policy}")
+
+        for graph_id, runtime in runtimes.items():
+            if runtime.mode != "time-loop-based":
+                raise ValueError(
+                    f"Graph '{graph_id}' must use mode 'time-loop-based' on a host, got '{runtime.mode}'"
+                )
+
+        self._check_shared_resources(runtimes)
+
+        self.runtimes = runtimes
+        self.clock = clock or Clock()
+        self.policy = policy
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+
+        weights = weights or {}
+        self.stats: Dict[str, GraphStats] = {
+            graph_id: GraphStats(float(weights.get(graph_id, 1.0))) for graph_id in runtimes
+        }
+
+        self._sequence = 0
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def _check_shared_resources(runtimes: Dict[str, Runtime]):
+        """
+        Sockets and output files are per graph; two graphs using the same
+        one would fail or overwrite each other on a shared host.
+        """
+        owners = {}
+
+        for graph_id, runtime in runtimes.items():
+            resources = []
+            if runtime.bridge and runtime.bridge.listen:
+                resources.append(("bridge listen address", runtime.bridge.listen))
+            if runtime.introspection:
+                resources.append(("introspection address", runtime.introspection.listen))
+            if runtime.profiler:
+                resources.append(("profiling directory", os.path.abspath(runtime.profiler.output_dir)))
+            if runtime.tracer:
+                resources.append(("trace path", os.path.abspath(runtime.tracer.path)))
+
+            for resource in resources:
+                if resource[1].startswith("tcp://") and resource[1].endswith(":0"):
+                    continue  # Port 0 picks a free port per graph
+
+                other = owners.setdefault(resource, graph_id)
+                if other != graph_id:
+                    raise ValueError(
+                        f"Graphs '{other}' and '{graph_id}' cannot share the {resource[0]} '{resource[1]}' on a host"
+                    )
+
+    @classmethod
+    def from_configs(
+        cls,
+        config_paths: Dict[str, str],
+        clock: Optional[Clock] = None,
+        **kwargs,
+    ) -> "RuntimeHost":
+        """
+        Load one graph per config (graph ID -> config path). Module IDs
+        are prefixed with the graph ID and all graphs share the host clock.
+        """
+        clock = clock or Clock()
+        runtimes = {
+            graph_id: Runtime.from_config(path, namespace=graph_id, clock=clock)
+            for graph_id, path in config_paths.items()
+        }
+        return cls(runtimes, clock=clock, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def run(self, max_time: float):
+        AuditLogger.log_event(
+            "host_started",
+            graphs=len(self.runtimes),
+            policy=self.policy,
+            workers=self.max_workers,
+        )
+
+        started = []
+
+        try:
+            for runtime in self.runtimes.values():
+                if not runtime._resumed:
+                    runtime._reset_episode()
+
+            for runtime in self.runtimes.values():
+                runtime.start()
+                started.append(runtime)
+
+            now = self.clock.now()
+            end_time = now + max_time
+            next_wake = {graph_id: now for graph_id in self.runtimes}
+            running = {}
+
+            # A graph stops after its own max_time, at the latest with the host
+            graph_end = {
+                graph_id: min(end_time, now + runtime.max_time)
+                for graph_id, runtime in self.runtimes.items()
+            }
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while True:
+                    now = self.clock.now()
+                    active = {
+                        graph_id for graph_id, end_at in graph_end.items()
+                        if now + TIME_EPSILON < end_at
+                    }
+                    if not active and not running:
+                        break
+
+                    running_ids = set(running.values())
+                    due = [
+                        graph_id for graph_id in active
+                        if graph_id not in running_ids and next_wake[graph_id] <= now + TIME_EPSILON
+                    ]
+
+                    for graph_id in self._order(due):
+                        future = pool.submit(self._tick, graph_id, next_wake[graph_id])
+                        running[future] = graph_id
+
+                    running_ids = set(running.values())
+                    idle_wakes = [
+                        min(next_wake[graph_id], graph_end[graph_id]) for graph_id in active
+                        if graph_id not in running_ids
+                    ]
+                    wake_at = min(idle_wakes + [end_time])
+
+                    if running and not self.clock.virtual:
+                        timeout = max(0.0, wake_at - self.clock.now())
+                        done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    elif running:
+                        # Virtual time only advances once all graphs are idle
+                        done, _ = wait(running)
+                    else:
+                        done = ()
+                        self.clock.sleep_until(wake_at)
+
+                    for future in done:
+                        graph_id = running.pop(future)
+                        next_wake[graph_id] = future.result()
+
+        finally:
+            for graph_id, runtime in self.runtimes.items():
+                runtime.log_timing_report()
+                AuditLogger.log_event("host_graph_report", graph=graph_id, **self.stats[graph_id].report())
+
+            for runtime in started:
+                runtime.stop()
+
+            AuditLogger.log_event("host_stopped")
+
+    def _order(self, due: Iterable[str]):
+        if self.policy == "weighted":
+            return sorted(due, key=lambda g: self.stats[g].busy_s / self.stats[g].weight)
+
+        return sorted(due, key=lambda g: self.stats[g].last_served)
+
+    def _tick(self, graph_id: str, due_at: float) -> float:
+        runtime = self.runtimes[graph_id]
+        stats = self.stats[graph_id]
+
+        start = self.clock.now()
+        try:
+            wake_at = runtime.tick()
+        except Exception as e:
+            AuditLogger.log_event("host_graph_error", graph=graph_id, error=str(e))
+            wake_at = start + runtime.scheduler.min_cycle
+        duration = self.clock.now() - start
+
+        with self._stats_lock:
+            lateness = max(0.0, start - due_at)
+            stats.ticks += 1
+            stats.busy_s += duration
+            stats.max_tick_s = max(stats.max_tick_s, duration)
+            stats.lateness_sum += lateness
+            stats.lateness_max = max(stats.lateness_max, lateness)
+            stats.last_served = self._sequence
+            self._sequence += 1
+
+        return wake_at
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> Dict[str, dict]:
+        """
+        Per-graph host metrics and module timing reports.
+        """
+        return {
+            graph_id: {
+                **self.stats[graph_id].report(),
+                "modules": self.runtimes[graph_id].timing_report(),
+            }
+            for graph_id in self.runtimes
+        }
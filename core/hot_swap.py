@@ -0,0 +1,253 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+from core.messages import Message
+from core.base_module import BaseModule
+from core.audit_logger import AuditLogger
+from utils.context import Context
+from utils.module_loader import auto_load_modules
+
+
+# Scheduling attributes set per module entry in the config (see Runtime.from_config)
+ENTRY_ATTRIBUTES = ("cost", "priority", "deadline", "degradable", "max_cycle", "background")
+
+
+class ModuleSwapper:
+    """
+    Hot replacement of module instances while the runtime keeps running.
+
+    Lifecycle of a swap:
+    1. request(): the new instance is built and warmed up on a background thread
+    2. apply_pending(): between two scheduler ticks the instance replaces the
+       old one in its slot (optionally with transferred state)
+    3. check_served(): once the new instance executed for the first time,
+       the unserved time of the slot is audited and the future is resolved
+
+    The wiring (id, inputs, outputs, cycle) of a slot never changes, and
+    the scheduling attributes of its config entry (priority, deadline,
+    cost, degradable, max_cycle, background) carry over to the new
+    instance. Cycles are compared against the nominal cycle; a cycle
+    stretched by the overload controller is kept across the swap.
+    In the threaded modes, an execution of the old instance that is
+    still in flight at swap time may publish one more output.
+    """
+
+    def __init__(self, runtime):
+        self.runtime = runtime
+
+        self._lock = threading.Lock()
+        self._ready: List[tuple] = []
+        self._awaiting: List[tuple] = []
+
+    # ------------------------------------------------------------------
+    # Request (any thread)
+    # ------------------------------------------------------------------
+
+    def request(
+        self,
+        module_id: str,
+        module_type: Optional[str] = None,
+        config: Optional[dict] = None,
+        module: Optional[BaseModule] = None,
+        transfer_state: bool = True,
+    ) -> Future:
+        old = self._find(module_id)
+
+        if (module_type is None) == (module is None):
+            raise ValueError("Provide exactly one of 'module_type' or 'module'")
+
+        def build() -> BaseModule:
+            if module is not None:
+                return module
+            return self._build(old, module_type, config)
+
+        future: Future = Future()
+
+        thread = threading.Thread(
+            target=self._prepare,
+            args=(future, module_id, build, transfer_state),
+            daemon=True,
+        )
+        thread.start()
+
+        return future
+
+    def _build(self, old: BaseModule, module_type: str, config: Optional[dict]) -> BaseModule:
+        module_cls = auto_load_modules().get(module_type)
+        if not module_cls:
+            raise ValueError(f"Unknown module type: {module_type}")
+
+        return module_cls(
+            module_id=old.module_id,
+            inputs=list(old.inputs),
+            outputs=list(old.outputs),
+            cycle=self._nominal_cycle(old),
+            is_env=old.is_env,
+            config=old.config if config is None else config,
+        )
+
+    def _prepare(self, future: Future, module_id: str, build: Callable, transfer_state: bool):
+        try:
+            new = build()
+            old = self._find(module_id)
+            self._validate(old, new, self._nominal_cycle(old))
+            new.warmup()
+        except Exception as e:
+            AuditLogger.log_event("module_swap_failed", module=module_id, error=str(e))
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._ready.append((future, new, transfer_state, self.runtime.clock.now()))
+
+    # ------------------------------------------------------------------
+    # Runtime side (between scheduler ticks)
+    # ------------------------------------------------------------------
+
+    def apply_pending(self):
+        """
+        Swap all warmed-up modules into their slots.
+        Must be called between scheduler ticks.
+        """
+        if not self._ready:
+            return
+
+        with self._lock:
+            ready, self._ready = self._ready, []
+
+        for future, new, transfer_state, ready_at in ready:
+            old = self._find(new.module_id)
+
+            if transfer_state:
+                # The old module's state must not change while it is copied
+                self.runtime.scheduler.wait_background([old.module_id])
+
+            state = old.get_state() if transfer_state else None
+            if state is not None:
+                new.set_state(state)
+
+            new.last_execution = old.last_execution
+            if new.experience is None:
+                new.experience = old.experience
+
+            # Attributes from the config entry live on the instance
+            for name in ENTRY_ATTRIBUTES:
+                if name in vars(old):
+                    setattr(new, name, getattr(old, name))
+            new.cycle = old.cycle
+
+            modules = self.runtime.modules
+            modules[modules.index(old)] = new
+            self.runtime._index_modules()
+            self.runtime.scheduler.clear_memo(new.module_id)
+
+            swapped_at = self.runtime.clock.now()
+
+            self.runtime.mediator.publish(
+                Message(
+                    topic="module_update",
+                    payload=Context(
+                        state=new.module_id,
+                        info={
+                            "old_type": type(old).__name__,
+                            "new_type": type(new).__name__,
+                        },
+                    ),
+                    sender="runtime",
+                    timestamp=self.runtime.clock.timestamp(),
+                )
+            )
+
+            self._awaiting.append((future, old, new, state is not None, ready_at, swapped_at))
+
+    def check_served(self):
+        """
+        Resolve swaps whose new module has executed at least once.
+        The unserved time is measured from the last execution of the old
+        instance to the first execution of the new one.
+        """
+        if not self._awaiting:
+            return
+
+        still_waiting = []
+
+        for entry in self._awaiting:
+            future, old, new, transferred, ready_at, swapped_at = entry
+
+            if new.last_execution <= old.last_execution:
+                still_waiting.append(entry)
+                continue
+
+            unserved = (
+                new.last_execution - old.last_execution
+                if old.last_execution > -float("inf") else 0.0
+            )
+            result = self._result(entry, unserved)
+
+            AuditLogger.log_event("module_swapped", **result)
+            future.set_result(result)
+
+        self._awaiting = still_waiting
+
+    def close(self):
+        """
+        Cancel swaps that were not applied and resolve swaps whose new
+        module has not executed before the runtime stopped.
+        """
+        with self._lock:
+            ready, self._ready = self._ready, []
+
+        for future, *_ in ready:
+            future.cancel()
+
+        for entry in self._awaiting:
+            entry[0].set_result(self._result(entry, None))
+
+        self._awaiting = []
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _nominal_cycle(self, module: BaseModule) -> float:
+        """Configured cycle of a slot (before any overload stretching)."""
+        overload = self.runtime.overload
+        if overload is not None and module.module_id in overload.nominal:
+            return overload.nominal[module.module_id]
+        return module.cycle
+
+    def _find(self, module_id: str) -> BaseModule:
+        for module in self.runtime.modules:
+            if module.module_id == module_id:
+                return module
+
+        raise ValueError(f"Unknown module: {module_id}")
+
+    @staticmethod
+    def _result(entry: tuple, unserved: Optional[float]) -> dict:
+        _, old, new, transferred, ready_at, swapped_at = entry
+        return {
+            "module": new.module_id,
+            "old_type": type(old).__name__,
+            "new_type": type(new).__name__,
+            "state_transferred": transferred,
+            "tick_wait_s": swapped_at - ready_at,
+            "unserved_s": unserved,
+        }
+
+    @staticmethod
+    def _validate(old: BaseModule, new: BaseModule, cycle: float):
+        if not isinstance(new, BaseModule):
+            raise TypeError(f"Replacement for '{old.module_id}' must be a BaseModule")
+
+        if (
+            new.module_id != old.module_id
+            or list(new.inputs) != list(old.inputs)
+            or list(new.outputs) != list(old.outputs)
+            or new.cycle != cycle
+            or new.is_env != old.is_env
+        ):
+            raise ValueError(
+                f"Replacement for '{old.module_id}' must keep id, inputs, outputs, cycle and is_env"
+            )
@@ -0,0 +1,353 @@
+import os
+import json
+import time
+import socket
+import threading
+import socketserver
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List, Optional, Tuple
+
+from core.audit_logger import AuditLogger
+from utils.context import Context
+
+# Attempts to read a topic's message and version without a publish in between
+_READ_RETRIES = 3
+
+
+# ----------------------------------------------------------------------
+# Addresses
+# ----------------------------------------------------------------------
+
+def _parse_address(address: str):
+    """
+    'tcp://host:port' -> (AF_INET, (host, port)), port 0 picks a free port
+    'unix:///path'    -> (AF_UNIX, path)
+    """
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return socket.AF_INET, (host, int(port))
+
+    if address.startswith("unix://"):
+        return socket.AF_UNIX, address[len("unix://"):]
+
+    raise ValueError(f"Unsupported introspection address: {address}")
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+# ----------------------------------------------------------------------
+# Request handling
+# ----------------------------------------------------------------------
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "orca-introspection"
+
+    def do_GET(self):
+        introspection = self.server.introspection
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+
+        view = introspection.views.get(path)
+        if view is None:
+            self._send(404, {"error": f"Unknown path '{path}'", "paths": sorted(introspection.views)})
+            return
+
+        try:
+            self._send(200, view())
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, default=str).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _payload_value(payload):
+    if isinstance(payload, Context):
+        return {
+            "state": payload.state,
+            "reward": payload.reward,
+            "terminated": payload.terminated,
+            "truncated": payload.truncated,
+            "info": payload.info,
+        }
+    return payload
+
+
+# ----------------------------------------------------------------------
+# Server
+# ----------------------------------------------------------------------
+
+class IntrospectionServer:
+    """
+    Read-only JSON endpoint that shows what a running runtime is doing.
+
+    Served over HTTP on TCP or a Unix socket from its own thread:
+    - /topics:    latest value, age, version and update rate per topic
+    - /modules:   last execution, cycle and timing per module
+    - /scheduler: step counter, step/cycle durations and backlog
+    - /audit:     AuditLogger queue depth
+    - /:          all of the above
+
+    Queries never take locks of the control loop. Each topic's message and
+    version are read as a pair (retried while a publish bumps the version
+    in between), but different topics are read one after another, so an
+    answer is not a snapshot of one common instant.
+    Update rates are derived from version counters sampled on the server
+    thread over a sliding window.
+
+    e.g. curl localhost:8765/topics
+         curl --unix-socket /tmp/orca.sock http://x/scheduler
+    """
+
+    def __init__(self, runtime, listen: str = "tcp://127.0.0.1:8765", window: float = 5.0):
+        if window <= 0:
+            raise ValueError("Introspection window must be positive")
+
+        self.runtime = runtime
+        self.listen = listen
+        self.window = window
+
+        self.family, self._bind_address = _parse_address(listen)
+
+        self.views = {
+            "/": self.snapshot,
+            "/topics": self.topics,
+            "/modules": self.modules,
+            "/scheduler": self.scheduler,
+            "/audit": self.audit,
+        }
+
+        # (wall time, versions) samples for update rates
+        self._samples: Deque[Tuple[float, List[int]]] = deque()
+        self._sample_interval = window / 10
+
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._server is not None:
+            return
+
+        if self.family == socket.AF_UNIX:
+            if os.path.exists(self._bind_address):
+                os.unlink(self._bind_address)
+            self._server = _UnixHTTPServer(self._bind_address, _Handler)
+        else:
+            self._server = ThreadingHTTPServer(self._bind_address, _Handler)
+            self._server.daemon_threads = True
+
+        self._server.introspection = self
+        self._server.service_actions = self._sample
+
+        self._started_at = time.monotonic()
+        self._sample()
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": min(0.5, self._sample_interval)},
+            name="introspection",
+            daemon=True,
+        )
+        self._thread.start()
+
+        AuditLogger.log_event("introspection_started", address=self.address)
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=1)
+
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self._bind_address)
+            except OSError:
+                pass
+
+        self._server = None
+        self._thread = None
+        AuditLogger.log_event("introspection_stopped", address=self.listen)
+
+    @property
+    def address(self) -> str:
+        """Bound address (with the actual port when listening on port 0)."""
+        if self._server is None or self.family == socket.AF_UNIX:
+            return self.listen
+
+        host, port = self._server.server_address[:2]
+        return f"tcp://{host}:{port}"
+
+    # ------------------------------------------------------------------
+    # Update rates
+    # ------------------------------------------------------------------
+
+    def _sample(self):
+        """
+        Called on the server thread between requests; keeps version
+        samples covering the last 'window' seconds.
+        """
+        now = time.monotonic()
+        if self._samples and now - self._samples[-1][0] < self._sample_interval:
+            return
+
+        self._samples.append((now, list(self.runtime.mediator.versions)))
+        while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+            self._samples.popleft()
+
+    def _rates(self, versions: List[int], now: float) -> List[float]:
+        if not self._samples:
+            return [0.0] * len(versions)
+
+        since, old = self._samples[0]
+        elapsed = now - since
+        if elapsed <= 0:
+            return [0.0] * len(versions)
+
+        return [
+            (version - (old[topic_id] if topic_id < len(old) else 0)) / elapsed
+            for topic_id, version in enumerate(versions)
+        ]
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def topics(self) -> dict:
+        mediator = self.runtime.mediator
+
+        # Interning appends name, slot, version in this order; reading the
+        # count from versions first leaves names and slots for every topic
+        count = len(mediator.versions)
+        names = list(mediator.topics)
+
+        versions = []
+        slots = []
+        for topic_id in range(count):
+            versions.append(self._read_topic(topic_id, slots))
+
+        now = time.monotonic()
+        rates = self._rates(versions, now)
+        clock_now = self.runtime.clock.timestamp()
+
+        topics = {}
+        for topic_id, version in enumerate(versions):
+            msg = slots[topic_id]
+            entry = {
+                "version": version,
+                "rate_hz": rates[topic_id],
+                "subscribers": mediator.get_subscribers(names[topic_id]),
+            }
+
+            if msg is not None:
+                entry.update(
+                    sender=msg.sender,
+                    timestamp=msg.timestamp,
+                    age_s=clock_now - msg.timestamp,
+                    value=_payload_value(msg.payload),
+                )
+                if msg.staleness:
+                    entry["staleness"] = msg.staleness
+
+            topics[names[topic_id]] = entry
+
+        window = now - self._samples[0][0] if self._samples else 0.0
+        return {"window_s": window, "topics": topics}
+
+    def _read_topic(self, topic_id: int, slots: list) -> int:
+        """
+        Append the topic's message to slots and return its version, read
+        as a pair: retried while a publish bumps the version in between.
+        """
+        mediator = self.runtime.mediator
+
+        for _ in range(_READ_RETRIES):
+            version = mediator.versions[topic_id]
+            msg = mediator.slots[topic_id]
+            if mediator.versions[topic_id] == version:
+                break
+
+        slots.append(msg)
+        return version
+
+    def modules(self) -> dict:
+        runtime = self.runtime
+        scheduler = runtime.scheduler
+        clock_now = runtime.clock.now()
+
+        modules = {}
+        for module in list(scheduler.modules):
+            # Counters are read without the stats lock, the loop never waits on a query
+            stats = scheduler.timing.get(module.module_id)
+            executions = stats.executions if stats else 0
+            releases = stats.releases if stats else 0
+
+            last = module.last_execution
+            modules[module.module_id] = {
+                "type": type(module).__name__,
+                "cycle": module.cycle,
+                "background": module.background,
+                "last_execution": last if last != -float("inf") else None,
+                "since_last_s": clock_now - last if last != -float("inf") else None,
+                "executions": executions,
+                "exec_mean_s": stats.exec_sum / executions if executions else None,
+                "exec_max_s": stats.exec_max if executions else None,
+                "exec_last_s": stats.exec_last if executions else None,
+                "jitter_max_s": stats.jitter_max if releases else None,
+                "deadline_misses": stats.deadline_misses if stats else 0,
+                "skipped_periods": stats.skipped_periods if stats else 0,
+            }
+
+        return {"modules": modules}
+
+    def scheduler(self) -> dict:
+        runtime = self.runtime
+        scheduler = runtime.scheduler
+        cycles = scheduler.boundary
+
+        return {
+            "mode": runtime.mode,
+            "step": runtime._next_step if runtime.mode == "step-based" else None,
+            "cycles": cycles,
+            "cycle_last_s": scheduler.cycle_last_s,
+            "cycle_mean_s": scheduler.cycle_sum_s / cycles if cycles else 0.0,
+            "cycle_max_s": scheduler.cycle_max_s,
+            "min_cycle": scheduler.min_cycle,
+            "backlog": scheduler.backlog(),
+            "uptime_s": time.monotonic() - self._started_at,
+        }
+
+    def audit(self) -> dict:
+        return {
+            "enabled": AuditLogger.enabled,
+            "queue_depth": AuditLogger.queue_depth(),
+        }
+
+    def snapshot(self) -> dict:
+        return {
+            "scheduler": self.scheduler(),
+            "audit": self.audit(),
+            "modules": self.modules()["modules"],
+            "topics": self.topics()["topics"],
+        }
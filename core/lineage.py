@@ -0,0 +1,130 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Iterable, Optional, Tuple
+
+from core.messages import Message
+
+
+# Upper bucket bounds for end-to-end latency (seconds)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def merge_origins(messages: Iterable[Message]) -> Optional[Dict[str, float]]:
+    """
+    Origins of a message derived from the given input messages: per
+    origin topic, the oldest origin timestamp over all inputs (the age
+    of the stalest data the output depends on).
+
+    Returns None if no input carries origins. When a single input (or
+    several inputs sharing one dict) contributes, its dict is reused
+    instead of copied, so chains propagate origins without allocating.
+    """
+    merged = None
+    copied = False
+
+    for msg in messages:
+        origins = msg.origins
+        if not origins or origins is merged:
+            continue
+
+        if merged is None:
+            merged = origins
+            continue
+
+        if not copied:
+            merged = dict(merged)
+            copied = True
+
+        for topic, timestamp in origins.items():
+            if timestamp < merged.get(topic, math.inf):
+                merged[topic] = timestamp
+
+    return merged
+
+
+class LatencyStats:
+    """
+    Latency distribution of one path (origin topic -> env input topic).
+
+    Keeps count, mean, min, max and a bucket histogram over all samples,
+    and percentiles over the most recent 'window' samples.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.hist = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.recent = deque(maxlen=window)
+
+        # Environments may run concurrently in threaded mode
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self.count += 1
+            self.total += latency
+            self.min = min(self.min, latency)
+            self.max = max(self.max, latency)
+            self.hist[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            self.recent.append(latency)
+
+    def report(self) -> dict:
+        with self._lock:
+            recent = sorted(self.recent)
+            labels = [f"<={b}s" for b in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+
+            return {
+                "samples": self.count,
+                "mean_s": self.total / self.count if self.count else 0.0,
+                "min_s": self.min if self.count else 0.0,
+                "max_s": self.max,
+                "p50_s": _percentile(recent, 0.50),
+                "p95_s": _percentile(recent, 0.95),
+                "p99_s": _percentile(recent, 0.99),
+                "histogram": dict(zip(labels, self.hist)),
+            }
+
+
+def _percentile(ordered, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LineageTracker:
+    """
+    End-to-end latency per env -> actuator path.
+
+    Every message carries the origin timestamps of the data it was derived
+    from (Message.origins). When an environment consumes an input, the age
+    of each origin at that moment is recorded under the path
+    (env, origin topic, input topic), e.g. true_temp -> safe_action: how
+    old the temperature reading behind the applied action was.
+    """
+
+    def __init__(self):
+        self.paths: Dict[Tuple[str, str, str], LatencyStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, env_id: str, inputs: Iterable[Tuple[str, Message]], now: float):
+        for topic, msg in inputs:
+            if not msg.origins:
+                continue
+
+            for origin, timestamp in msg.origins.items():
+                key = (env_id, origin, topic)
+                stats = self.paths.get(key)
+                if stats is None:
+                    with self._lock:
+                        stats = self.paths.setdefault(key, LatencyStats())
+                stats.record(max(0.0, now - timestamp))
+
+    def report(self) -> Dict[str, dict]:
+        return {
+            f"{env_id}:{origin}->{topic}": dict(env=env_id, origin=origin, actuator=topic, **stats.report())
+            for (env_id, origin, topic), stats in list(self.paths.items())
+        }
@@ -1,6 +1,35 @@
-from typing import Dict, List
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
 from core.messages import Message
 from core.audit_logger import AuditLogger
+from utils.context import Context
+
+
+class _LatestView(Mapping):
+    """
+    Read-only, string-keyed view of the latest message per topic
+    (for monitors and tools).
+    """
+
+    def __init__(self, mediator: "Mediator"):
+        self._mediator = mediator
+
+    def __getitem__(self, topic: str) -> Message:
+        topic_id = self._mediator._topic_ids.get(topic)
+        msg = None if topic_id is None else self._mediator.slots[topic_id]
+        if msg is None:
+            raise KeyError(topic)
+        return msg
+
+    def __iter__(self) -> Iterator[str]:
+        mediator = self._mediator
+        return (
+            mediator.topics[i] for i, msg in enumerate(list(mediator.slots)) if msg is not None
+        )
+
+    def __len__(self) -> int:
+        return sum(1 for msg in self._mediator.slots if msg is not None)
 
 
 class Mediator:
@@ -11,15 +40,89 @@ class Mediator:
     - Store the latest Message per topic
     - Provide read access for schedulers and monitors
     - Track topic subscriptions as meta-information
+    - Notify per-topic publish hooks
+
+    Topics are interned to dense integer IDs (topic_id()). The latest
+    messages live in a flat slot array indexed by topic ID, with a version
+    counter per slot that increases on every publish and clear. The
+    scheduler reads slots by the precomputed topic IDs of each module;
+    string-keyed access (get_latest, latest_messages) remains for tools.
+
+    Topics marked with require_context() (module inputs) only accept
+    Context payloads; this is checked once at publish time.
     """
 
-    def __init__(self):
-        # Latest message per topic
-        self.latest_messages: Dict[str, Message] = {}
+    def __init__(self, namespace: str = ""):
+        # Prefix for topics in audit output (graphs sharing one host)
+        self.namespace = namespace
+
+        # Topic interning: name -> ID and ID -> name
+        self._topic_ids: Dict[str, int] = {}
+        self.topics: List[str] = []
+
+        # Per topic ID: latest message, version, Context-only flag, hooks
+        self.slots: List[Optional[Message]] = []
+        self.versions: List[int] = []
+        self._context_only: List[bool] = []
+        self._hooks: List[List[Callable[[Message], None]]] = []
+        self._audit_topics: List[str] = []
+
+        self._intern_lock = threading.Lock()
+
+        # Latest message per topic, keyed by topic name (read-only)
+        self.latest_messages: Mapping[str, Message] = _LatestView(self)
 
         # Topic -> list of subscribed module IDs (meta-info)
         self._subscribers: Dict[str, List[str]] = {}
 
+    # ------------------------------------------------------------------
+    # Topic IDs
+    # ------------------------------------------------------------------
+
+    def topic_id(self, topic: str) -> int:
+        """
+        Return the dense integer ID of a topic, allocating a slot for
+        unknown topics.
+        """
+        topic_id = self._topic_ids.get(topic)
+        if topic_id is not None:
+            return topic_id
+
+        if not topic:
+            raise ValueError("Message topic must be a non-empty string")
+
+        with self._intern_lock:
+            topic_id = self._topic_ids.get(topic)
+            if topic_id is None:
+                topic_id = len(self.topics)
+                self.topics.append(topic)
+                self.slots.append(None)
+                self.versions.append(0)
+                self._context_only.append(False)
+                self._hooks.append([])
+                self._audit_topics.append(f"{self.namespace}/{topic}" if self.namespace else topic)
+                self._topic_ids[topic] = topic_id
+
+        return topic_id
+
+    def require_context(self, topic: str):
+        """
+        Only accept Context payloads on this topic (topics consumed by modules).
+        """
+        topic_id = self.topic_id(topic)
+        self._context_only[topic_id] = True
+
+        msg = self.slots[topic_id]
+        if msg is not None:
+            self._check_payload(topic_id, msg)
+
+    def _check_payload(self, topic_id: int, message: Message):
+        if self._context_only[topic_id] and not isinstance(message.payload, Context):
+            raise TypeError(
+                f"Topic '{self.topics[topic_id]}' expects Context payloads, "
+                f"got {type(message.payload)} from '{message.sender}'"
+            )
+
     # ------------------------------------------------------------------
     # Publishing
     # ------------------------------------------------------------------
@@ -32,17 +135,46 @@ class Mediator:
         Args:
             message (Message): Message to publish
         """
-        if not message.topic:
-            raise ValueError("Message topic must be a non-empty string")
+        topic_id = self._topic_ids.get(message.topic)
+        if topic_id is None:
+            topic_id = self.topic_id(message.topic)
+
+        if self._context_only[topic_id]:
+            self._check_payload(topic_id, message)
 
         # Overwrite latest message for this topic
-        self.latest_messages[message.topic] = message
+        self.slots[topic_id] = message
+        self.versions[topic_id] += 1
+
+        for hook in self._hooks[topic_id]:
+            hook(message)
 
         AuditLogger.log_message_sent(
-            topic=message.topic,
+            topic=self._audit_topics[topic_id],
             sender=message.sender
         )
 
+    def add_publish_hook(self, topic: str, hook: Callable[[Message], None]):
+        """
+        Register a callback that is invoked with every message
+        published on the given topic (in the publishing thread).
+        """
+        if not topic:
+            raise ValueError("topic must be non-empty")
+
+        self._hooks[self.topic_id(topic)].append(hook)
+
+    def remove_publish_hook(self, topic: str, hook: Callable[[Message], None]):
+        """
+        Unregister a publish hook (no-op if it is not registered).
+        """
+        topic_id = self._topic_ids.get(topic)
+        if topic_id is None:
+            return
+
+        # Replace the list, publishers may be iterating the old one
+        self._hooks[topic_id] = [h for h in self._hooks[topic_id] if h != hook]
+
     # ------------------------------------------------------------------
     # Reading
     # ------------------------------------------------------------------
@@ -66,6 +198,13 @@ class Mediator:
         """
         return dict(self.latest_messages)
 
+    def get_version(self, topic: str) -> int:
+        """
+        Number of publishes and clears of a topic so far (0 if unknown).
+        """
+        topic_id = self._topic_ids.get(topic)
+        return 0 if topic_id is None else self.versions[topic_id]
+
     # ------------------------------------------------------------------
     # Subscriptions (meta-information)
     # ------------------------------------------------------------------
@@ -96,4 +235,28 @@ class Mediator:
         Clear all stored messages.
         Subscriptions are kept.
         """
-        self.latest_messages.clear()
\ No newline at end of file
+        for topic_id, msg in enumerate(self.slots):
+            if msg is not None:
+                self.slots[topic_id] = None
+                self.versions[topic_id] += 1
+
+    def clear_topics(self, topics: Iterable[str]):
+        """
+        Remove the stored messages of the given topics only.
+        """
+        for topic in topics:
+            topic_id = self._topic_ids.get(topic)
+            if topic_id is not None and self.slots[topic_id] is not None:
+                self.slots[topic_id] = None
+                self.versions[topic_id] += 1
+
+    def load(self, messages: Dict[str, Message]):
+        """
+        Store messages (topic -> Message) as latest values without
+        notifying hooks or auditing, e.g. when restoring a checkpoint.
+        """
+        for topic, msg in messages.items():
+            topic_id = self.topic_id(topic)
+            self._check_payload(topic_id, msg)
+            self.slots[topic_id] = msg
+            self.versions[topic_id] += 1
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+# - off: pure modules are executed like any other module
+# - skip: on a hit, cached outputs are only republished if they are no
+#   longer the latest message of their topic
+# - republish: on a hit, cached outputs are always republished
+MEMO_POLICIES = {"off", "skip", "republish"}
+
+
+class OutputCache:
+    """
+    Small LRU cache of a pure module's published outputs, keyed by the
+    IDs of the input messages the outputs were computed from.
+
+    Cached outputs are the original Message objects, so a republished
+    output keeps its ID and downstream pure modules hit their caches too.
+    """
+
+    def __init__(self, module_id: str, size: int = 4):
+        self.module_id = module_id
+        self.size = size
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[Tuple[str, ...], List]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: Tuple[str, ...]) -> Optional[List]:
+        with self._lock:
+            messages = self._entries.get(key)
+
+            if messages is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return messages
+
+    def store(self, key: Tuple[str, ...], messages: List):
+        with self._lock:
+            self._entries[key] = messages
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def report(self) -> dict:
+        calls = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / calls if calls else 0.0,
+            "entries": len(self._entries),
+        }
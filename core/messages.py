@@ -1,23 +1,35 @@
 import time
 import uuid
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 class Message:
+    # Defaults for messages created before lineage existed (old checkpoints)
+    parents: Tuple[str, ...] = ()
+    origins: Optional[Dict[str, float]] = None
+    staleness: Optional[Dict[str, float]] = None
+
     def __init__(
         self,
         topic: str,
         payload: Any,
         sender: str,
         confidence: Optional[float] = None,
-        msg_id: Optional[str] = None
+        msg_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
+        parents: Tuple[str, ...] = (),
+        origins: Optional[Dict[str, float]] = None,
+        staleness: Optional[Dict[str, float]] = None,
     ):
         self.topic = topic                     # Logical message topic (e.g., "state", "action")
         self.payload = payload                 # Actual data payload (e.g., state dict, action vector)
         self.sender = sender                   # Module ID that created the message
         self.confidence = confidence           # Optional: certainty level of the payload (0.0–1.0)
         self.id = msg_id or str(uuid.uuid4())  # Unique ID for traceability
-        self.timestamp = time.time()           # Creation time in seconds since epoch
+        self.timestamp = timestamp if timestamp is not None else time.time()  # Creation time (runtime clock)
+        self.parents = parents                 # IDs of the input messages this one was derived from
+        self.origins = origins                 # Origin topic -> oldest origin timestamp (see core.lineage)
+        self.staleness = staleness             # Age of the inputs of background outputs (see core.background)
 
     def __repr__(self):
         return (
@@ -33,4 +45,7 @@ class Message:
             "sender": self.sender,
             "timestamp": self.timestamp,
             "confidence": self.confidence,
+            "parents": list(self.parents),
+            "origins": self.origins,
+            "staleness": self.staleness,
         }
\ No newline at end of file
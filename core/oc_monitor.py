@@ -1,16 +1,19 @@
 from core.audit_logger import AuditLogger
 from core.messages import Message
-from typing import Callable, Dict
+from core.tracing import Tracer
+from typing import Callable, Dict, Optional
 
 
 class OCMonitor:
     """
     Core-level OC compliance monitor.
     Passively observes message traffic and checks for OC property violations.
+    With a tracer, every check is recorded as a span.
     """
 
-    def __init__(self, mediator):
+    def __init__(self, mediator, tracer: Optional[Tracer] = None):
         self.mediator = mediator
+        self.tracer = tracer
         self.checks: list[Callable[[Dict[str, Message]], bool or str]] = []
 
     def register_check(self, check_fn):
@@ -34,6 +37,12 @@ class OCMonitor:
         Run all registered checks on the current message set.
         """
         for check in self.checks:
-            result = check(messages)
+            if self.tracer:
+                start = self.tracer.now()
+                result = check(messages)
+                self.tracer.record(getattr(check, "__name__", "oc_check"), "oc", start)
+            else:
+                result = check(messages)
+
             if result:  # True or str = violation
                 AuditLogger.log_event("oc_violation", detail=result)
\ No newline at end of file
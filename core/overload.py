@@ -0,0 +1,165 @@
+from typing import Dict, List
+
+from core.audit_logger import AuditLogger
+from core.timing import TIME_EPSILON
+
+
+class OverloadController:
+    """
+    Adapts the cycles of degradable modules to the measured load.
+
+    Once per window, the load of the time-based loop is measured as the
+    execution time of all modules per second of wall time (per worker in
+    time-thread-based mode):
+    - above target_utilization, degradable modules are stretched, largest
+      load share first, by 'factor' per window and up to their max cycle
+      (module.max_cycle, default nominal cycle * max_stretch) until the
+      predicted load is back at the target
+    - below target_utilization * recover_ratio, stretched modules are
+      moved back towards their nominal cycle as long as the predicted
+      load stays below that threshold
+
+    Environment modules and modules that are not degradable (e.g. the
+    safety shield) always keep their configured rates.
+    """
+
+    def __init__(
+        self,
+        runtime,
+        target_utilization: float = 0.8,
+        recover_ratio: float = 0.7,
+        max_stretch: float = 4.0,
+        factor: float = 1.5,
+        window: float = 1.0,
+        capacity: int = 1,
+    ):
+        self.runtime = runtime
+        self.target = target_utilization
+        self.recover_ratio = recover_ratio
+        self.max_stretch = max_stretch
+        self.factor = factor
+        self.window = window
+        self.capacity = capacity
+
+        # Nominal (configured) cycles of degradable modules
+        self.nominal: Dict[str, float] = {
+            m.module_id: m.cycle for m in runtime.modules if self._degradable(m)
+        }
+
+        self.adaptations = 0
+        self.load = 0.0
+
+        self._window_start = None
+        self._exec_at_start: Dict[str, float] = {}
+
+    @staticmethod
+    def _degradable(module) -> bool:
+        return module.degradable and not module.is_env
+
+    def _max_cycle(self, module) -> float:
+        if module.max_cycle is not None:
+            return module.max_cycle
+        return self.nominal[module.module_id] * self.max_stretch
+
+    # ------------------------------------------------------------------
+    # Control loop (called between scheduler ticks)
+    # ------------------------------------------------------------------
+
+    def update(self):
+        now = self.runtime.clock.now()
+        timing = self.runtime.scheduler.timing
+
+        if self._window_start is None:
+            self._start_window(now, timing)
+            return
+
+        elapsed = now - self._window_start
+        if elapsed < self.window:
+            return
+
+        # Load contribution of each module over the window; background
+        # modules run on their own pool and do not load the control loop
+        background = {m.module_id for m in self.runtime.modules if m.background}
+        shares = {
+            module_id: (stats.exec_sum - self._exec_at_start.get(module_id, 0.0)) / elapsed / self.capacity
+            for module_id, stats in timing.items()
+            if module_id not in background
+        }
+        self.load = sum(shares.values())
+        self._start_window(now, timing)
+
+        if self.load > self.target:
+            self._stretch(shares)
+        elif self.load < self.target * self.recover_ratio:
+            self._recover(shares)
+
+    def _start_window(self, now: float, timing: dict):
+        self._window_start = now
+        self._exec_at_start = {module_id: stats.exec_sum for module_id, stats in timing.items()}
+
+    def _candidates(self) -> List:
+        # Swapped-in instances are looked up by ID on every window
+        return [m for m in self.runtime.modules if m.module_id in self.nominal]
+
+    def _stretch(self, shares: Dict[str, float]):
+        excess = self.load - self.target
+
+        for module in sorted(self._candidates(), key=lambda m: shares.get(m.module_id, 0.0), reverse=True):
+            if excess <= 0:
+                break
+
+            share = shares.get(module.module_id, 0.0)
+            new_cycle = min(self._max_cycle(module), module.cycle * self.factor)
+            if share <= 0 or new_cycle <= module.cycle:
+                continue
+
+            excess -= share * (1 - module.cycle / new_cycle)
+            self._set_cycle(module, new_cycle, "overload")
+
+    def _recover(self, shares: Dict[str, float]):
+        threshold = self.target * self.recover_ratio
+        predicted = self.load
+
+        stretched = [
+            m for m in self._candidates()
+            if m.cycle > self.nominal[m.module_id] + TIME_EPSILON
+        ]
+
+        for module in sorted(stretched, key=lambda m: shares.get(m.module_id, 0.0)):
+            nominal = self.nominal[module.module_id]
+            new_cycle = module.cycle / self.factor
+            if new_cycle <= nominal + TIME_EPSILON:
+                new_cycle = nominal
+            increase = shares.get(module.module_id, 0.0) * (module.cycle / new_cycle - 1)
+
+            if predicted + increase >= threshold:
+                break
+
+            predicted += increase
+            self._set_cycle(module, new_cycle, "recovered")
+
+    def _set_cycle(self, module, cycle: float, reason: str):
+        AuditLogger.log_event(
+            "rate_adapted",
+            module=module.module_id,
+            reason=reason,
+            cycle_from=module.cycle,
+            cycle_to=cycle,
+            nominal_cycle=self.nominal[module.module_id],
+            load=round(self.load, 4),
+        )
+
+        module.cycle = cycle
+        self.adaptations += 1
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def report(self) -> dict:
+        return {
+            "load": self.load,
+            "adaptations": self.adaptations,
+            "cycles": {m.module_id: m.cycle for m in self._candidates()},
+            "nominal_cycles": dict(self.nominal),
+        }
@@ -0,0 +1,253 @@
+import os
+import re
+import time
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+
+class ModuleProfile:
+    """
+    Profiling state of one module: a cProfile profiler that is enabled
+    only around sampled step() calls, plus CPU and allocation counters.
+    """
+
+    def __init__(self, module_id: str):
+        self.module_id = module_id
+        self.profiler = cProfile.Profile()
+        self.lock = threading.Lock()
+
+        self.calls = 0
+        self.sampled = 0
+        self.cpu_s = 0.0
+        self.alloc_bytes = 0
+        self.peak_bytes = 0
+
+    def report(self) -> dict:
+        return {
+            "calls": self.calls,
+            "sampled_calls": self.sampled,
+            "cpu_s": self.cpu_s,
+            "cpu_mean_s": self.cpu_s / self.sampled if self.sampled else 0.0,
+            "alloc_mean_bytes": self.alloc_bytes / self.sampled if self.sampled else 0.0,
+            "alloc_peak_bytes": self.peak_bytes,
+        }
+
+
+class ModuleProfiler:
+    """
+    Attributes CPU time and allocations to the step() of each module.
+
+    Every Nth call of a module is sampled:
+    - cpu: the call runs under the module's cProfile profiler, and its
+      thread CPU time is accumulated
+    - memory: tracemalloc measures the net allocated bytes and the peak
+      of the call. Tracing is only active while a sampled call runs; it
+      is process-wide, so in time-thread-based mode concurrent modules
+      blur each other's numbers
+
+    dump() writes one pstats file per module (<module_id>.pstats) and a
+    collapsed-stack file (collapsed.txt, one 'module;frame;...;frame us'
+    line per stack) that flamegraph tools read directly. The stacks are
+    reconstructed from the caller edges recorded by cProfile, so time of
+    a function with several callers is split in proportion to the calls.
+    """
+
+    def __init__(self, output_dir: str, every: int = 10, cpu: bool = True, memory: bool = False):
+        self.output_dir = output_dir
+        self.every = every
+        self.cpu = cpu
+        self.memory = memory
+
+        self.profiles: Dict[str, ModuleProfile] = {}
+        self._lock = threading.Lock()
+
+        # Sampled calls currently tracing allocations; tracemalloc is only
+        # stopped again if this profiler started it
+        self._tracing = 0
+        self._tracing_owned = False
+
+    def _profile(self, module_id: str) -> ModuleProfile:
+        profile = self.profiles.get(module_id)
+        if profile is None:
+            with self._lock:
+                profile = self.profiles.setdefault(module_id, ModuleProfile(module_id))
+        return profile
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def call(self, module_id: str, fn: Callable, *args):
+        """
+        Run fn(*args) for module_id, profiling every Nth call.
+        """
+        profile = self._profile(module_id)
+        profile.calls += 1
+
+        if profile.calls % self.every:
+            return fn(*args)
+
+        # A module already sampled on another thread is not sampled twice
+        if not profile.lock.acquire(blocking=False):
+            return fn(*args)
+
+        try:
+            return self._sample(profile, fn, args)
+        finally:
+            profile.lock.release()
+
+    def _sample(self, profile: ModuleProfile, fn: Callable, args: tuple):
+        if self.memory:
+            self._start_tracing()
+            before, _ = tracemalloc.get_traced_memory()
+
+        cpu_start = time.thread_time()
+        if self.cpu:
+            profile.profiler.enable()
+
+        try:
+            return fn(*args)
+        finally:
+            if self.cpu:
+                profile.profiler.disable()
+
+            profile.cpu_s += time.thread_time() - cpu_start
+            profile.sampled += 1
+
+            if self.memory:
+                after, peak = tracemalloc.get_traced_memory()
+                self._stop_tracing()
+                profile.alloc_bytes += after - before
+                profile.peak_bytes = max(profile.peak_bytes, peak - before)
+
+    def _start_tracing(self):
+        with self._lock:
+            if self._tracing == 0:
+                if tracemalloc.is_tracing():
+                    tracemalloc.reset_peak()
+                else:
+                    tracemalloc.start()
+                    self._tracing_owned = True
+            self._tracing += 1
+
+    def _stop_tracing(self):
+        with self._lock:
+            self._tracing -= 1
+            if self._tracing == 0 and self._tracing_owned:
+                tracemalloc.stop()
+                self._tracing_owned = False
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def report(self) -> Dict[str, dict]:
+        return {module_id: profile.report() for module_id, profile in self.profiles.items()}
+
+    def dump(self) -> List[str]:
+        """
+        Write pstats and collapsed-stack files. Returns the written paths.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        written = []
+        collapsed: List[str] = []
+
+        for module_id, profile in self.profiles.items():
+            if not self.cpu or not profile.sampled:
+                continue
+
+            path = os.path.join(self.output_dir, module_id.replace("/", "__") + ".pstats")
+            profile.profiler.dump_stats(path)
+            written.append(path)
+
+            stats = pstats.Stats(profile.profiler).stats
+            collapsed.extend(_collapse(module_id, stats))
+
+        if collapsed:
+            path = os.path.join(self.output_dir, "collapsed.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(collapsed) + "\n")
+            written.append(path)
+
+        return written
+
+
+# ----------------------------------------------------------------------
+# Collapsed stacks
+# ----------------------------------------------------------------------
+
+_Func = Tuple[str, int, str]
+
+_ADDRESS = re.compile(r" at 0x[0-9a-f]+")
+
+# Caller paths multiply on graphs with shared callers; subtrees below this
+# fraction of the profiled time or deeper than this are folded into one
+# '[truncated]' frame
+_MIN_FRACTION = 1e-4
+_MAX_DEPTH = 64
+
+
+def _frame_name(func: _Func) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return _ADDRESS.sub("", name)
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _collapse(root: str, stats: dict) -> List[str]:
+    """
+    Expand cProfile caller edges into 'root;f1;f2 self_us' lines.
+
+    The number of caller paths can grow exponentially, so the expansion
+    stops at _MAX_DEPTH and below _MIN_FRACTION of the total time; the
+    time of a cut subtree is kept under '<path>;[truncated]'.
+    """
+    callees: Dict[_Func, List[_Func]] = {}
+    roots = []
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            if func[2] != "<method 'disable' of '_lsprof.Profiler' objects>":
+                roots.append(func)
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    totals: Dict[str, float] = {}
+    threshold = _MIN_FRACTION * sum(stats[func][3] for func in roots)
+
+    def walk(func: _Func, path: Tuple[str, ...], share: float, stack: Tuple[_Func, ...]):
+        _, _, tt, ct, _ = stats[func]
+        path = path + (_frame_name(func),)
+
+        if tt * share > 0:
+            key = ";".join(path)
+            totals[key] = totals.get(key, 0.0) + tt * share
+
+        for callee in callees.get(func, ()):
+            if callee in stack:
+                continue
+
+            callee_ct = stats[callee][3]
+            edge_ct = stats[callee][4][func][3]
+            if callee_ct <= 0 or edge_ct <= 0:
+                continue
+
+            subtree = share * edge_ct
+            if subtree < threshold or len(path) >= _MAX_DEPTH:
+                key = ";".join(path + ("[truncated]",))
+                totals[key] = totals.get(key, 0.0) + subtree
+                continue
+
+            walk(callee, path, subtree / callee_ct, stack + (callee,))
+
+    for func in roots:
+        walk(func, (root,), 1.0, (func,))
+
+    return [
+        f"{key} {int(round(seconds * 1e6))}"
+        for key, seconds in totals.items()
+        if seconds >= 0.5e-6
+    ]
@@ -0,0 +1,81 @@
+import random
+import multiprocessing
+from typing import Dict, Iterable, List, Optional
+
+from core.audit_logger import AuditLogger
+from utils.context import Context
+
+
+# Runtime visible to forked workers (inherited copy-on-write)
+_fork_source = None
+
+
+def _rollout_worker(args):
+    module_ids, inputs, steps, record, rng_state = args
+
+    # The logger thread does not survive fork; its queue lock may be held
+    AuditLogger.enabled = False
+
+    # random reseeds itself in forked children; start from the parent's stream
+    random.setstate(rng_state)
+
+    # The worker owns a private copy-on-write image, no deep copy needed
+    fork = _fork_source.fork(module_ids, copy_state=False)
+    return fork.rollout(steps, inputs=inputs, record=record)
+
+
+def parallel_rollouts(
+    runtime,
+    candidates: List[Dict[str, Context]],
+    steps: int,
+    module_ids: Optional[Iterable[str]] = None,
+    record: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+) -> List[List[Dict[str, Context]]]:
+    """
+    Evaluate candidate inputs with K-step lookahead rollouts in parallel.
+
+    Every candidate is a mapping topic -> Context that is held fixed and
+    republished before each rollout step (e.g. {"safe_action": ctx}).
+    Workers are created with os.fork, so they start from a copy-on-write
+    image of the current runtime state and never touch the parent. Every
+    candidate gets a fresh worker: a reused worker would start the next
+    rollout from the module and RNG state the previous one left behind.
+    Without fork support, rollouts run sequentially on in-memory forks.
+
+    Returns:
+        One trajectory per candidate (see Runtime.rollout).
+    """
+    global _fork_source
+
+    if module_ids is not None:
+        module_ids = list(module_ids)
+
+    if "fork" not in multiprocessing.get_all_start_methods() or len(candidates) <= 1:
+        trajectories = []
+        for inputs in candidates:
+            rng_state = random.getstate()
+            fork = runtime.fork(module_ids)
+            trajectories.append(fork.rollout(steps, inputs=inputs, record=record))
+            # Lookahead must not change the random stream of the real run
+            random.setstate(rng_state)
+        return trajectories
+
+    # Workers copy the parent's memory; no background step may be mid-update
+    runtime.scheduler.wait_background(module_ids)
+
+    _fork_source = runtime
+    rng_state = random.getstate()
+    try:
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(
+            processes=min(workers or ctx.cpu_count(), len(candidates)),
+            maxtasksperchild=1,
+        ) as pool:
+            return pool.map(
+                _rollout_worker,
+                [(module_ids, inputs, steps, record, rng_state) for inputs in candidates],
+                chunksize=1,
+            )
+    finally:
+        _fork_source = None
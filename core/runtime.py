@@ -1,12 +1,30 @@
-import time
+import os
+import copy
 import json
+import random
+import signal
+import threading
 
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
 from pathlib import Path
 
+from core.clock import Clock, VirtualClock
+from core.checkpoint import save_checkpoint, load_checkpoint
+from core.hot_swap import ModuleSwapper
+from core.bridge import MediatorBridge
 from core.messages import Message
 from core.mediator import Mediator
 from core.scheduler import Scheduler
+from core.memo import MEMO_POLICIES
+from core.experience import ExperienceBuffer, ExperienceRecorder, parse_spec
+from core.introspection import IntrospectionServer
+from core.lineage import LineageTracker
+from core.profiling import ModuleProfiler
+from core.tracing import Tracer
+from core.overload import OverloadController
+from core.dispatch import DISPATCH_POLICIES
+from core.graph_analysis import ANALYSIS_MODES, GraphReport, analyze_graph
+from core.timing import OVERRUN_POLICIES, TIME_EPSILON
 from core.oc_monitor import OCMonitor
 from core.base_module import BaseModule
 from core.audit_logger import AuditLogger
@@ -30,6 +48,71 @@ class Runtime:
     - step-based
     - time-loop-based
     - time-thread-based
+    - event-thread-based: every module runs in its own worker thread and
+      reacts to new inputs as soon as they are published (at most once
+      per cycle); environments and source modules run periodically
+
+    Time-based modes read time from a pluggable clock. With the
+    virtual clock the loop jumps to the next module deadline instead
+    of sleeping, which keeps the schedule but drops the wall-clock wait.
+    Module periods are anchored to absolute monotonic deadlines; the
+    overrun policy decides how missed periods are handled.
+
+    Step-based runs can be checkpointed every N steps or on signal
+    (SIGUSR1: checkpoint, SIGTERM: checkpoint and stop) and resumed
+    from the checkpoint file.
+
+    fork() clones module and mediator state into an independent
+    step-based runtime for lookahead rollouts (see core.rollout).
+
+    swap_module() replaces a module instance while the runtime keeps
+    running; the swap happens between two scheduler ticks.
+
+    With a bridge configuration, one logical graph is split across
+    runtime nodes (processes or hosts) that exchange messages of
+    partitioned topics (see core.bridge).
+
+    Pure modules are memoized by the Scheduler when a memoize policy is
+    configured (default: off, see core.memo).
+
+    With a profiling configuration, sampled step() calls are profiled per
+    module and pstats / collapsed-stack files are written when the run
+    ends (see core.profiling).
+
+    from_config() statically analyzes the graph wiring and critical-path
+    budgets before the runtime is built; analyze() repeats the analysis
+    with measured costs (see core.graph_analysis).
+
+    With an overload configuration, the cycles of degradable modules are
+    stretched while the time-based loop is overloaded and restored when
+    the load drops (see core.overload).
+
+    dispatch_policy selects the order of due modules in time-based modes
+    (fifo, priority, edf); response_time_report() shows the observed and
+    analytical worst-case response times (see core.dispatch).
+
+    Messages carry their lineage (input message IDs and origin
+    timestamps); latency_report() shows the end-to-end latency from each
+    env output to each env input, e.g. how old the reading behind an
+    applied action was (see core.lineage).
+
+    With an experience configuration, named ring buffers of transitions
+    are fed from chosen topics and attached to learning modules (see
+    core.experience).
+
+    With a tracing configuration, module steps, scheduling cycles, OC
+    checks and episode resets are recorded as spans and written as a
+    Chrome trace when the run ends (see core.tracing).
+
+    Background modules run off the scheduling thread on background_workers
+    threads; their outputs arrive at a later step/cycle boundary with
+    staleness metadata, and results still running when an episode is
+    reset are discarded (see core.background).
+
+    With an introspection configuration, a read-only HTTP endpoint (TCP or
+    Unix socket) serves live topic values and rates, module timing,
+    scheduler backlog and audit queue depth while the runtime runs (see
+    core.introspection).
     """
 
     # ------------------------------------------------------------------
@@ -42,51 +125,289 @@ class Runtime:
         mode: str,
         max_steps: int or None,
         max_time: float or None,
+        clock: Optional[Clock] = None,
+        overrun_policy: str = "skip",
+        max_burst: int = 3,
+        memoize: str = "off",
+        profiler: Optional[ModuleProfiler] = None,
+        tracer: Optional[Tracer] = None,
+        lineage: bool = True,
+        experience: Optional[dict] = None,
+        background_workers: int = 2,
+        overload: Optional[dict] = None,
+        dispatch_policy: str = "fifo",
+        checkpoint_path: Optional[str] = None,
+        checkpoint_every: Optional[int] = None,
+        bridge: Optional[dict] = None,
+        introspection: Optional[dict] = None,
+        namespace: str = "",
     ):
         self.modules = modules
         self.mode = mode
         self.max_steps = max_steps
         self.max_time = max_time
+        self.clock = clock or Clock()
+
+        self.namespace = namespace
+
+        # Forks step without writing into the audit log of the live run
+        self.audit_muted = False
 
-        self.mediator = Mediator()
-        self.oc_monitor = OCMonitor(self.mediator)
+        self.mediator = Mediator(namespace=namespace)
+        self.oc_monitor = OCMonitor(self.mediator, tracer=tracer)
+        self.profiler = profiler
+        self.tracer = tracer
+        self.lineage = LineageTracker() if lineage else None
         self.scheduler = Scheduler(
             modules=modules,
             mediator=self.mediator,
             mode=mode,
+            clock=self.clock,
+            overrun_policy=overrun_policy,
+            max_burst=max_burst,
+            memoize=memoize,
+            profiler=profiler,
+            dispatch_policy=dispatch_policy,
+            tracer=tracer,
+            lineage=self.lineage,
+            background_workers=background_workers,
+        )
+
+        # Env index and downstream closure, recomputed only on module swap
+        self._index_modules()
+
+        # Env IDs that emitted terminated/truncated since the last reset
+        self._terminated: Set[str] = set()
+        self._terminated_lock = threading.Lock()
+
+        # Wakes the event-thread-based main loop (e.g. on termination)
+        self._main_wakeup = threading.Event()
+
+        # Checkpointing (step-based mode)
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self._next_step = 0
+        self._resumed = False
+        self._checkpoint_requested = False
+        self._stop_requested = False
+
+        self.swapper = ModuleSwapper(self)
+
+        # Named experience buffers, fed on publish of their trigger topic
+        self.experience: Dict[str, ExperienceBuffer] = {}
+        self._recorders: Dict[str, ExperienceRecorder] = {}
+        for name, spec in (experience or {}).items():
+            self._add_experience(name, spec)
+
+        self.overload = (
+            OverloadController(
+                self,
+                capacity=self.scheduler.max_workers if mode == "time-thread-based" else 1,
+                **overload,
+            )
+            if overload is not None else None
+        )
+
+        self.bridge = (
+            MediatorBridge(
+                self.mediator,
+                node_id=bridge["node"],
+                listen=bridge.get("listen"),
+                peers=bridge.get("peers", {}),
+                export_topics=bridge.get("export", []),
+                import_topics=bridge.get("import", []),
+                flush_interval=bridge.get("flush_interval", 0.001),
+            )
+            if bridge else None
+        )
+
+        self.introspection = (
+            IntrospectionServer(self, **introspection)
+            if introspection is not None else None
         )
 
         self._register_inputs()
         self._register_oc_checks()
+        self._register_termination_hooks()
 
     # ------------------------------------------------------------------
     # Config loading
     # ------------------------------------------------------------------
 
     @classmethod
-    def from_config(cls, json_path: str):
-        module_registry = auto_load_modules()
+    def from_config(
+        cls,
+        json_path: str,
+        namespace: str = "",
+        clock: Optional[Clock] = None,
+    ):
+        """
+        Build a runtime from a JSON config.
 
+        namespace prefixes module IDs (and audited topics), so several
+        graphs can share one host process; clock overrides the configured
+        clock (e.g. a host-wide clock).
+        """
         with open(Path(json_path), "r") as f:
             config = json.load(f)
 
         if not isinstance(config, dict) or "modules" not in config:
             raise ValueError("Invalid config format: expected dict with 'modules' key")
 
+        # Audit output must be configured before the first event is logged;
+        # configs without an audit section keep the current settings
+        audit = config.get("audit")
+        if audit is not None:
+            if not isinstance(audit, dict):
+                raise ValueError("'audit' must be a dict")
+
+            unknown = set(audit) - {"log_dir", "compression", "max_bytes", "rotate_interval", "max_files"}
+            if unknown:
+                raise ValueError(f"Unknown audit options: {sorted(unknown)}")
+
+            AuditLogger.configure(**audit)
+
+        module_registry = auto_load_modules()
+
         mode = config.get("mode")
         max_steps = config.get("max_steps")
         max_time = config.get("max_time")
+        clock_name = config.get("clock", "real")
+        overrun_policy = config.get("overrun_policy", "skip")
+        max_burst = config.get("max_burst", 3)
+        memoize = config.get("memoize", "off")
+        checkpoint = config.get("checkpoint")
+        bridge = config.get("bridge")
+        introspection = config.get("introspection")
+        profiling = config.get("profiling")
+        tracing = config.get("tracing")
+        lineage = config.get("lineage", True)
+        experience = config.get("experience")
+        background_workers = config.get("background_workers", 2)
+        analysis = config.get("analysis", "warn")
+        overload = config.get("overload")
+        dispatch_policy = config.get("dispatch_policy", "fifo")
 
-        if mode not in {"step-based", "time-loop-based", "time-thread-based"}:
+        if mode not in {"step-based", "time-loop-based", "time-thread-based", "event-thread-based"}:
             raise ValueError(f"Unsupported mode: {mode}")
 
         if mode == "step-based" and max_steps is None:
             raise ValueError("Missing 'max_steps' for step-based mode")
 
-        if mode in {"time-loop-based", "time-thread-based"} and max_time is None:
+        if mode in {"time-loop-based", "time-thread-based", "event-thread-based"} and max_time is None:
             raise ValueError("Missing 'max_time' for time-based mode")
 
+        if mode == "event-thread-based" and clock_name == "virtual":
+            raise ValueError("event-thread-based mode requires the real clock")
+
+        if clock_name not in {"real", "virtual"}:
+            raise ValueError(f"Unsupported clock: {clock_name}")
+
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unsupported overrun_policy: {overrun_policy}")
+
+        if not isinstance(max_burst, int) or max_burst < 0:
+            raise ValueError("'max_burst' must be a non-negative int")
+
+        if memoize not in MEMO_POLICIES:
+            raise ValueError(f"Unsupported memoize policy: {memoize}")
+
+        if checkpoint is not None:
+            if mode != "step-based":
+                raise ValueError("'checkpoint' is only supported in step-based mode")
+
+            if not isinstance(checkpoint, dict) or not checkpoint.get("path"):
+                raise ValueError("'checkpoint' must be a dict with a 'path' entry")
+
+            every = checkpoint.get("every_steps")
+            if every is not None and (not isinstance(every, int) or every <= 0):
+                raise ValueError("'checkpoint.every_steps' must be a positive int")
+
+        if bridge is not None:
+            if not isinstance(bridge, dict) or not bridge.get("node"):
+                raise ValueError("'bridge' must be a dict with a 'node' entry")
+
+            if not isinstance(bridge.get("peers", {}), dict):
+                raise ValueError("'bridge.peers' must map node IDs to addresses")
+
+        if introspection is not None:
+            if not isinstance(introspection, dict) or not introspection.get("listen"):
+                raise ValueError("'introspection' must be a dict with a 'listen' entry")
+
+            unknown = set(introspection) - {"listen", "window"}
+            if unknown:
+                raise ValueError(f"Unknown introspection options: {sorted(unknown)}")
+
+            window = introspection.get("window", 5.0)
+            if not isinstance(window, (int, float)) or window <= 0:
+                raise ValueError("'introspection.window' must be a number > 0")
+
+        if overload is not None:
+            if mode not in {"time-loop-based", "time-thread-based"}:
+                raise ValueError("'overload' is only supported in time-based modes")
+
+            if not isinstance(overload, dict):
+                raise ValueError("'overload' must be a dict")
+
+            unknown = set(overload) - {"target_utilization", "recover_ratio", "max_stretch", "factor", "window"}
+            if unknown:
+                raise ValueError(f"Unknown overload options: {sorted(unknown)}")
+
+            for key, minimum in (("target_utilization", 0), ("window", 0), ("recover_ratio", 0)):
+                value = overload.get(key)
+                if value is not None and (not isinstance(value, (int, float)) or value <= minimum):
+                    raise ValueError(f"'overload.{key}' must be a number > {minimum}")
+
+            for key in ("max_stretch", "factor"):
+                value = overload.get(key)
+                if value is not None and (not isinstance(value, (int, float)) or value < 1):
+                    raise ValueError(f"'overload.{key}' must be a number >= 1")
+
+        if dispatch_policy not in DISPATCH_POLICIES:
+            raise ValueError(f"Unsupported dispatch_policy: {dispatch_policy}")
+
+        if analysis not in ANALYSIS_MODES:
+            raise ValueError(f"Unsupported analysis mode: {analysis}")
+
+        if profiling is not None:
+            if not isinstance(profiling, dict):
+                raise ValueError("'profiling' must be a dict")
+
+            unknown = set(profiling) - {"dir", "every", "cpu", "memory"}
+            if unknown:
+                raise ValueError(f"Unknown profiling options: {sorted(unknown)}")
+
+            every = profiling.get("every", 10)
+            if not isinstance(every, int) or every <= 0:
+                raise ValueError("'profiling.every' must be a positive int")
+
+        if not isinstance(lineage, bool):
+            raise ValueError("'lineage' must be true or false")
+
+        if not isinstance(background_workers, int) or isinstance(background_workers, bool) or background_workers <= 0:
+            raise ValueError("'background_workers' must be a positive int")
+
+        if experience is not None:
+            if not isinstance(experience, dict):
+                raise ValueError("'experience' must map buffer names to buffer specs")
+
+            for name, spec in experience.items():
+                parse_spec(name, spec)
+
+        if tracing is not None:
+            if not isinstance(tracing, dict):
+                raise ValueError("'tracing' must be a dict")
+
+            unknown = set(tracing) - {"path", "capacity"}
+            if unknown:
+                raise ValueError(f"Unknown tracing options: {sorted(unknown)}")
+
+            capacity = tracing.get("capacity", 100_000)
+            if not isinstance(capacity, int) or capacity <= 0:
+                raise ValueError("'tracing.capacity' must be a positive int")
+
         modules = []
+        attached = []
         for entry in config["modules"]:
             module_type = entry["type"]
             module_cls = module_registry.get(module_type)
@@ -101,25 +422,129 @@ class Runtime:
                 )
 
             module = module_cls(
-                module_id=entry["id"],
+                module_id=f"{namespace}/{entry['id']}" if namespace else entry["id"],
                 inputs=entry.get("inputs", []),
                 outputs=entry.get("outputs", []),
                 cycle=cycle,
                 is_env=entry.get("is_env", False),
                 config=entry.get("config", {}),
             )
+
+            cost = entry.get("cost")
+            if cost is not None:
+                if not isinstance(cost, (int, float)) or cost < 0:
+                    raise ValueError(
+                        f"Invalid 'cost' for module '{entry['id']}', expected seconds >= 0"
+                    )
+                module.cost = cost
+
+            priority = entry.get("priority", module.priority)
+            if not isinstance(priority, int) or isinstance(priority, bool):
+                raise ValueError(f"Invalid 'priority' for module '{entry['id']}', expected int")
+            module.priority = priority
+
+            deadline = entry.get("deadline")
+            if deadline is not None:
+                if not isinstance(deadline, (int, float)) or deadline <= 0:
+                    raise ValueError(
+                        f"Invalid 'deadline' for module '{entry['id']}', expected seconds > 0"
+                    )
+                module.deadline = deadline
+
+            if "degradable" in entry:
+                module.degradable = bool(entry["degradable"])
+
+            if "background" in entry:
+                if not isinstance(entry["background"], bool):
+                    raise ValueError(f"Invalid 'background' for module '{entry['id']}', expected true or false")
+                module.background = entry["background"]
+
+            if module.background and module.is_env:
+                raise ValueError(f"Environment '{entry['id']}' cannot run in the background")
+
+            max_cycle = entry.get("max_cycle")
+            if max_cycle is not None:
+                if not isinstance(max_cycle, (int, float)) or max_cycle < cycle:
+                    raise ValueError(
+                        f"Invalid 'max_cycle' for module '{entry['id']}', must be >= cycle"
+                    )
+                module.max_cycle = max_cycle
+
+            buffer_name = entry.get("experience")
+            if buffer_name is not None:
+                if buffer_name not in (experience or {}):
+                    raise ValueError(
+                        f"Unknown experience buffer '{buffer_name}' for module '{entry['id']}'"
+                    )
+                attached.append((module, buffer_name))
+
             modules.append(module)
 
         if not modules:
             raise ValueError("No modules defined in configuration")
 
-        return cls(
+        if analysis != "off":
+            report = analyze_graph(
+                modules,
+                mode=mode,
+                external_topics=(bridge or {}).get("import", []),
+                exported_topics=(bridge or {}).get("export", []),
+            )
+            report.log()
+
+            if analysis == "strict" and report.errors:
+                raise ValueError(
+                    "Graph analysis failed: " + "; ".join(issue.detail for issue in report.errors)
+                )
+
+        runtime = cls(
             modules=modules,
             mode=mode,
             max_steps=max_steps,
             max_time=max_time,
+            clock=clock or (VirtualClock() if clock_name == "virtual" else Clock()),
+            overrun_policy=overrun_policy,
+            max_burst=max_burst,
+            memoize=memoize,
+            overload=overload,
+            dispatch_policy=dispatch_policy,
+            profiler=(
+                ModuleProfiler(
+                    output_dir=profiling.get("dir", "profiles"),
+                    every=profiling.get("every", 10),
+                    cpu=profiling.get("cpu", True),
+                    memory=profiling.get("memory", False),
+                )
+                if profiling is not None else None
+            ),
+            tracer=(
+                Tracer(
+                    path=tracing.get("path", "traces/trace.json"),
+                    capacity=tracing.get("capacity", 100_000),
+                    process_name=namespace or "orca",
+                )
+                if tracing is not None else None
+            ),
+            lineage=lineage,
+            experience=experience,
+            background_workers=background_workers,
+            bridge=bridge,
+            introspection=introspection,
+            namespace=namespace,
         )
 
+        for module, buffer_name in attached:
+            module.experience = runtime.experience[buffer_name]
+
+        if checkpoint is not None:
+            runtime.checkpoint_path = checkpoint["path"]
+            runtime.checkpoint_every = checkpoint.get("every_steps")
+
+            if checkpoint.get("resume", False) and os.path.exists(checkpoint["path"]):
+                runtime.restore(checkpoint["path"])
+
+        return runtime
+
     # ------------------------------------------------------------------
     # Wiring
     # ------------------------------------------------------------------
@@ -136,8 +561,57 @@ class Runtime:
         for check_fn in OC_RULES.values():
             self.oc_monitor.register_check(check_fn)
 
+    def _register_termination_hooks(self):
+        """
+        Watch env-owned topics, so termination is detected at publish time.
+        """
+        for env in self._env_modules:
+            for topic in env.outputs:
+                self.mediator.add_publish_hook(topic, self._on_env_message)
+
+    def _on_env_message(self, msg: Message):
+        obs = msg.payload
+        if msg.sender not in self._env_downstream or not isinstance(obs, Context):
+            return
+
+        if obs.terminated or obs.truncated:
+            with self._terminated_lock:
+                self._terminated.add(msg.sender)
+            self._main_wakeup.set()
+
+    def _index_modules(self):
+        self.scheduler.index_modules()
+
+        self._env_modules = [m for m in self.modules if getattr(m, "is_env", False)]
+        self._env_downstream = {
+            env.module_id: self._downstream_modules(env) for env in self._env_modules
+        }
+
     def _get_env_modules(self) -> list[BaseModule]:
-        return [m for m in self.modules if getattr(m, "is_env", False)]
+        return self._env_modules
+
+    def _downstream_modules(self, env: BaseModule) -> List[BaseModule]:
+        """
+        Non-env modules reachable from the env's outputs (in config order).
+        Traversal stops at other environments.
+        """
+        consumers: Dict[str, List[BaseModule]] = {}
+        for module in self.modules:
+            for topic in module.inputs:
+                consumers.setdefault(topic, []).append(module)
+
+        reached = set()
+        frontier = list(env.outputs)
+
+        while frontier:
+            topic = frontier.pop()
+            for module in consumers.get(topic, []):
+                if module.is_env or module.module_id in reached:
+                    continue
+                reached.add(module.module_id)
+                frontier.extend(module.outputs)
+
+        return [m for m in self.modules if m.module_id in reached]
 
     # ------------------------------------------------------------------
     # Main loop
@@ -149,7 +623,11 @@ class Runtime:
         """
         AuditLogger.log_event("runtime_started", mode=self.mode)
 
-        self._reset_episode()
+        if not self._resumed:
+            self._reset_episode()
+
+        previous_handlers = self._install_signal_handlers()
+        self.start()
 
         try:
             if self.mode == "step-based":
@@ -158,25 +636,74 @@ class Runtime:
             elif self.mode in {"time-loop-based", "time-thread-based"}:
                 self._run_time_based()
 
+            elif self.mode == "event-thread-based":
+                self._run_event_based()
+
             else:
                 raise ValueError(f"Unsupported execution mode: {self.mode}")
 
         finally:
-            AuditLogger.log_event("runtime_stopped")
-            if self.scheduler.executor:
-                self.scheduler.executor.shutdown(wait=False)
+            self.stop()
+            self._restore_signal_handlers(previous_handlers)
+
+    def start(self):
+        """
+        Start the services of a run (bridge, introspection server).
+        Called by run(); a RuntimeHost calls it for every hosted graph.
+        """
+        if self.bridge:
+            self.bridge.start()
+
+        if self.introspection:
+            self.introspection.start()
+
+    def stop(self):
+        """
+        Counterpart of start(): stop the services, write reports, profiles
+        and the trace, and release the worker pools.
+        """
+        if self.introspection:
+            self.introspection.stop()
+        if self.bridge:
+            self.bridge.stop()
+        self.swapper.close()
+        self.log_memo_report()
+        self.log_latency_report()
+        self.log_experience_report()
+        self.log_background_report()
+        self.dump_profiles()
+        self.export_trace()
+        AuditLogger.log_event("runtime_stopped")
+        if self.scheduler.executor:
+            self.scheduler.executor.shutdown(wait=False)
+        self.scheduler.background.shutdown()
 
     # ------------------------------------------------------------------
     # Execution modes
     # ------------------------------------------------------------------
 
     def _run_step_based(self):
-        for step in range(self.max_steps):
+        for step in range(self._next_step, self.max_steps):
+            self.swapper.apply_pending()
+
             self.scheduler.run_step(step)
             self.oc_monitor.step()
+            self.swapper.check_served()
 
             if self._episode_done():
-                self._reset_episode()
+                self._reset_episode(self._take_terminated())
+
+            self._next_step = step + 1
+
+            if self.checkpoint_path and (
+                self._checkpoint_requested
+                or (self.checkpoint_every and self._next_step % self.checkpoint_every == 0)
+            ):
+                self.checkpoint()
+
+            if self._stop_requested:
+                AuditLogger.log_event("runtime_stop_requested", step=step)
+                break
 
     def _run_time_based(self):
         """
@@ -185,72 +712,522 @@ class Runtime:
         - max_time: seconds
         - module.cycle: seconds
         - min_cycle: seconds
+
+        All deadlines are absolute monotonic times. The loop waits until
+        the next module release, but at most min_cycle after the cycle
+        start, so modules blocked on inputs are polled again.
         """
 
-        start_time = time.time()
+        end_time = self.clock.now() + self.max_time
 
-        while time.time() - start_time < self.max_time:
-            cycle_start = time.time()
+        while self.clock.now() + TIME_EPSILON < end_time:
+            wake_at = self.tick()
+            self.clock.sleep_until(min(wake_at, end_time))
 
-            self.scheduler.run_time_based()
+        self.log_timing_report()
 
-            if self._episode_done():
-                self._reset_episode()
+    def _run_event_based(self):
+        """
+        Event-driven execution with one worker thread per module.
 
-            elapsed = time.time() - cycle_start
-            sleep_time = self.scheduler.min_cycle - elapsed
+        The main thread only handles episode resets, hot swaps and the
+        run time limit; it is woken up by env termination and otherwise
+        checks every min_cycle.
+        """
+        end_time = self.clock.now() + self.max_time
+        self.scheduler.start_workers()
 
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-            else:
-                AuditLogger.log_event(
-                    "interval_overrun",
-                    overrun_s=round(-sleep_time, 4),
-                )
+        try:
+            while self.clock.now() + TIME_EPSILON < end_time:
+                self._main_wakeup.wait(min(self.scheduler.min_cycle, end_time - self.clock.now()))
+                self._main_wakeup.clear()
+
+                self.swapper.apply_pending()
+                self.swapper.check_served()
+
+                if self._episode_done():
+                    self._reset_episode(self._take_terminated())
+        finally:
+            self.scheduler.stop_workers()
+
+        self.log_timing_report()
+
+    def tick(self) -> float:
+        """
+        Run one time-based scheduling cycle.
+
+        Returns:
+            float: clock time at which the next cycle is due
+        """
+        cycle_start = self.clock.now()
+
+        self.swapper.apply_pending()
+        self.scheduler.run_time_based()
+        self.swapper.check_served()
+
+        if self.overload:
+            self.overload.update()
+
+        if self._episode_done():
+            self._reset_episode(self._take_terminated())
+
+        elapsed = self.clock.now() - cycle_start
+        sleep_time = self.scheduler.min_cycle - elapsed
+
+        if sleep_time <= 0:
+            AuditLogger.log_event(
+                "interval_overrun",
+                overrun_s=round(-sleep_time, 4),
+            )
+            return self.clock.now()
+
+        return self.scheduler.next_deadline(
+            cycle_start, cycle_start + self.scheduler.min_cycle
+        )
+
+    def log_timing_report(self):
+        for module_id, report in self.timing_report().items():
+            AuditLogger.log_event("timing_report", module=module_id, **report)
+
+        for module_id, report in self.response_time_report().items():
+            AuditLogger.log_event("response_time_report", module=module_id, **report)
+
+        if self.overload:
+            AuditLogger.log_event("overload_report", **self.overload.report())
+
+    def timing_report(self) -> dict:
+        """
+        Per-module jitter and deadline-miss histograms of the time-based loop.
+        """
+        return self.scheduler.timing_report()
+
+    def response_time_report(self, costs: Optional[Dict[str, float]] = None) -> dict:
+        """
+        Observed worst-case response times and deadline misses per module;
+        with priority dispatch in time-loop-based mode also the analytical
+        bound, based on the given or the measured costs.
+        """
+        if costs is None:
+            costs = {m.module_id: m.cost for m in self.modules if m.cost is not None}
+            costs.update(self.measured_costs())
+
+        return self.scheduler.response_time_report(costs)
+
+    def measured_costs(self) -> Dict[str, float]:
+        """
+        Worst observed execution time per module (on the real clock),
+        falling back to the profiled mean CPU time.
+        """
+        costs = {}
+
+        if self.profiler:
+            for module_id, report in self.profiler.report().items():
+                if report["sampled_calls"]:
+                    costs[module_id] = report["cpu_mean_s"]
+
+        # Virtual time does not advance while a module executes
+        if not self.clock.virtual:
+            for module_id, stats in self.scheduler.timing.items():
+                if stats.executions:
+                    costs[module_id] = stats.exec_max
+
+        return costs
+
+    def analyze(self, costs: Optional[Dict[str, float]] = None) -> GraphReport:
+        """
+        Static graph analysis with the given costs, by default the
+        measured costs of this runtime (declared costs fill the gaps).
+        """
+        return analyze_graph(
+            self.modules,
+            costs=self.measured_costs() if costs is None else costs,
+            mode=self.mode,
+            external_topics=self.bridge.import_topics if self.bridge else (),
+            exported_topics=self.bridge.export_topics if self.bridge else (),
+        )
+
+    def latency_report(self) -> Dict[str, dict]:
+        """
+        End-to-end latency distribution per env -> actuator path.
+        """
+        return self.lineage.report() if self.lineage else {}
+
+    def log_latency_report(self):
+        for path, report in self.latency_report().items():
+            AuditLogger.log_event("latency_report", path=path, **report)
+
+    def _add_experience(self, name: str, spec: dict):
+        spec = parse_spec(name, spec)
+
+        buffer = ExperienceBuffer(spec["columns"], spec["capacity"], spill_path=spec["spill_path"])
+        self.experience[name] = buffer
+        self._recorders[name] = ExperienceRecorder(
+            self.mediator, buffer, spec["trigger"], spec["sources"]
+        )
+
+    def log_experience_report(self):
+        for name, recorder in self._recorders.items():
+            recorder.buffer.flush()
+            AuditLogger.log_event("experience_report", buffer=name, **recorder.report())
+
+    def log_background_report(self):
+        for module_id, report in self.scheduler.background_report().items():
+            AuditLogger.log_event("background_report", module=module_id, **report)
+
+    def log_memo_report(self):
+        for module_id, report in self.scheduler.memo_report().items():
+            AuditLogger.log_event("memo_report", module=module_id, **report)
+
+    def dump_profiles(self):
+        """
+        Write profiling output and log per-module profile reports.
+        """
+        if not self.profiler:
+            return
+
+        for module_id, report in self.profiler.report().items():
+            AuditLogger.log_event("profile_report", module=module_id, **report)
+
+        paths = self.profiler.dump()
+        AuditLogger.log_event("profiles_written", dir=self.profiler.output_dir, files=len(paths))
+
+    def export_trace(self):
+        """
+        Write the recorded spans as Chrome trace JSON.
+        """
+        if not self.tracer:
+            return
+
+        path = self.tracer.export()
+        AuditLogger.log_event("trace_written", path=path, **self.tracer.report())
 
     # ------------------------------------------------------------------
-    # Episode handling
+    # Hot module swap
     # ------------------------------------------------------------------
 
-    def _reset_episode(self):
+    def swap_module(
+        self,
+        module_id: str,
+        module_type: Optional[str] = None,
+        config: Optional[dict] = None,
+        module: Optional[BaseModule] = None,
+        transfer_state: bool = True,
+    ):
         """
-        Reset all environment modules and publish their initial messages.
-        Env.reset() returns dict[str, Context] (topic -> Context).
+        Replace a module instance while the runtime keeps running.
+
+        The replacement is either built from a registered module type
+        (keeping the slot's id and wiring, optionally with a new config)
+        or passed in as a ready instance. It is warmed up on a background
+        thread and swapped in atomically between two scheduler ticks.
+        With transfer_state, the old instance's get_state() is handed to
+        the new instance's set_state().
+
+        Returns:
+            concurrent.futures.Future resolving to a dict with the swap
+            latency ('unserved_s': time the slot was not served).
+        """
+        return self.swapper.request(
+            module_id,
+            module_type=module_type,
+            config=config,
+            module=module,
+            transfer_state=transfer_state,
+        )
+
+    # ------------------------------------------------------------------
+    # Checkpointing
+    # ------------------------------------------------------------------
+
+    def checkpoint(self, path: Optional[str] = None):
         """
-        AuditLogger.log_event("episode_reset")
+        Write module state, mediator messages, step counter and RNG state
+        to a checkpoint file. Must be called between steps.
+        """
+        path = path or self.checkpoint_path
+        if not path:
+            raise ValueError("No checkpoint path configured")
+
+        # Let running background steps finish so module state and messages
+        # match; their outputs are published before the snapshot
+        self.scheduler.wait_background()
+        self.scheduler.publish_background()
+
+        save_checkpoint(path, {
+            "mode": self.mode,
+            "step": self._next_step,
+            "modules": {
+                m.module_id: m.get_state() for m in self.modules
+            },
+            "messages": self.mediator.get_all_latest(),
+            "rng": random.getstate(),
+        })
+
+        self._checkpoint_requested = False
+        AuditLogger.log_event("checkpoint_saved", path=path, step=self._next_step)
 
-        # Clear mediator state but keep subscriptions
-        self.mediator.latest_messages.clear()
+    def restore(self, path: str):
+        """
+        Restore a checkpoint written by checkpoint(). The next run()
+        continues at the saved step without resetting the episode.
+        """
+        state = load_checkpoint(path)
+
+        if state["mode"] != self.mode:
+            raise ValueError(
+                f"Checkpoint mode '{state['mode']}' does not match runtime mode '{self.mode}'"
+            )
 
-        for env in self._get_env_modules():
-            outputs = env.reset() or {}
+        module_ids = {m.module_id for m in self.modules}
+        unknown = set(state["modules"]) - module_ids
+        if unknown:
+            raise ValueError(f"Checkpoint contains unknown modules: {sorted(unknown)}")
 
-            if not isinstance(outputs, dict):
-                raise TypeError(
-                    f"Env '{env.module_id}' reset() must return dict[str, Context], got {type(outputs)}"
+        # Background steps still running would overwrite the restored state
+        self.scheduler.discard_background()
+        self.scheduler.wait_background()
+
+        for module in self.modules:
+            module_state = state["modules"].get(module.module_id)
+            if module_state is not None:
+                module.set_state(module_state)
+
+        self.mediator.reset()
+        self.mediator.load(state["messages"])
+        self.scheduler.clear_memo()
+
+        random.setstate(state["rng"])
+
+        self._next_step = state["step"]
+        self._resumed = True
+
+        AuditLogger.log_event("checkpoint_restored", path=path, step=self._next_step)
+
+    # ------------------------------------------------------------------
+    # Forking / lookahead
+    # ------------------------------------------------------------------
+
+    def fork(
+        self,
+        module_ids: Optional[Iterable[str]] = None,
+        copy_state: bool = True,
+    ) -> "Runtime":
+        """
+        Clone this runtime into an independent step-based runtime.
+
+        Args:
+            module_ids: subset of modules to include (default: all)
+            copy_state: deep-copy module state and messages. Only disable
+                this when the caller already owns a private memory image
+                (e.g. in an os.fork worker).
+
+        The fork continues at the current step counter and uses a virtual
+        clock, so it can be advanced with rollout() without side effects
+        on this runtime; its audit events are muted. Background modules
+        run inline in the fork: pool threads would neither share the
+        muting (it is per thread) nor be shut down with the fork.
+        """
+        if module_ids is None:
+            selected = list(self.modules)
+        else:
+            module_ids = set(module_ids)
+            unknown = module_ids - {m.module_id for m in self.modules}
+            if unknown:
+                raise ValueError(f"Unknown modules for fork: {sorted(unknown)}")
+            selected = [m for m in self.modules if m.module_id in module_ids]
+
+        # A background step still running would change the state mid-copy
+        self.scheduler.wait_background(m.module_id for m in selected)
+
+        messages = self.mediator.get_all_latest()
+
+        if copy_state:
+            selected, messages = copy.deepcopy((selected, messages))
+
+        for module in selected:
+            module.background = False
+
+        with AuditLogger.muted():
+            fork = Runtime(
+                modules=selected,
+                mode="step-based",
+                max_steps=None,
+                max_time=None,
+                clock=VirtualClock(self.clock.timestamp()),
+                memoize=self.scheduler.memoize,
+                lineage=self.lineage is not None,
+            )
+        fork.audit_muted = True
+        fork.mediator.load(messages)
+        fork._next_step = self._next_step
+        fork._resumed = True
+
+        return fork
+
+    def rollout(
+        self,
+        steps: int,
+        inputs: Optional[Dict[str, Context]] = None,
+        record: Optional[List[str]] = None,
+    ) -> List[Dict[str, Context]]:
+        """
+        Advance this runtime (normally a fork) by a number of steps.
+
+        Args:
+            steps: lookahead horizon
+            inputs: topic -> Context held fixed and republished before
+                every step (e.g. a candidate action)
+            record: topics to record per step (default: all)
+
+        Returns:
+            List[Dict[str, Context]]: per step, the latest payloads of
+            the recorded topics.
+        """
+        trajectory = []
+
+        # Forks must not write into the audit log of the live run
+        with AuditLogger.muted(self.audit_muted):
+            for _ in range(steps):
+                for topic, ctx in (inputs or {}).items():
+                    self.mediator.publish(
+                        Message(
+                            topic=topic,
+                            payload=ctx,
+                            sender="rollout",
+                            timestamp=self.clock.timestamp(),
+                        )
+                    )
+
+                self.scheduler.run_step(self._next_step)
+                self._next_step += 1
+
+                if self._episode_done():
+                    self._reset_episode(self._take_terminated())
+
+                latest = self.mediator.latest_messages
+                topics = latest.keys() if record is None else record
+                trajectory.append(
+                    {t: latest[t].payload for t in topics if t in latest}
                 )
 
-            for topic, ctx in outputs.items():
-                msg = Message(topic=topic, payload=ctx, sender=env.module_id)
-                self.mediator.publish(msg)
+        return trajectory
 
-    def _episode_done(self) -> bool:
+    def _install_signal_handlers(self) -> dict:
         """
-        An episode is done if an environment emits
-        terminated=True or truncated=True.
+        Checkpoint on SIGUSR1, checkpoint and stop on SIGTERM.
+        Signal handlers can only be installed from the main thread.
         """
-        env_ids = {m.module_id for m in self._get_env_modules()}
+        if not self.checkpoint_path or threading.current_thread() is not threading.main_thread():
+            return {}
 
-        for msg in self.mediator.latest_messages.values():
-            if not isinstance(msg, Message):
-                continue
+        def on_checkpoint(signum, frame):
+            self._checkpoint_requested = True
+
+        def on_terminate(signum, frame):
+            self._checkpoint_requested = True
+            self._stop_requested = True
+
+        handlers = {signal.SIGTERM: on_terminate}
+        if hasattr(signal, "SIGUSR1"):
+            handlers[signal.SIGUSR1] = on_checkpoint
+
+        return {sig: signal.signal(sig, handler) for sig, handler in handlers.items()}
+
+    def _restore_signal_handlers(self, previous: dict):
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    # ------------------------------------------------------------------
+    # Episode handling
+    # ------------------------------------------------------------------
+
+    def _reset_episode(self, env_ids: Optional[Set[str]] = None):
+        """
+        Reset environment modules and publish their initial messages.
+        Env.reset() returns dict[str, Context] (topic -> Context).
+
+        Without env_ids, all environments are reset and the mediator is
+        cleared (episode start). Otherwise only the given environments and
+        their downstream stateful modules are reset, and only the topics
+        they produce are cleared.
+        """
+        if not self.tracer:
+            self._do_reset_episode(env_ids)
+            return
+
+        with self.tracer.span("episode_reset", "runtime", envs=sorted(env_ids) if env_ids else "all"):
+            self._do_reset_episode(env_ids)
+
+    def _do_reset_episode(self, env_ids: Optional[Set[str]]):
+        if env_ids is None:
+            AuditLogger.log_event("episode_reset")
+
+            # Clear mediator state but keep subscriptions
+            self.mediator.reset()
+            self.scheduler.discard_background()
+            self.scheduler.wait_background()
+            with self._terminated_lock:
+                self._terminated.clear()
 
-            if msg.sender not in env_ids:
+            for env in self._env_modules:
+                self._publish_reset(env)
+            return
+
+        for env in self._env_modules:
+            if env.module_id not in env_ids:
                 continue
 
-            obs = msg.payload
-            if isinstance(obs, Context):
-                if obs.terminated or obs.truncated:
-                    return True
+            downstream = self._env_downstream[env.module_id]
+
+            AuditLogger.log_event(
+                "episode_reset",
+                env=env.module_id,
+                modules=[m.module_id for m in downstream],
+            )
+
+            self.mediator.clear_topics(env.outputs)
+            for module in downstream:
+                self.mediator.clear_topics(module.outputs)
+            # reset() must not run while the module's step() is still in flight
+            downstream_ids = [m.module_id for m in downstream]
+            self.scheduler.discard_background(downstream_ids)
+            self.scheduler.wait_background(downstream_ids)
+
+            for module in downstream:
+                self._publish_reset(module)
+            self._publish_reset(env)
+
+    def _publish_reset(self, module: BaseModule):
+        outputs = module.reset() or {}
+
+        if not isinstance(outputs, dict):
+            raise TypeError(
+                f"Module '{module.module_id}' reset() must return dict[str, Context], got {type(outputs)}"
+            )
+
+        for topic, ctx in outputs.items():
+            timestamp = self.clock.timestamp()
+            msg = Message(
+                topic=topic,
+                payload=ctx,
+                sender=module.module_id,
+                timestamp=timestamp,
+                origins={topic: timestamp} if self.lineage else None,
+            )
+            self.mediator.publish(msg)
+
+    def _episode_done(self) -> bool:
+        """
+        An episode is done if an environment emitted
+        terminated=True or truncated=True since its last reset.
+        Detection happens at publish time, so this check is O(1).
+        """
+        return bool(self._terminated)
 
-        return False
\ No newline at end of file
+    def _take_terminated(self) -> Set[str]:
+        """
+        Return and clear the set of terminated environment IDs.
+        """
+        with self._terminated_lock:
+            terminated, self._terminated = self._terminated, set()
+        return terminated
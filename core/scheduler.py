@@ -1,13 +1,22 @@
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 from collections import deque
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 
+from core.clock import Clock
 from core.messages import Message
 from core.mediator import Mediator
 from core.base_module import BaseModule
 from core.audit_logger import AuditLogger
+from core.background import BackgroundJob, BackgroundRunner
+from core.memo import OutputCache
+from core.event_workers import ModuleWorker
+from core.dispatch import PriorityExecutor, dispatch_key, relative_deadline, response_time_bounds
+from core.lineage import LineageTracker, merge_origins
+from core.profiling import ModuleProfiler
+from core.tracing import Tracer
+from core.timing import TIME_EPSILON, TimingStats, next_release
 from utils.context import Context
 
 
@@ -17,6 +26,43 @@ class Scheduler:
     - which modules are due
     - which modules are executable (inputs available)
     - how execution is performed (inline vs threaded)
+
+    In time-based modes every module runs on absolute release times
+    (start + k * cycle). Overruns are resolved by the overrun policy
+    (see core.timing.next_release).
+
+    With a memoize policy other than off (the default), modules declared
+    pure (module.pure) are memoized: when their input messages did not
+    change since an earlier execution, the cached outputs are reused
+    instead of calling step() (see core.memo).
+
+    The dispatch policy orders the due modules of a time-based cycle
+    (fifo: config order, priority: module.priority, edf: earliest
+    absolute deadline). In time-thread-based mode the same order is used
+    by the worker pool's ready queue (see core.dispatch).
+
+    In event-thread-based mode every module runs in its own worker thread
+    that wakes up when its inputs are published (see core.event_workers);
+    start_workers() / stop_workers() replace the per-cycle entry points.
+
+    With a lineage tracker, output messages are stamped with the IDs of
+    the input messages they were computed from and with the origin
+    timestamps of their inputs, and environments record the end-to-end
+    latency of their inputs (see core.lineage).
+
+    With a tracer, every module execution and scheduling cycle is
+    recorded as a span (see core.tracing).
+
+    Background modules (module.background) do not run inside the step or
+    cycle that releases them: their inputs are snapshotted and step() runs
+    on a separate pool. The outputs are published at the first step/cycle
+    boundary after the job finished, stamped with their staleness (see
+    core.background). In event-thread-based mode every module already has
+    its own thread, so the flag has no effect there.
+
+    Module topics are resolved to Mediator topic IDs once (index_modules),
+    so the per-execution readiness check and input collection index the
+    Mediator's slot array instead of hashing topic names.
     """
 
     def __init__(
@@ -25,75 +71,257 @@ class Scheduler:
         mediator: Mediator,
         mode: str,
         max_workers: int = 4,
+        clock: Optional[Clock] = None,
+        overrun_policy: str = "skip",
+        max_burst: int = 3,
+        memoize: str = "off",
+        memo_size: int = 4,
+        profiler: Optional[ModuleProfiler] = None,
+        dispatch_policy: str = "fifo",
+        tracer: Optional[Tracer] = None,
+        lineage: Optional[LineageTracker] = None,
+        background_workers: int = 2,
     ):
         self.modules = modules
         self.mediator = mediator
         self.mode = mode
+        self.max_workers = max_workers
+        self.clock = clock or Clock()
+        self.overrun_policy = overrun_policy
+        self.max_burst = max_burst
+        self.memoize = memoize
+        self.memo_size = memo_size
+        self.profiler = profiler
+        self.dispatch_policy = dispatch_policy
+        self.tracer = tracer
+        self.lineage = lineage
 
         self.min_cycle = min((m.cycle for m in self.modules), default=100)
 
-        self.executor = (
-            ThreadPoolExecutor(max_workers=max_workers)
-            if mode == "time-thread-based"
-            else None
-        )
+        # Time-based mode: next absolute release time per module
+        self._release: Dict[str, float] = {}
+        # Modules left with missed periods by catch-up in the last cycle
+        self._catching_up: Set[str] = set()
+        self.timing: Dict[str, TimingStats] = {
+            m.module_id: TimingStats(m.module_id) for m in self.modules
+        }
+
+        self.index_modules()
+
+        # Event-thread-based mode: one long-lived worker per module
+        self.workers: List[ModuleWorker] = []
+
+        # Output caches of pure modules, created on first execution
+        self.memo: Dict[str, OutputCache] = {}
+
+        # Background modules: jobs in flight and step/cycle boundaries seen
+        self.background = BackgroundRunner(self.clock, max_workers=background_workers)
+        self.boundary = 0
+
+        # Wall-clock duration of steps (step-based) / cycles (time-based)
+        self.cycle_last_s = 0.0
+        self.cycle_max_s = 0.0
+        self.cycle_sum_s = 0.0
+
+        if mode != "time-thread-based":
+            self.executor = None
+        elif dispatch_policy == "fifo":
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            self.executor = PriorityExecutor(max_workers=max_workers)
 
     # ------------------------------------------------------------------
     # Core helpers
     # ------------------------------------------------------------------
 
+    def index_modules(self):
+        """
+        Resolve the input and output topics of every module to Mediator
+        topic IDs. Must be called again when the module list changes.
+        """
+        for module in self.modules:
+            module.input_ids = tuple(self.mediator.topic_id(t) for t in module.inputs)
+            module.output_ids = tuple(self.mediator.topic_id(t) for t in module.outputs)
+
+            # Payload types of inputs are checked once, at publish time
+            for topic in module.inputs:
+                self.mediator.require_context(topic)
+
     def _can_execute(self, module: BaseModule) -> bool:
-        return all(topic in self.mediator.latest_messages for topic in module.inputs)
+        slots = self.mediator.slots
+        for topic_id in module.input_ids:
+            if slots[topic_id] is None:
+                return False
+        return True
+
+    def _collect_inputs(
+        self,
+        module: BaseModule,
+        snapshot: Optional[Tuple[Message, ...]] = None,
+    ) -> Dict[str, Context]:
+        if snapshot is None:
+            slots = self.mediator.slots
+            snapshot = tuple(slots[topic_id] for topic_id in module.input_ids)
+
+        # Input topics only hold Context payloads (Mediator.require_context)
+        return {
+            topic: msg.payload
+            for topic, msg in zip(module.inputs, snapshot)
+            if msg is not None
+        }
+
+    # ------------------------------------------------------------------
+    # Module execution
+    # ------------------------------------------------------------------
 
-    def _collect_inputs(self, module: BaseModule) -> Dict[str, Context]:
-        inputs: Dict[str, Context] = {}
+    def _run_module(self, module: BaseModule, release: Optional[float] = None):
+        try:
+            # Snapshot, so cache key and lineage match the inputs of step()
+            slots = self.mediator.slots
+            snapshot = tuple([slots[topic_id] for topic_id in module.input_ids])
+            if None in snapshot:
+                return
 
-        for topic in module.inputs:
-            msg = self.mediator.latest_messages.get(topic)
-            if msg is None:
-                continue
+            start = self.clock.now()
 
-            if not isinstance(msg.payload, Context):
+            cache = self._memo_cache(module)
+            key = tuple([msg.id for msg in snapshot]) if cache is not None or self.lineage else ()
+
+            if cache is not None:
+                cached = cache.lookup(key)
+
+                if cached is not None:
+                    self._reuse_outputs(cached)
+                    self._finish(module, release, start)
+                    return
+
+            inputs = self._collect_inputs(module, snapshot)
+
+            # Outputs of environments (and of modules whose inputs carry no
+            # lineage) start new origins; others inherit their inputs' origins
+            origins = None
+            if self.lineage:
+                if module.is_env:
+                    self.lineage.record(module.module_id, zip(module.inputs, snapshot), self.clock.timestamp())
+                else:
+                    origins = merge_origins(snapshot)
+
+            if self.profiler:
+                outputs = self.profiler.call(module.module_id, module.step, inputs)
+            else:
+                outputs = module.step(inputs)
+
+            published = self._publish_outputs(module, outputs, key, origins)
+
+            if cache is not None:
+                cache.store(key, published)
+
+            AuditLogger.log_module_execution(module_id=module.module_id)
+
+            self._finish(module, release, start)
+
+        except Exception as e:
+            AuditLogger.log_event(
+                "execution_error",
+                module=module.module_id,
+                error=str(e),
+            )
+
+    def _publish_outputs(
+        self,
+        module: BaseModule,
+        outputs,
+        key: tuple,
+        origins: Optional[Dict[str, float]],
+        staleness: Optional[Dict[str, float]] = None,
+    ) -> List[Message]:
+        outputs = outputs or {}
+
+        if not isinstance(outputs, dict):
+            raise TypeError(
+                f"Module '{module.module_id}' must return dict(topic->Observation)"
+            )
+
+        published = []
+
+        for topic, obs in outputs.items():
+            if not isinstance(obs, Context):
                 raise TypeError(
-                    f"Module '{module.module_id}' expected Context on topic '{topic}', "
-                    f"got {type(msg.payload)}"
+                    f"Output '{topic}' of module '{module.module_id}' "
+                    f"must be Observation, got {type(obs)}"
                 )
 
-            inputs[topic] = msg.payload
+            timestamp = self.clock.timestamp()
+
+            msg_origins = origins
+            if self.lineage and origins is None:
+                msg_origins = {topic: timestamp}
+
+            msg = Message(
+                topic=topic,
+                payload=obs,
+                sender=module.module_id,
+                timestamp=timestamp,
+                parents=key,
+                origins=msg_origins,
+                staleness=staleness,
+            )
+            self.mediator.publish(msg)
+            published.append(msg)
+
+        return published
+
+    def _run_traced(self, module: BaseModule, release: Optional[float] = None):
+        start = self.tracer.now()
+        try:
+            self._run_module(module, release)
+        finally:
+            self.tracer.record(module.module_id, "module", start)
+
+    def _finish(self, module: BaseModule, release: Optional[float], start: float):
+        module.last_execution = self.clock.now()
 
-        return inputs
+        if release is not None:
+            self.timing[module.module_id].record(
+                release, start, module.last_execution, module.cycle,
+                relative_deadline(module),
+            )
+        else:
+            self.timing[module.module_id].record_execution(start, module.last_execution)
 
     # ------------------------------------------------------------------
-    # Module execution
+    # Background modules
     # ------------------------------------------------------------------
 
-    def _run_module(self, module: BaseModule):
+    def _submit_background(self, module: BaseModule, release: Optional[float] = None):
+        """
+        Snapshot the module's inputs and run its step() on the background
+        pool. Releases while an earlier job is still running are skipped.
+        """
         try:
-            if not self._can_execute(module):
+            if self.background.busy(module.module_id):
                 return
 
-            inputs = self._collect_inputs(module)
-            outputs = module.step(inputs) or {}
+            slots = self.mediator.slots
+            snapshot = tuple([slots[topic_id] for topic_id in module.input_ids])
+            if None in snapshot:
+                return
 
-            if not isinstance(outputs, dict):
-                raise TypeError(
-                    f"Module '{module.module_id}' must return dict(topic->Observation)"
-                )
+            start = self.clock.now()
 
-            for topic, obs in outputs.items():
-                if not isinstance(obs, Context):
-                    raise TypeError(
-                        f"Output '{topic}' of module '{module.module_id}' "
-                        f"must be Observation, got {type(obs)}"
-                    )
+            cache = self._memo_cache(module)
+            key = tuple([msg.id for msg in snapshot]) if cache is not None or self.lineage else ()
 
-                self.mediator.publish(
-                    Message(topic=topic, payload=obs, sender=module.module_id),
-                )
+            if cache is not None:
+                cached = cache.lookup(key)
 
-            AuditLogger.log_module_execution(module_id=module.module_id)
+                if cached is not None:
+                    self._reuse_outputs(cached)
+                    self._finish(module, release, start)
+                    return
 
-            module.last_execution = time.time()
+            job = BackgroundJob(module, release, snapshot, key, self.boundary, start)
+            self.background.submit(job, self._run_background)
 
         except Exception as e:
             AuditLogger.log_event(
@@ -102,17 +330,173 @@ class Scheduler:
                 error=str(e),
             )
 
-    def _execute(self, module: BaseModule):
-        if self.executor:
-            self.executor.submit(self._run_module, module)
+    def _run_background(self, job: BackgroundJob):
+        """
+        Runs on a background thread; only computes, outputs are published
+        by publish_background() on the scheduling thread.
+        """
+        module = job.module
+        inputs = self._collect_inputs(module, job.snapshot)
+        start = self.tracer.now() if self.tracer else None
+
+        try:
+            if self.profiler:
+                return self.profiler.call(module.module_id, module.step, inputs)
+            return module.step(inputs)
+        finally:
+            if self.tracer:
+                self.tracer.record(module.module_id, "module", start, {"background": True})
+
+    def publish_background(self):
+        """
+        Publish the outputs of finished background jobs. Called at every
+        step/cycle boundary, before modules of the new step run.
+
+        Each output message carries its staleness:
+        - age_s: clock time from the input snapshot to publication
+        - steps: step/cycle boundaries passed since the snapshot
+        - compute_s: execution time of step()
+        """
+        if not self.background.in_flight:
+            return
+
+        for job in self.background.completed():
+            module = job.module
+
+            try:
+                outputs = job.future.result()
+
+                age = self.clock.now() - job.submitted
+                steps = self.boundary - job.boundary
+                staleness = {
+                    "age_s": age,
+                    "steps": steps,
+                    "compute_s": job.finish - job.start,
+                }
+
+                origins = merge_origins(job.snapshot) if self.lineage else None
+                published = self._publish_outputs(module, outputs, job.key, origins, staleness)
+
+                cache = self._memo_cache(module)
+                if cache is not None:
+                    cache.store(job.key, published)
+
+                self.background.record(job, age, steps)
+                AuditLogger.log_module_execution(module_id=module.module_id)
+
+                module.last_execution = job.finish
+                if job.release is not None:
+                    self.timing[module.module_id].record(
+                        job.release, job.start, job.finish, module.cycle,
+                        relative_deadline(module),
+                    )
+                else:
+                    self.timing[module.module_id].record_execution(job.start, job.finish)
+
+            except Exception as e:
+                self.background.record(job, 0.0, 0, error=True)
+                AuditLogger.log_event(
+                    "execution_error",
+                    module=module.module_id,
+                    error=str(e),
+                    background=True,
+                )
+
+    def discard_background(self, module_ids=None):
+        """
+        Drop results of running background jobs (e.g. on episode reset).
+        """
+        self.background.discard(module_ids)
+
+    def wait_background(self, module_ids=None):
+        """
+        Block until running background jobs (of the given modules, default
+        all) have finished, before their module state is touched from the
+        scheduling thread.
+        """
+        self.background.wait(module_ids)
+
+    def background_report(self) -> Dict[str, dict]:
+        """
+        Per background module: jobs submitted / published, releases
+        skipped while busy, discarded results and worst staleness.
+        """
+        return self.background.report()
+
+    # ------------------------------------------------------------------
+    # Memoization of pure modules
+    # ------------------------------------------------------------------
+
+    def _memo_cache(self, module: BaseModule) -> Optional[OutputCache]:
+        if self.memoize == "off" or not module.pure:
+            return None
+
+        cache = self.memo.get(module.module_id)
+        if cache is None:
+            cache = self.memo.setdefault(
+                module.module_id, OutputCache(module.module_id, self.memo_size)
+            )
+        return cache
+
+    def _reuse_outputs(self, cached: List[Message]):
+        mediator = self.mediator
+
+        for msg in cached:
+            # In skip mode an output that is still current is not republished
+            if self.memoize == "republish" or mediator.slots[mediator.topic_id(msg.topic)] is not msg:
+                self.mediator.publish(msg)
+
+    def clear_memo(self, module_id: Optional[str] = None):
+        """
+        Drop cached outputs of one module (e.g. after a swap) or of all.
+        Hit/miss counters are kept.
+        """
+        if module_id is None:
+            caches = list(self.memo.values())
         else:
-            self._run_module(module)
+            caches = [self.memo[module_id]] if module_id in self.memo else []
+
+        for cache in caches:
+            cache.clear()
+
+    def memo_report(self) -> Dict[str, dict]:
+        """
+        Per-module hit/miss counters of memoized pure modules.
+        """
+        return {module_id: cache.report() for module_id, cache in self.memo.items()}
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _execute(self, module: BaseModule, release: Optional[float] = None):
+        if module.background:
+            self._submit_background(module, release)
+            return None
+
+        run = self._run_traced if self.tracer else self._run_module
+
+        if isinstance(self.executor, PriorityExecutor):
+            key = dispatch_key(module, release, self.dispatch_policy)
+            return self.executor.submit(run, module, release, key=key)
+
+        if self.executor:
+            return self.executor.submit(run, module, release)
+
+        run(module, release)
+        return None
 
     # ------------------------------------------------------------------
     # Step-based mode
     # ------------------------------------------------------------------
 
     def run_step(self, step: int):
+        started = time.perf_counter()
+        cycle_start = self.tracer.now() if self.tracer else None
+
+        self.boundary += 1
+        self.publish_background()
+
         runnable = deque(
             m for m in self.modules
             if step % m.cycle == 0
@@ -139,6 +523,11 @@ class Scheduler:
                 )
                 break
 
+        if self.tracer:
+            self.tracer.record("step", "scheduler", cycle_start, {"step": step})
+
+        self._record_cycle(time.perf_counter() - started)
+
     # ------------------------------------------------------------------
     # Time-based mode
     # ------------------------------------------------------------------
@@ -147,19 +536,38 @@ class Scheduler:
         """
         Executes one scheduling cycle.
         """
+        now = self.clock.now()
+        started = time.perf_counter()
+        cycle_start = self.tracer.now() if self.tracer else None
 
-        runnable = deque(
+        self.boundary += 1
+        self.publish_background()
+        self._catching_up.clear()
+
+        for m in self.modules:
+            self._release.setdefault(m.module_id, now)
+
+        due = [
             m for m in self.modules
-            if (time.time() - m.last_execution) >= m.cycle
-        )
+            if now + TIME_EPSILON >= self._release[m.module_id]
+        ]
+
+        if self.dispatch_policy != "fifo":
+            due.sort(key=lambda m: dispatch_key(m, self._release[m.module_id], self.dispatch_policy))
+
+        runnable = deque(due)
 
+        futures = []
         no_progress = 0
 
         while runnable:
             module = runnable.popleft()
 
             if self._can_execute(module):
-                self._execute(module)
+                release = self._dispatch(module)
+                future = self._execute(module, release)
+                if future is not None:
+                    futures.append(future)
                 no_progress = 0
             else:
                 runnable.append(module)
@@ -172,3 +580,158 @@ class Scheduler:
                     modules=[m.module_id for m in runnable],
                 )
                 break
+
+        # Simulated time must not advance while workers are still running
+        if self.clock.virtual and futures:
+            wait(futures)
+
+        if self.tracer:
+            self.tracer.record("cycle", "scheduler", cycle_start, {"due": len(due)})
+
+        self._record_cycle(time.perf_counter() - started)
+
+    def _record_cycle(self, duration: float):
+        self.cycle_last_s = duration
+        self.cycle_sum_s += duration
+        if duration > self.cycle_max_s:
+            self.cycle_max_s = duration
+
+    def _dispatch(self, module: BaseModule) -> float:
+        """
+        Consume the module's pending release and schedule the next one.
+        Returns the release time being served.
+        """
+        release = self._release[module.module_id]
+        now = self.clock.now()
+
+        nxt, skipped = next_release(
+            release,
+            module.cycle,
+            now,
+            self.overrun_policy,
+            self.max_burst,
+        )
+        self._release[module.module_id] = nxt
+
+        if nxt <= now and self.overrun_policy == "catch-up":
+            self._catching_up.add(module.module_id)
+
+        if skipped:
+            self.timing[module.module_id].record_skipped(skipped)
+            AuditLogger.log_event(
+                "deadline_overrun",
+                module=module.module_id,
+                policy=self.overrun_policy,
+                skipped_periods=skipped,
+            )
+
+        return release
+
+    def next_deadline(self, now: float, horizon: float) -> float:
+        """
+        Earliest module deadline after 'now', capped at 'horizon'.
+
+        'now' is the start of the last scheduling cycle. Modules that were
+        already due then but blocked on missing inputs are ignored, so the
+        loop does not spin on them. Modules that catch-up left with missed
+        periods return their oldest one, so the next cycle starts at once
+        and the burst runs back to back.
+        """
+        deadline = horizon
+
+        for module_id in self._catching_up:
+            deadline = min(deadline, self._release[module_id])
+
+        for m in self.modules:
+            due = self._release.get(m.module_id)
+            if due is not None and now + TIME_EPSILON < due < deadline:
+                deadline = due
+
+        return deadline
+
+    # ------------------------------------------------------------------
+    # Event-thread-based mode
+    # ------------------------------------------------------------------
+
+    def start_workers(self):
+        """
+        Start one worker thread per module slot.
+        """
+        if self.workers:
+            return
+
+        self.workers = [ModuleWorker(self, index) for index in range(len(self.modules))]
+        for worker in self.workers:
+            worker.start()
+
+    def stop_workers(self, timeout: float = 1.0):
+        """
+        Stop all workers and wait for running executions to finish.
+        """
+        for worker in self.workers:
+            worker.stop()
+
+        stuck = [w.module_id for w in self.workers if not w.join(timeout)]
+        if stuck:
+            AuditLogger.log_event("worker_shutdown_timeout", modules=stuck, timeout_s=timeout)
+
+        self.workers = []
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def backlog(self) -> dict:
+        """
+        Work waiting to be served: jobs queued for the worker pool
+        (time-thread-based), background jobs in flight and modules whose
+        pending release is more than one cycle overdue.
+        """
+        now = self.clock.now()
+
+        queued = 0
+        if isinstance(self.executor, PriorityExecutor):
+            queued = self.executor.pending
+        elif self.executor:
+            queued = self.executor._work_queue.qsize()
+
+        overdue = []
+        for m in self.modules:
+            release = self._release.get(m.module_id)
+            if release is not None and now - release > m.cycle:
+                overdue.append(m.module_id)
+
+        return {
+            "queued": queued,
+            "background_in_flight": self.background.in_flight,
+            "overdue": overdue,
+        }
+
+    def timing_report(self) -> Dict[str, dict]:
+        """
+        Per-module jitter and deadline-miss statistics (time-based modes).
+        """
+        return {module_id: stats.report() for module_id, stats in self.timing.items()}
+
+    def response_time_report(self, costs: Optional[Dict[str, float]] = None) -> Dict[str, dict]:
+        """
+        Observed worst-case response time (release to finish) per module,
+        its relative deadline and misses. With costs and fixed-priority
+        dispatch on one worker, the analytical bound is added as well.
+        """
+        bounds = {}
+        if costs is not None and self.dispatch_policy == "priority" and self.executor is None:
+            bounds = response_time_bounds(self.modules, costs)
+
+        report = {}
+        for m in self.modules:
+            stats = self.timing[m.module_id]
+            report[m.module_id] = {
+                "priority": m.priority,
+                "deadline_s": relative_deadline(m),
+                "wcrt_observed_s": stats.response_max,
+                "wcrt_bound_s": bounds.get(m.module_id),
+                "deadline_misses": stats.deadline_misses,
+                "executions": stats.releases,
+            }
+        return report
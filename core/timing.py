@@ -0,0 +1,180 @@
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Optional, Tuple
+
+
+OVERRUN_POLICIES = {"skip", "catch-up", "degrade"}
+
+# Releases closer than this are treated as simultaneous (float rounding)
+TIME_EPSILON = 1e-9
+
+# Upper bucket bounds for release jitter (seconds)
+JITTER_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+# Upper bucket bounds for deadline misses (lateness in periods)
+MISS_BUCKETS = (0.1, 0.5, 1, 2, 4, 8)
+
+
+def next_release(
+    release: float,
+    cycle: float,
+    now: float,
+    policy: str,
+    max_burst: int,
+) -> Tuple[float, int]:
+    """
+    Compute the next absolute release time of a periodic module.
+
+    Args:
+        release: release time of the period that is being dispatched
+        cycle: module period (seconds)
+        now: current time
+        policy: overrun policy
+            - skip: drop all missed periods, resume on the period grid
+            - catch-up: run missed periods back to back, but keep at most
+              max_burst of them pending; older ones are dropped. Unlike
+              skip, the returned release may lie in the past, and the
+              time loop serves it in the next cycle without sleeping
+            - degrade: re-anchor the period at 'now' (rate drops, no burst)
+        max_burst: maximum number of pending periods for catch-up
+
+    Returns:
+        (next_release, skipped_periods)
+    """
+    nominal = release + cycle
+    if nominal > now:
+        return nominal, 0
+
+    # Number of further releases that are already due
+    pending = math.floor((now - nominal) / cycle) + 1
+
+    if policy == "skip":
+        return nominal + pending * cycle, pending
+
+    if policy == "catch-up":
+        if pending <= max_burst:
+            return nominal, 0
+        dropped = pending - max_burst
+        return nominal + dropped * cycle, dropped
+
+    if policy == "degrade":
+        return now + cycle, pending
+
+    raise ValueError(f"Unsupported overrun policy: {policy}")
+
+
+def _histogram(bounds, counts, unit: str) -> Dict[str, int]:
+    labels = [f"<={b}{unit}" for b in bounds] + [f">{bounds[-1]}{unit}"]
+    return dict(zip(labels, counts))
+
+
+class TimingStats:
+    """
+    Per-module timing statistics.
+
+    - execution time: start to finish of one execution (all modes)
+    - jitter: delay between scheduled release and actual start
+    - response time: release to finish of one execution
+    - deadline miss: execution finished after its relative deadline
+      (default: the end of its period)
+    - skipped periods: releases dropped by the overrun policy
+
+    Jitter, response time and deadlines only exist for periodic releases
+    (time-based modes) and are averaged over 'releases'; step-based
+    executions only count towards the execution time.
+    """
+
+    def __init__(self, module_id: str):
+        self.module_id = module_id
+
+        self.executions = 0
+        self.releases = 0
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self.jitter_hist = [0] * (len(JITTER_BUCKETS) + 1)
+
+        self.deadline_misses = 0
+        self.miss_hist = [0] * (len(MISS_BUCKETS) + 1)
+
+        self.skipped_periods = 0
+
+        self.exec_sum = 0.0
+        self.exec_max = 0.0
+        self.exec_last = 0.0
+
+        self.response_sum = 0.0
+        self.response_max = 0.0
+
+        # Modules may finish concurrently in threaded mode
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        release: float,
+        start: float,
+        finish: float,
+        cycle: float,
+        deadline: Optional[float] = None,
+    ):
+        jitter = max(0.0, start - release)
+        lateness = finish - (release + (cycle if deadline is None else deadline))
+        duration = finish - start
+        response = finish - release
+
+        with self._lock:
+            self._record_execution(duration)
+            self.releases += 1
+            self.response_sum += response
+            self.response_max = max(self.response_max, response)
+            self.jitter_sum += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+            self.jitter_hist[bisect_left(JITTER_BUCKETS, jitter)] += 1
+
+            if lateness > 0:
+                self.deadline_misses += 1
+                self.miss_hist[bisect_left(MISS_BUCKETS, lateness / cycle)] += 1
+
+    def record_execution(self, start: float, finish: float):
+        """
+        Execution without a periodic release (step-based mode).
+        """
+        with self._lock:
+            self._record_execution(finish - start)
+
+    def _record_execution(self, duration: float):
+        self.executions += 1
+        self.exec_sum += duration
+        self.exec_max = max(self.exec_max, duration)
+        self.exec_last = duration
+
+    def record_skipped(self, periods: int):
+        if periods <= 0:
+            return
+
+        with self._lock:
+            self.skipped_periods += periods
+
+    def report(self) -> dict:
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "releases": self.releases,
+                "jitter_mean_s": (
+                    self.jitter_sum / self.releases if self.releases else 0.0
+                ),
+                "jitter_max_s": self.jitter_max,
+                "jitter_hist": _histogram(JITTER_BUCKETS, self.jitter_hist, "s"),
+                "exec_mean_s": (
+                    self.exec_sum / self.executions if self.executions else 0.0
+                ),
+                "exec_max_s": self.exec_max,
+                "exec_last_s": self.exec_last,
+                "response_mean_s": (
+                    self.response_sum / self.releases if self.releases else 0.0
+                ),
+                "response_max_s": self.response_max,
+                "deadline_misses": self.deadline_misses,
+                "miss_hist": _histogram(MISS_BUCKETS, self.miss_hist, "T"),
+                "skipped_periods": self.skipped_periods,
+            }
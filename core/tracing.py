@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+class Tracer:
+    """
+    Records execution spans (begin/end, thread) into a preallocated ring
+    buffer and exports them as Chrome trace JSON, which chrome://tracing
+    and https://ui.perfetto.dev display as a per-thread timeline.
+
+    Span categories used by the runtime:
+    - module: one step() of a module (incl. memoized executions)
+    - scheduler: one scheduling cycle (time-based) or step (step-based)
+    - oc: one OC property check
+    - runtime: episode resets
+
+    Spans are timed with the wall clock (perf counter) even when the
+    runtime uses a virtual clock, so idle gaps and worker concurrency are
+    always real. When more spans are recorded than the buffer holds, the
+    oldest ones are overwritten; export() keeps the most recent window.
+    """
+
+    def __init__(self, path: str = "traces/trace.json", capacity: int = 100_000, process_name: str = "orca"):
+        if capacity <= 0:
+            raise ValueError("Tracer capacity must be positive")
+
+        self.path = path
+        self.capacity = capacity
+        self.process_name = process_name
+
+        # Ring buffer of (sequence, name, category, start_ns, end_ns, tid, args)
+        self._buffer: List[Optional[tuple]] = [None] * capacity
+        self._sequence = itertools.count()
+
+        self._thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter_ns()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def now() -> int:
+        """Span timestamp in nanoseconds (perf counter)."""
+        return time.perf_counter_ns()
+
+    def record(self, name: str, category: str, start: int, args: Optional[dict] = None):
+        """
+        Record a span that started at 'start' (see now()) and ends now,
+        on the calling thread.
+        """
+        end = time.perf_counter_ns()
+        tid = threading.get_ident()
+
+        if tid not in self._thread_names:
+            self._thread_names[tid] = threading.current_thread().name
+
+        # next() on itertools.count is atomic, so concurrent writers get distinct slots
+        seq = next(self._sequence)
+        self._buffer[seq % self.capacity] = (seq, name, category, start, end, tid, args)
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, category, start, args or None)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def _entries(self) -> List[tuple]:
+        entries = [entry for entry in list(self._buffer) if entry is not None]
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def report(self) -> dict:
+        entries = self._entries()
+        recorded = entries[-1][0] + 1 if entries else 0
+
+        return {
+            "spans": recorded,
+            "dropped": max(0, recorded - self.capacity),
+            "capacity": self.capacity,
+        }
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.process_name}},
+        ]
+
+        for tid, name in list(self._thread_names.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+
+        for _, name, category, start, end, tid, args in self._entries():
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": self.report(),
+        }
+
+    def export(self, path: Optional[str] = None) -> str:
+        """
+        Write the buffered spans as Chrome trace JSON, returns the path.
+        """
+        path = path or self.path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # dumps() uses the C encoder, dump() would encode in Python chunks
+        with open(path, "w") as f:
+            f.write(json.dumps(self.to_chrome_trace(), default=str))
+
+        return path
@@ -1,6 +1,10 @@
+import sys
+
 from core.runtime import Runtime
 
 
 if __name__ == "__main__":
-    runtime = Runtime.from_config("configs/example_step.json")
+    config_path = sys.argv[1] if len(sys.argv) > 1 else "configs/example_step.json"
+
+    runtime = Runtime.from_config(config_path)
     runtime.run()
@@ -13,6 +13,9 @@ class Controller(BaseModule):
         self.spike_delta = self.config.get("spike_delta", 10.0)
         self.spike_prob = self.config.get("spike_prob", 0.1)
 
+        # Without spike injection the action depends on the state only
+        self.pure = self.spike_prob == 0
+
     def step(self, inputs: dict) -> dict:
         """
         Controller computes an action based on the estimated state.
@@ -35,7 +38,7 @@ class Controller(BaseModule):
             delta = 0.0
 
         # Inject unsafe action with small probability
-        if random.random() < self.spike_prob:
+        if self.spike_prob and random.random() < self.spike_prob:
             delta = self.spike_delta if delta >= 0 else -self.spike_delta
 
         # Action is written into info
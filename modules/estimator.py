@@ -10,6 +10,8 @@ class Estimator(BaseModule):
     State estimator using exponential smoothing.
     """
 
+    degradable = True
+
     def __init__(
         self,
         module_id,
@@ -30,6 +32,12 @@ class Estimator(BaseModule):
         self.estimate = None
         return {}
 
+    def get_state(self) -> dict:
+        return {"estimate": self.estimate}
+
+    def set_state(self, state: dict):
+        self.estimate = state["estimate"]
+
     def step(self, inputs: Dict[str, Context]) -> Dict[str, Context]:
         raw_obs = inputs.get("raw_temp")
         if raw_obs is None or raw_obs.state is None:
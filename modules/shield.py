@@ -4,6 +4,10 @@ from core.audit_logger import AuditLogger
 
 
 class Shield(BaseModule):
+    # Not pure: step() audits every override (shield_override), which a
+    # memoized execution would drop
+    pure = False
+
     def __init__(self, module_id, inputs, outputs, cycle, is_env=False, config=None):
         super().__init__(module_id, inputs, outputs, cycle, is_env, config)
         self.max_delta = self.config.get("max_delta", 5.0)
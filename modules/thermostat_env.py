@@ -47,6 +47,12 @@ class ThermostatEnv(BaseModule):
 
         return {"true_temp": obs}
 
+    def get_state(self) -> dict:
+        return {"temp": self.temp}
+
+    def set_state(self, state: dict):
+        self.temp = state["temp"]
+
     # ------------------------------------------------------------------
     # Environment dynamics
     # ------------------------------------------------------------------
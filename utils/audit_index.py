@@ -0,0 +1,444 @@
+"""
+Sidecar index and query tool for AuditLogger CSV files.
+
+The index (<log>.idx) stores, per row, the timestamp and byte offset,
+plus sorted row-number posting lists per event type, module and topic
+and per (event, module) / (event, topic) pair.
+Both files are memory-mapped: a query touches only the index sections
+it needs and the byte ranges of the matching rows.
+
+Usage:
+    python -m utils.audit_index build logs/audit_log_<ts>.csv
+    python -m utils.audit_index query logs/audit_log_<ts>.csv --event shield_override --module shield --start T1 --end T2
+    python -m utils.audit_index count logs/audit_log_<ts>.csv --event execution_error --by module
+
+Only uncompressed logs can be indexed (byte ranges of compressed
+streams cannot be read directly).
+"""
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterator, List, Optional
+
+
+MAGIC = b"OCAIDX1\n"
+
+# Keys in the details column that identify the acting module / topic
+_FIELD_RE = re.compile(r"(?:^|, )(module|sender|by|topic)=([^,]*)")
+
+FIELDS = ("event", "module", "topic")
+
+
+def _parse_fields(event_type: str, details: str) -> Dict[str, str]:
+    fields = {"event": event_type}
+
+    for key, value in _FIELD_RE.findall(details):
+        if key == "topic":
+            fields.setdefault("topic", value)
+        else:
+            # module=, sender= and by= all name the acting module
+            fields.setdefault("module", value)
+
+    return fields
+
+
+def _copy(view: memoryview) -> array:
+    copied = array(view.format)
+    copied.frombytes(view.cast("B"))
+    return copied
+
+
+class AuditIndex:
+    """
+    Read-only view on an audit log and its sidecar index.
+    """
+
+    def __init__(self, log_path: str, index_path: str):
+        self.log_path = log_path
+        self.index_path = index_path
+
+        self._log_file = open(log_path, "rb")
+        self._log = mmap.mmap(self._log_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._idx_file = open(index_path, "rb")
+        self._idx = mmap.mmap(self._idx_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._idx[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not an audit index: '{index_path}'")
+
+        (header_len,) = struct.unpack_from("<Q", self._idx, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._idx[header_start:header_start + header_len])
+
+        self._data_start = header_start + header_len
+        self._data_start += -self._data_start % 8
+
+        self.rows: int = self.header["rows"]
+        self.sorted: bool = self.header["sorted"]
+        self._times = self._section("times")
+        self._offsets = self._section("offsets")
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def open(cls, log_path: str, index_path: Optional[str] = None) -> "AuditIndex":
+        """
+        Open the index of a log, (re)building it if missing or stale.
+        """
+        index_path = index_path or f"{log_path}.idx"
+
+        if not cls._is_current(log_path, index_path):
+            cls.build(log_path, index_path)
+
+        return cls(log_path, index_path)
+
+    @staticmethod
+    def _is_current(log_path: str, index_path: str) -> bool:
+        if not os.path.exists(index_path):
+            return False
+
+        with open(index_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return False
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(header_len))
+
+        stat = os.stat(log_path)
+        return header["log_size"] == stat.st_size and header["log_mtime"] == stat.st_mtime
+
+    @staticmethod
+    def build(log_path: str, index_path: Optional[str] = None) -> str:
+        """
+        Scan the log once and write the sidecar index. Returns its path.
+        """
+        if log_path.endswith((".gz", ".xz")):
+            raise ValueError("Compressed audit logs cannot be indexed; decompress them first")
+
+        index_path = index_path or f"{log_path}.idx"
+        stat = os.stat(log_path)
+
+        times = array("d")
+        offsets = array("Q")
+        postings: Dict[str, array] = {}
+
+        with open(log_path, "rb") as f:
+            offset = len(f.readline())  # header row
+
+            for line in f:
+                # Quoted details may span several physical lines
+                while line.count(b'"') % 2 == 1:
+                    more = f.readline()
+                    if not more:
+                        break
+                    line += more
+
+                row = next(csv.reader(io.StringIO(line.decode("utf-8"))), None)
+                if not row or len(row) < 3:
+                    offset += len(line)
+                    continue
+
+                row_id = len(times)
+                times.append(float(row[0]))
+                offsets.append(offset)
+
+                fields = _parse_fields(row[1], row[2])
+                keys = [f"{field}:{value}" for field, value in fields.items()]
+                for field in ("module", "topic"):
+                    if field in fields:
+                        keys.append(f"event+{field}:{fields['event']}|{fields[field]}")
+
+                for key in keys:
+                    postings.setdefault(key, array("I")).append(row_id)
+
+                offset += len(line)
+
+        offsets.append(offset)
+
+        sections = {"times": times, "offsets": offsets}
+        sections.update({f"post:{key}": ids for key, ids in postings.items()})
+
+        # Lay out sections after the header, 8-byte aligned
+        layout = {}
+        position = 0
+        for name, data in sections.items():
+            layout[name] = [position, len(data), data.typecode]
+            position += len(data) * data.itemsize
+            position += -position % 8
+
+        header = json.dumps({
+            "rows": len(times),
+            "sorted": all(times[i] <= times[i + 1] for i in range(len(times) - 1)),
+            "log_size": stat.st_size,
+            "log_mtime": stat.st_mtime,
+            "sections": layout,
+        }).encode("utf-8")
+
+        data_start = len(MAGIC) + 8 + len(header)
+        data_start += -data_start % 8
+
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(b"\0" * (data_start - f.tell()))
+
+            for name, data in sections.items():
+                f.write(b"\0" * (data_start + layout[name][0] - f.tell()))
+                data.tofile(f)
+
+        os.replace(tmp_path, index_path)
+        return index_path
+
+    def close(self):
+        # Release memoryviews before closing the maps
+        self._times = self._offsets = None
+        self._log.close()
+        self._log_file.close()
+        self._idx.close()
+        self._idx_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Index access
+    # ------------------------------------------------------------------
+
+    def _section(self, name: str):
+        entry = self.header["sections"].get(name)
+        if entry is None:
+            return None
+
+        position, count, typecode = entry
+        start = self._data_start + position
+        end = start + count * array(typecode).itemsize
+
+        return memoryview(self._idx)[start:end].cast(typecode)
+
+    def values(self, field: str) -> List[str]:
+        """All indexed values of a field (event, module or topic)."""
+        prefix = f"post:{field}:"
+        return sorted(
+            name[len(prefix):] for name in self.header["sections"] if name.startswith(prefix)
+        )
+
+    def _row_range(self, start: Optional[float], end: Optional[float]):
+        lo = 0 if start is None else bisect_left(self._times, start)
+        hi = self.rows if end is None else bisect_right(self._times, end)
+        return lo, hi
+
+    def _plan(self, event, module, topic, start, end):
+        """
+        Pick the posting lists for the filters and narrow the driving list
+        to the time range. Returns None if nothing can match, otherwise
+        (candidates, other posting lists, time filter or None).
+        """
+        keys = []
+        if event is not None and module is not None:
+            keys.append(f"event+module:{event}|{module}")
+            module = None
+        elif event is not None and topic is not None:
+            keys.append(f"event+topic:{event}|{topic}")
+            topic = None
+
+        for field, value in (("event", event), ("module", module), ("topic", topic)):
+            if value is not None and not (field == "event" and keys):
+                keys.append(f"{field}:{value}")
+
+        lists = []
+        for key in keys:
+            posting = self._section(f"post:{key}")
+            if posting is None:
+                return None
+            lists.append(posting)
+
+        if self.sorted:
+            lo, hi = self._row_range(start, end)
+            in_time = None
+        else:
+            lo, hi = 0, self.rows
+            in_time = (start, end)
+
+        if not lists:
+            return range(lo, hi), [], in_time
+
+        lists.sort(key=len)
+        driver, others = lists[0], lists[1:]
+
+        # Copies: a view on the map held by a suspended query() would make close() fail
+        candidates = _copy(driver[bisect_left(driver, lo):bisect_left(driver, hi)])
+        return candidates, [_copy(posting) for posting in others], in_time
+
+    def _matching_rows(self, event=None, module=None, topic=None, start=None, end=None) -> Iterator[int]:
+        plan = self._plan(event, module, topic, start, end)
+        if plan is None:
+            return
+
+        candidates, others, in_time = plan
+
+        for row in candidates:
+            if in_time is not None:
+                t = self._times[row]
+                if (start is not None and t < start) or (end is not None and t > end):
+                    continue
+
+            if all(self._contains(posting, row) for posting in others):
+                yield row
+
+    @staticmethod
+    def _contains(posting, row: int) -> bool:
+        i = bisect_left(posting, row)
+        return i < len(posting) and posting[i] == row
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        event: Optional[str] = None,
+        module: Optional[str] = None,
+        topic: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[dict]:
+        """
+        Yield matching rows as dicts (timestamp, event_type, details).
+        Only the byte ranges of matching rows are read from the log.
+        """
+        for n, row in enumerate(self._matching_rows(event, module, topic, start, end)):
+            if limit is not None and n >= limit:
+                return
+
+            line = self._log[self._offsets[row]:self._offsets[row + 1]].decode("utf-8")
+            timestamp, event_type, details = next(csv.reader(io.StringIO(line)))
+
+            yield {
+                "timestamp": float(timestamp),
+                "event_type": event_type,
+                "details": details,
+            }
+
+    def count(
+        self,
+        event: Optional[str] = None,
+        module: Optional[str] = None,
+        topic: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        by: Optional[str] = None,
+    ):
+        """
+        Count matching rows. With 'by' (event, module or topic), return
+        a dict value -> count instead. Reads the index only.
+        """
+        filters = {"event": event, "module": module, "topic": topic}
+
+        if by is None:
+            plan = self._plan(event, module, topic, start, end)
+            if plan is None:
+                return 0
+
+            candidates, others, in_time = plan
+            if not others and in_time is None:
+                return len(candidates)
+
+            return sum(1 for _ in self._matching_rows(event, module, topic, start, end))
+
+        if by not in FIELDS:
+            raise ValueError(f"Cannot group by '{by}', expected one of {FIELDS}")
+
+        counts = {}
+        for value in self.values(by):
+            if filters[by] is not None and filters[by] != value:
+                continue
+            n = self.count(**{**filters, by: value}, start=start, end=end)
+            if n:
+                counts[value] = n
+
+        return counts
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Indexed queries over ORCA-Next audit logs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="build or refresh the sidecar index")
+    build.add_argument("logs", nargs="+")
+
+    for name in ("query", "count"):
+        p = sub.add_parser(name)
+        p.add_argument("logs", nargs="+")
+        p.add_argument("--event")
+        p.add_argument("--module")
+        p.add_argument("--topic")
+        p.add_argument("--start", type=float)
+        p.add_argument("--end", type=float)
+        if name == "query":
+            p.add_argument("--limit", type=int)
+        else:
+            p.add_argument("--by", choices=FIELDS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        for log in args.logs:
+            print(AuditIndex.build(log))
+        return
+
+    filters = dict(
+        event=args.event, module=args.module, topic=args.topic,
+        start=args.start, end=args.end,
+    )
+
+    if args.command == "query":
+        writer = csv.writer(sys.stdout)
+        remaining = args.limit
+        for log in args.logs:
+            with AuditIndex.open(log) as index:
+                for row in index.query(**filters, limit=remaining):
+                    writer.writerow([f"{row['timestamp']:.3f}", row["event_type"], row["details"]])
+                    if remaining is not None:
+                        remaining -= 1
+            if remaining == 0:
+                break
+        return
+
+    total = {} if args.by else 0
+    for log in args.logs:
+        with AuditIndex.open(log) as index:
+            result = index.count(**filters, by=args.by)
+        if args.by:
+            for value, n in result.items():
+                total[value] = total.get(value, 0) + n
+        else:
+            total += result
+
+    if args.by:
+        for value, n in sorted(total.items(), key=lambda item: -item[1]):
+            print(f"{value},{n}")
+    else:
+        print(total)
+
+
+if __name__ == "__main__":
+    main()
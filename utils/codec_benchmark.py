@@ -0,0 +1,149 @@
+"""
+Throughput and size of the message codec against JSON and pickle.
+
+Usage:
+    python -m utils.codec_benchmark [--count N] [--repeat R]
+"""
+import argparse
+import json
+import pickle
+import time
+from typing import Callable, Dict, List
+
+from core import codec
+from core.messages import Message
+from utils.context import Context
+
+
+def _workloads(count: int) -> Dict[str, List[Message]]:
+    def make(payload_fn) -> List[Message]:
+        return [
+            Message(topic="sensor_output", payload=payload_fn(i), sender="sensor", confidence=0.9)
+            for i in range(count)
+        ]
+
+    return {
+        "float_state": make(lambda i: Context(state=20.0 + i * 0.01)),
+        "env_step": make(lambda i: Context(
+            state=20.0 + i * 0.01,
+            reward=-abs(i * 0.01),
+            terminated=i % 100 == 99,
+            info={"step": i, "action": 1.5, "mode": "heat"},
+        )),
+        "vector_64": make(lambda i: Context(state=[float(i + k) for k in range(64)])),
+    }
+
+
+def _edge_cases() -> List[Message]:
+    """Payloads whose values equal or resemble the decoder defaults."""
+    contexts = [
+        Context(state=None, reward=None),
+        Context(state=0.0, reward=0.0, terminated=False, truncated=False, info={}),
+        Context(state=False, reward=-0.0, terminated=0, truncated=None),
+        Context(state={}, reward=0, info={"none": None, "zero": 0.0, "empty": {}}),
+    ]
+    none_info = Context(state=1.0)
+    none_info.info = None
+    contexts.append(none_info)
+
+    return [
+        Message(topic="edge", payload=ctx, sender="edge", origins={}, staleness={})
+        for ctx in contexts
+    ]
+
+
+def _attrs(obj):
+    if isinstance(obj, (Message, Context)):
+        return type(obj), {key: _attrs(value) for key, value in vars(obj).items()}
+    # repr keeps types and the sign of -0.0 apart
+    return repr(obj)
+
+
+def check_round_trip(messages: List[Message]):
+    """Raise if the codec does not reproduce a message like pickle does."""
+    for msg in messages:
+        decoded = codec.decode(codec.encode(msg))
+        if _attrs(decoded) != _attrs(pickle.loads(pickle.dumps(msg))):
+            raise AssertionError(f"Codec round trip changed {vars(msg)} into {vars(decoded)}")
+
+
+def _to_json_dict(msg: Message) -> dict:
+    data = msg.to_dict()
+    data["payload"] = vars(msg.payload)
+    return data
+
+
+def _from_json_dict(data: dict) -> Message:
+    return Message(
+        topic=data["topic"],
+        payload=Context(**data["payload"]),
+        sender=data["sender"],
+        confidence=data["confidence"],
+        msg_id=data["id"],
+        timestamp=data["timestamp"],
+    )
+
+
+CODECS: Dict[str, tuple] = {
+    "codec": (codec.encode, codec.decode),
+    "json": (
+        lambda m: json.dumps(_to_json_dict(m)).encode("utf-8"),
+        lambda b: _from_json_dict(json.loads(b)),
+    ),
+    "pickle": (
+        lambda m: pickle.dumps(m, protocol=pickle.HIGHEST_PROTOCOL),
+        pickle.loads,
+    ),
+}
+
+
+def _best_time(fn: Callable, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count: int, repeat: int) -> List[dict]:
+    results = []
+
+    check_round_trip(_edge_cases())
+
+    for workload, messages in _workloads(count).items():
+        check_round_trip(messages)
+
+        for name, (encode, decode) in CODECS.items():
+            encoded = [encode(m) for m in messages]
+
+            encode_s = _best_time(lambda: [encode(m) for m in messages], repeat)
+            decode_s = _best_time(lambda: [decode(b) for b in encoded], repeat)
+
+            results.append({
+                "workload": workload,
+                "codec": name,
+                "bytes_per_msg": sum(map(len, encoded)) / count,
+                "encode_msg_s": count / encode_s,
+                "decode_msg_s": count / decode_s,
+            })
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'workload':<12} {'codec':<7} {'bytes/msg':>10} {'encode/s':>12} {'decode/s':>12}")
+    for r in run(args.count, args.repeat):
+        print(
+            f"{r['workload']:<12} {r['codec']:<7} {r['bytes_per_msg']:>10.1f} "
+            f"{r['encode_msg_s']:>12,.0f} {r['decode_msg_s']:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()